@@ -62,6 +62,10 @@ class AIManager:
         timeout_tab = ttk.Frame(notebook, padding=10)
         notebook.add(timeout_tab, text="Timeout Ayarları")
         
+        # Performans sekmesi
+        performance_tab = ttk.Frame(notebook, padding=10)
+        notebook.add(performance_tab, text="Performans")
+        
         #---------- GENEL AYARLAR SEKMESİ ----------#
         ttk.Label(general_tab, text="Gemini API Ayarları", style="Title.TLabel").pack(anchor=tk.W, pady=(0, 15))
         
@@ -166,7 +170,8 @@ class AIManager:
         style_context_frame = ttk.Frame(style_model_frame)
         style_context_frame.pack(fill=tk.X, pady=(0, 5))
         ttk.Radiobutton(style_context_frame, text="Romanın Tam Metni", variable=style_context_var, value="full_text").pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Radiobutton(style_context_frame, text="Roman Kimliği", variable=style_context_var, value="novel_context").pack(side=tk.LEFT)
+        ttk.Radiobutton(style_context_frame, text="Roman Kimliği", variable=style_context_var, value="novel_context").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Radiobutton(style_context_frame, text="İlgili Pasajlar", variable=style_context_var, value="retrieval").pack(side=tk.LEFT)
 
         ttk.Label(style_model_frame, text="Cümle yapısı, kelime seçimi ve üslup analizi için önerilen model", 
                  style="Info.TLabel").pack(anchor=tk.W)
@@ -184,7 +189,8 @@ class AIManager:
         grammar_context_frame = ttk.Frame(grammar_model_frame)
         grammar_context_frame.pack(fill=tk.X, pady=(0, 5))
         ttk.Radiobutton(grammar_context_frame, text="Romanın Tam Metni", variable=grammar_context_var, value="full_text").pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Radiobutton(grammar_context_frame, text="Roman Kimliği", variable=grammar_context_var, value="novel_context").pack(side=tk.LEFT)
+        ttk.Radiobutton(grammar_context_frame, text="Roman Kimliği", variable=grammar_context_var, value="novel_context").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Radiobutton(grammar_context_frame, text="İlgili Pasajlar", variable=grammar_context_var, value="retrieval").pack(side=tk.LEFT)
         
         ttk.Label(grammar_model_frame, text="Dil Bilgisi, yazım ve noktalama hataları için önerilen model", 
                  style="Info.TLabel").pack(anchor=tk.W)
@@ -203,7 +209,8 @@ class AIManager:
         content_context_frame = ttk.Frame(content_model_frame)
         content_context_frame.pack(fill=tk.X, pady=(0, 5))
         ttk.Radiobutton(content_context_frame, text="Romanın Tam Metni", variable=content_context_var, value="full_text").pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Radiobutton(content_context_frame, text="Roman Kimliği", variable=content_context_var, value="novel_context").pack(side=tk.LEFT)
+        ttk.Radiobutton(content_context_frame, text="Roman Kimliği", variable=content_context_var, value="novel_context").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Radiobutton(content_context_frame, text="İlgili Pasajlar", variable=content_context_var, value="retrieval").pack(side=tk.LEFT)
 
         ttk.Label(content_model_frame, text="Olay örgüsü, karakter gelişimi ve yapısal bütünlük analizi için güçlü bir model (örn: Pro) önerilir.", 
                  style="Info.TLabel").pack(anchor=tk.W)
@@ -217,6 +224,61 @@ class AIManager:
         ttk.Label(context_model_frame, text="Tüm romandan genel bir özet çıkarır. Güçlü bir model (örn: Pro) önerilir.", 
                  style="Info.TLabel").pack(anchor=tk.W)
         
+        # Yedek modeller ve devre kesici durumu
+        fallback_frame = ttk.LabelFrame(models_tab, text="Yedek Modeller ve Devre Kesici", style="Card.TLabelframe", padding="10 15 10 10")
+        fallback_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        circuit_breaker_var = tk.BooleanVar(value=self.settings_manager.get_setting("circuit_breaker_enabled", True))
+        ttk.Checkbutton(fallback_frame, variable=circuit_breaker_var, 
+                       text="Sürekli hata veren ya da yavaşlayan modelde isteği yedek modele yönlendir").pack(anchor=tk.W, pady=(0, 5))
+        
+        default_fallback_label = "(varsayılan model)"
+        fallback_models = self.settings_manager.get_setting("fallback_models", {}) or {}
+        fallback_type_labels = {
+            "style_analysis": "Üslup Analizi",
+            "grammar_check": "Dil Bilgisi",
+            "content_review": "İçerik İnceleme",
+            "novel_context": "Roman Kimliği"
+        }
+        fallback_vars = {}
+        breaker_state_labels = {}
+        for analysis_type, type_label in fallback_type_labels.items():
+            row = ttk.Frame(fallback_frame)
+            row.pack(fill=tk.X, pady=2)
+            ttk.Label(row, text=type_label, width=16).pack(side=tk.LEFT)
+            fallback_vars[analysis_type] = tk.StringVar(value=fallback_models.get(analysis_type, default_fallback_label))
+            ttk.Combobox(row, textvariable=fallback_vars[analysis_type], values=[default_fallback_label] + models,
+                         state="readonly", width=22).pack(side=tk.LEFT, padx=(0, 10))
+            breaker_state_labels[analysis_type] = ttk.Label(row, text="", style="Info.TLabel")
+            breaker_state_labels[analysis_type].pack(side=tk.LEFT)
+        
+        ttk.Label(fallback_frame, text="Devre açıldığında istekler bekleme süresi boyunca yedek modele gider; süre dolunca ana model tek bir denemeyle yoklanır. Engellenen prompt ve geçersiz anahtar hataları yeniden denenmez.", 
+                 style="Info.TLabel", wraplength=520).pack(anchor=tk.W, pady=(5, 0))
+        
+        breaker_state_texts = {"closed": "🟢 Kapalı", "open": "🔴 Açık", "half_open": "🟡 Yoklanıyor"}
+        
+        def refresh_breaker_states():
+            try:
+                if not settings_window.winfo_exists():
+                    return
+                stats = self.ai_integration.get_circuit_breaker_stats()
+                for analysis_type, state_label in breaker_state_labels.items():
+                    breaker = stats.get(analysis_type)
+                    if not breaker:
+                        state_label.config(text="Model yapılandırılmadı")
+                        continue
+                    text = f"{breaker_state_texts.get(breaker['state'], breaker['state'])} • {breaker['requests']} istek, hata %{breaker['failure_rate'] * 100:.0f}"
+                    if breaker["median_latency"] is not None:
+                        text += f", medyan {breaker['median_latency']:.1f} sn"
+                    if breaker["state"] == "open":
+                        text += f" • {breaker['retry_in']:.0f} sn sonra yoklanacak ({breaker['last_error']})"
+                    state_label.config(text=text)
+                settings_window.after(2000, refresh_breaker_states)
+            except tk.TclError:
+                pass  # Pencere kapatıldı
+        
+        refresh_breaker_states()
+        
         # Modeller hakkında bilgi metni
         info_frame = ttk.LabelFrame(models_tab, text="Model Önerileri", style="Card.TLabelframe", padding="10 15 10 10")
         info_frame.pack(fill=tk.X, pady=(0, 10))
@@ -241,6 +303,12 @@ class AIManager:
         ttk.Label(dynamic_frame, text="Metin uzunluğuna göre otomatik olarak timeout süresini ayarlar. Uzun metinler için daha uzun süre tanır.", 
                  style="Info.TLabel").pack(anchor=tk.W)
         
+        latency_stats = self.ai_integration.latency_model.get_stats()
+        learned = [key for key, stats in latency_stats.items() if "p99" in stats]
+        latency_text = (f"Ölçüme dayalı timeout etkin: {', '.join(learned)}" if learned
+                        else "Henüz yeterli ölçüm yok; aşağıdaki sabit katsayılar kullanılıyor.")
+        ttk.Label(dynamic_frame, text=latency_text, style="Info.TLabel").pack(anchor=tk.W, pady=(5, 0))
+        
         # Sabit timeout ayarı
         fixed_frame = ttk.LabelFrame(timeout_tab, text="Sabit Timeout (Saniye)", style="Card.TLabelframe", padding="10 15 10 10")
         fixed_frame.pack(fill=tk.X, pady=(0, 15))
@@ -260,6 +328,9 @@ class AIManager:
         info_frame.pack(fill=tk.X, pady=(0, 10))
         
         info_text = """📊 Dinamik Timeout Sistemi:
+• Her model ve analiz türü için en az 8 istek ölçüldükten sonra timeout,
+  gözlenen en yavaş %1'lik sürenin (p99) biraz üzerine ayarlanır.
+• Ölçüm yokken:
 • Dil Bilgisi: 60s + (her 1K karakter için +5s)
 • Üslup: 90s + (her 1K karakter için +8s)
 • İçerik: 120s + (her 1K karakter için +12s)
@@ -267,6 +338,274 @@ class AIManager:
         
         ttk.Label(info_frame, text=info_text, style="Info.TLabel", justify=tk.LEFT).pack(anchor=tk.W)
         
+        #---------- PERFORMANS SEKMESİ ----------#
+        ttk.Label(performance_tab, text="Performans Ayarları", style="Title.TLabel").pack(anchor=tk.W, pady=(0, 15))
+        
+        # Eşzamanlı analiz
+        workers_frame = ttk.LabelFrame(performance_tab, text="Tam Analizde Eşzamanlı İstek", style="Card.TLabelframe", padding="10 15 10 10")
+        workers_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        workers_entry_frame = ttk.Frame(workers_frame)
+        workers_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        full_analysis_workers_var = tk.StringVar(value=str(self.settings_manager.get_setting("full_analysis_max_workers", 3)))
+        ttk.Spinbox(workers_entry_frame, from_=1, to=8, textvariable=full_analysis_workers_var, width=8).pack(side=tk.LEFT)
+        ttk.Label(workers_entry_frame, text="istek").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(workers_frame, text="'Tümünü Analiz Et' sırasında aynı anda YZ'ye gönderilecek en fazla bölüm sayısı. 1 seçilirse bölümler sırayla analiz edilir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        adaptive_concurrency_var = tk.BooleanVar(value=self.settings_manager.get_setting("adaptive_concurrency_enabled", True))
+        ttk.Checkbutton(workers_frame, variable=adaptive_concurrency_var, 
+                       text="Eşzamanlılığı otomatik ayarla").pack(anchor=tk.W, pady=(10, 5))
+        
+        adaptive_max_entry_frame = ttk.Frame(workers_frame)
+        adaptive_max_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        adaptive_concurrency_max_var = tk.StringVar(value=str(self.settings_manager.get_setting("adaptive_concurrency_max", 8)))
+        ttk.Spinbox(adaptive_max_entry_frame, from_=1, to=32, textvariable=adaptive_concurrency_max_var, width=8).pack(side=tk.LEFT)
+        ttk.Label(adaptive_max_entry_frame, text="istek (otomatik ayarda üst sınır)").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(workers_frame, text="Açıkken yukarıdaki değer başlangıç noktasıdır: gecikme ve hatalar normal kaldıkça eşzamanlı istek sayısı model başına kademeli artırılır, kota hatası (429) veya zaman aşımında yarıya indirilir. Güncel değer ilerleme alanında gösterilir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        in_flight_entry_frame = ttk.Frame(workers_frame)
+        in_flight_entry_frame.pack(fill=tk.X, pady=(10, 5))
+        ai_max_in_flight_var = tk.StringVar(value=str(self.settings_manager.get_setting("ai_max_in_flight", 8)))
+        ttk.Spinbox(in_flight_entry_frame, from_=1, to=32, textvariable=ai_max_in_flight_var, width=8).pack(side=tk.LEFT)
+        ttk.Label(in_flight_entry_frame, text="uçuştaki istek (üst sınır)").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(workers_frame, text="Bölüm ve pencere istekleri dahil, aynı anda açık olabilecek en fazla YZ isteği. Zaman aşımına uğrayıp kapanmayı bekleyen istekler de bu sınıra sayılır.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Hız sınırı
+        rate_frame = ttk.LabelFrame(performance_tab, text="Hız Sınırı (Model Başına)", style="Card.TLabelframe", padding="10 15 10 10")
+        rate_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        rpm_entry_frame = ttk.Frame(rate_frame)
+        rpm_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        rate_limit_rpm_var = tk.StringVar(value=str(self.settings_manager.get_setting("rate_limit_rpm", 15)))
+        ttk.Entry(rpm_entry_frame, textvariable=rate_limit_rpm_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(rpm_entry_frame, text="istek / dakika").pack(side=tk.LEFT, padx=(5, 0))
+        
+        tpm_entry_frame = ttk.Frame(rate_frame)
+        tpm_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        rate_limit_tpm_var = tk.StringVar(value=str(self.settings_manager.get_setting("rate_limit_tpm", 1000000)))
+        ttk.Entry(tpm_entry_frame, textvariable=rate_limit_tpm_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(tpm_entry_frame, text="token / dakika").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(rate_frame, text="Tüm YZ istekleri bu bütçeye göre sıraya alınır. Kota hatası (429) alınırsa API'nin bildirdiği süre kadar beklenir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Uzun bölümler
+        chunk_frame = ttk.LabelFrame(performance_tab, text="Uzun Bölümler", style="Card.TLabelframe", padding="10 15 10 10")
+        chunk_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        budget_entry_frame = ttk.Frame(chunk_frame)
+        budget_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        chunk_token_budget_var = tk.StringVar(value=str(self.settings_manager.get_setting("chunk_token_budget", 6000)))
+        ttk.Entry(budget_entry_frame, textvariable=chunk_token_budget_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(budget_entry_frame, text="token / pencere").pack(side=tk.LEFT, padx=(5, 0))
+        
+        overlap_entry_frame = ttk.Frame(chunk_frame)
+        overlap_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        chunk_overlap_tokens_var = tk.StringVar(value=str(self.settings_manager.get_setting("chunk_overlap_tokens", 200)))
+        ttk.Entry(overlap_entry_frame, textvariable=chunk_overlap_tokens_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(overlap_entry_frame, text="token örtüşme").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(chunk_frame, text="Bu sınırı aşan bölümler paragraf sınırlarından pencerelere bölünür, pencereler eşzamanlı analiz edilir ve öneriler birleştirilir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Kısa bölümler
+        batch_frame = ttk.LabelFrame(performance_tab, text="Kısa Bölümler", style="Card.TLabelframe", padding="10 15 10 10")
+        batch_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        batch_packing_enabled_var = tk.BooleanVar(value=self.settings_manager.get_setting("batch_packing_enabled", False))
+        ttk.Checkbutton(batch_frame, variable=batch_packing_enabled_var, 
+                       text="Tam analizde kısa bölümleri tek istekte paketle").pack(anchor=tk.W, pady=(0, 5))
+        
+        short_chars_entry_frame = ttk.Frame(batch_frame)
+        short_chars_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        batch_short_chapter_chars_var = tk.StringVar(value=str(self.settings_manager.get_setting("batch_short_chapter_chars", 3000)))
+        ttk.Entry(short_chars_entry_frame, textvariable=batch_short_chapter_chars_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(short_chars_entry_frame, text="karaktere kadar olan bölümler").pack(side=tk.LEFT, padx=(5, 0))
+        
+        batch_budget_entry_frame = ttk.Frame(batch_frame)
+        batch_budget_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        batch_token_budget_var = tk.StringVar(value=str(self.settings_manager.get_setting("batch_token_budget", 6000)))
+        ttk.Entry(batch_budget_entry_frame, textvariable=batch_token_budget_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(batch_budget_entry_frame, text="token / paket").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(batch_frame, text="Ardışık kısa bölümler sınır satırlarıyla tek prompt'ta birleştirilir; roman bağlamı ve istek ek yükü paket başına bir kez ödenir. Her öneri bölüm kimliğiyle döner ve kendi bölümüne eklenir. Paket başarısız olursa bölümler tek tek analiz edilir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Paragraf kimlikli istem
+        paragraph_frame = ttk.LabelFrame(performance_tab, text="Paragraf Kimlikli İstem", style="Card.TLabelframe", padding="10 15 10 10")
+        paragraph_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        paragraph_id_protocol_var = tk.BooleanVar(value=self.settings_manager.get_setting("paragraph_id_protocol", False))
+        ttk.Checkbutton(paragraph_frame, variable=paragraph_id_protocol_var, 
+                       text="Paragrafları kimlikle gönder, önerileri paragraf + aralık olarak al").pack(anchor=tk.W, pady=(0, 5))
+        
+        ttk.Label(paragraph_frame, text="Bölüm analizinde her paragraf [P1], [P2]... kimliğiyle gönderilir; YZ tam cümleyi tekrar yazmak yerine paragraf kimliği, karakter aralığı ve yalnızca değişen parçayı döndürür. Yanıt kısalır ve öneri metinde aranmadan doğrudan konumuna uygulanır. Paketlenen kısa bölümler ve seçim analizi eski biçimi kullanır.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Engellenen pasajlar
+        block_frame = ttk.LabelFrame(performance_tab, text="Engellenen Pasajlar", style="Card.TLabelframe", padding="10 15 10 10")
+        block_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        block_isolation_enabled_var = tk.BooleanVar(value=self.settings_manager.get_setting("block_isolation_enabled", True))
+        ttk.Checkbutton(block_frame, variable=block_isolation_enabled_var, 
+                       text="Güvenlik filtresine takılan bölümde engellenen pasajı ayıkla").pack(anchor=tk.W, pady=(0, 5))
+        
+        block_budget_entry_frame = ttk.Frame(block_frame)
+        block_budget_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        block_isolation_token_budget_var = tk.StringVar(value=str(self.settings_manager.get_setting("block_isolation_token_budget", 20000)))
+        ttk.Entry(block_budget_entry_frame, textvariable=block_isolation_token_budget_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(block_budget_entry_frame, text="token / bölüm (kurtarma bütçesi)").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(block_frame, text="Engellenen bölüm paragraf sınırlarından ikiye bölünerek yeniden gönderilir; engellenen en küçük paragraf aralığı bulunana kadar bölme sürer. Bölümün geri kalanı normal şekilde analiz edilir, engellenen pasajlar analiz sonunda bildirilir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Akış modu
+        streaming_frame = ttk.LabelFrame(performance_tab, text="Akışlı Yanıt", style="Card.TLabelframe", padding="10 15 10 10")
+        streaming_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        streaming_enabled_var = tk.BooleanVar(value=self.settings_manager.get_setting("streaming_enabled", True))
+        ttk.Checkbutton(streaming_frame, variable=streaming_enabled_var, 
+                       text="Önerileri geldikçe göster").pack(anchor=tk.W, pady=(0, 5))
+        
+        ttk.Label(streaming_frame, text="Tek bölüm analizinde YZ yanıtı parça parça alınır ve her öneri tamamlandığı anda kart olarak eklenir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Yapılandırılmış çıktı
+        structured_frame = ttk.LabelFrame(performance_tab, text="Yapılandırılmış Çıktı", style="Card.TLabelframe", padding="10 15 10 10")
+        structured_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        structured_output_var = tk.BooleanVar(value=self.settings_manager.get_setting("structured_output_enabled", False))
+        ttk.Checkbutton(structured_frame, variable=structured_output_var, 
+                       text="Yanıtları JSON şemasıyla iste").pack(anchor=tk.W, pady=(0, 5))
+        
+        ttk.Label(structured_frame, text="Model öneri listesini şemaya uyan saf JSON olarak döndürür; yanıt onarım yapılmadan ayrıştırılır. Onarım zinciri yalnızca yedek olarak çalışır (oranı YZ İstek Panosu'nda görülür).", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Kopya istek (hedging)
+        hedging_frame = ttk.LabelFrame(performance_tab, text="Yavaş İsteklerde Kopya", style="Card.TLabelframe", padding="10 15 10 10")
+        hedging_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        hedging_enabled_var = tk.BooleanVar(value=self.settings_manager.get_setting("hedging_enabled", False))
+        ttk.Checkbutton(hedging_frame, variable=hedging_enabled_var, 
+                       text="Etkileşimli analizde yavaş isteği kopyala").pack(anchor=tk.W, pady=(0, 5))
+        
+        hedging_ratio_frame = ttk.Frame(hedging_frame)
+        hedging_ratio_frame.pack(fill=tk.X, pady=(0, 5))
+        hedging_max_extra_var = tk.StringVar(value=str(int(round(float(self.settings_manager.get_setting("hedging_max_extra_ratio", 0.1)) * 100))))
+        ttk.Entry(hedging_ratio_frame, textvariable=hedging_max_extra_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(hedging_ratio_frame, text="% en fazla ek istek").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(hedging_frame, text="Tek bölüm ve seçili metin analizinde istek, bu model ve boyut için öğrenilen p95 süresinde yanıt vermezse aynı istek bir kez daha gönderilir; önce dönen yanıt kullanılır, diğeri iptal edilir. Ek istekler etkileşimli isteklerin belirtilen yüzdesiyle sınırlıdır.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Önceden analiz
+        prefetch_frame = ttk.LabelFrame(performance_tab, text="Önceden Analiz", style="Card.TLabelframe", padding="10 15 10 10")
+        prefetch_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        prefetch_enabled_var = tk.BooleanVar(value=self.settings_manager.get_setting("prefetch_enabled", False))
+        ttk.Checkbutton(prefetch_frame, variable=prefetch_enabled_var, 
+                       text="Öneriler incelenirken sıradaki bölümü arka planda analiz et").pack(anchor=tk.W, pady=(0, 5))
+        
+        ttk.Label(prefetch_frame, text="Bir bölümün analizi bitince sonraki bölümün aynı fazı arka planda çalıştırılır; o bölüme geçip analizi başlattığınızda sonuç hemen gösterilir. Bölüm metni bu arada değişirse sonuç atılır. Ek API kullanımı doğurur.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # İlgili pasaj seçimi
+        retrieval_frame = ttk.LabelFrame(performance_tab, text="İlgili Pasajlar Bağlamı", style="Card.TLabelframe", padding="10 15 10 10")
+        retrieval_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        retrieval_budget_frame = ttk.Frame(retrieval_frame)
+        retrieval_budget_frame.pack(fill=tk.X, pady=(0, 5))
+        retrieval_token_budget_var = tk.StringVar(value=str(self.settings_manager.get_setting("retrieval_token_budget", 8000)))
+        ttk.Entry(retrieval_budget_frame, textvariable=retrieval_token_budget_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(retrieval_budget_frame, text="token bağlam bütçesi").pack(side=tk.LEFT, padx=(5, 15))
+        retrieval_top_k_var = tk.StringVar(value=str(self.settings_manager.get_setting("retrieval_top_k", 8)))
+        ttk.Entry(retrieval_budget_frame, textvariable=retrieval_top_k_var, width=5).pack(side=tk.LEFT)
+        ttk.Label(retrieval_budget_frame, text="pasaj (en fazla)").pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(retrieval_frame, text="Bağlam olarak \"İlgili Pasajlar\" seçildiğinde romanın tamamı yerine komşu bölümler ve bölümle en ilgili pasajlar (karakter adları öncelikli) bu bütçe içinde gönderilir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # Yanıt önbelleği
+        cache_frame = ttk.LabelFrame(performance_tab, text="Yanıt Önbelleği", style="Card.TLabelframe", padding="10 15 10 10")
+        cache_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        response_cache_enabled_var = tk.BooleanVar(value=self.settings_manager.get_setting("response_cache_enabled", True))
+        ttk.Checkbutton(cache_frame, variable=response_cache_enabled_var, 
+                       text="Değişmeyen bölümler için önceki YZ yanıtlarını kullan").pack(anchor=tk.W, pady=(0, 5))
+        
+        cache_size_frame = ttk.Frame(cache_frame)
+        cache_size_frame.pack(fill=tk.X, pady=(0, 5))
+        response_cache_max_mb_var = tk.StringVar(value=str(self.settings_manager.get_setting("response_cache_max_mb", 100)))
+        ttk.Entry(cache_size_frame, textvariable=response_cache_max_mb_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(cache_size_frame, text="MB (en fazla)").pack(side=tk.LEFT, padx=(5, 0))
+        
+        def format_cache_stats():
+            stats = self.ai_integration.response_cache.get_stats()
+            return (f"{stats['entries']} kayıt • {stats['size_bytes'] / (1024 * 1024):.1f} MB • "
+                    f"{stats['hits']} isabet / {stats['misses']} ıska (%{stats['hit_rate'] * 100:.0f})")
+        
+        cache_stats_label = ttk.Label(cache_frame, text=format_cache_stats(), style="Info.TLabel")
+        cache_stats_label.pack(anchor=tk.W, pady=(0, 5))
+        
+        def clear_response_cache():
+            if messagebox.askyesno("Önbelleği Temizle", "Kaydedilmiş tüm YZ yanıtları silinsin mi?", parent=settings_window):
+                removed = self.ai_integration.response_cache.clear()
+                print(f"Yanıt önbelleği temizlendi: {removed} kayıt silindi")
+                cache_stats_label.config(text=format_cache_stats())
+        
+        ttk.Button(cache_frame, text="Önbelleği Temizle", command=clear_response_cache).pack(anchor=tk.W)
+        
+        # Bağlam önbelleği
+        context_cache_frame = ttk.LabelFrame(performance_tab, text="Bağlam Önbelleği", style="Card.TLabelframe", padding="10 15 10 10")
+        context_cache_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        context_cache_mode_var = tk.StringVar(value=self.settings_manager.get_setting("context_cache_mode", "gemini"))
+        context_cache_mode_frame = ttk.Frame(context_cache_frame)
+        context_cache_mode_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Radiobutton(context_cache_mode_frame, text="Gemini Önbelleği", variable=context_cache_mode_var, value="gemini").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Radiobutton(context_cache_mode_frame, text="Yerel", variable=context_cache_mode_var, value="local").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Radiobutton(context_cache_mode_frame, text="Kapalı", variable=context_cache_mode_var, value="off").pack(side=tk.LEFT)
+        
+        ttl_entry_frame = ttk.Frame(context_cache_frame)
+        ttl_entry_frame.pack(fill=tk.X, pady=(0, 5))
+        context_cache_ttl_var = tk.StringVar(value=str(self.settings_manager.get_setting("context_cache_ttl_minutes", 60)))
+        ttk.Entry(ttl_entry_frame, textvariable=context_cache_ttl_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(ttl_entry_frame, text="dakika geçerli").pack(side=tk.LEFT, padx=(5, 0))
+        
+        def format_context_cache_stats():
+            if not self.ai_integration.context_cache:
+                return "Bağlam her istekte prompt'a gömülür"
+            stats = self.ai_integration.context_cache.get_stats()
+            return (f"{stats['uploads']} yükleme • {stats['hits']} yeniden kullanım • "
+                    f"~{stats['tokens_reused']} token tekrar gönderilmedi • {len(stats['active_contexts'])} etkin bağlam")
+        
+        ttk.Label(context_cache_frame, text=format_context_cache_stats(), style="Info.TLabel").pack(anchor=tk.W, pady=(0, 5))
+        ttk.Label(context_cache_frame, text="Romanın tam metni veya özeti her içerik sürümü için bir kez yüklenir; bölüm analizleri bu kayda başvurur. Gemini önbelleği yalnızca yeterince uzun bağlamlarda kullanılır.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
+        # YZ arka ucu
+        backend_frame = ttk.LabelFrame(performance_tab, text="YZ Arka Ucu", style="Card.TLabelframe", padding="10 15 10 10")
+        backend_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        ai_backend_var = tk.StringVar(value=self.settings_manager.get_setting("ai_backend", "gemini"))
+        backend_choice_frame = ttk.Frame(backend_frame)
+        backend_choice_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Radiobutton(backend_choice_frame, text="Google Gemini", variable=ai_backend_var, value="gemini").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Radiobutton(backend_choice_frame, text="Çevrimdışı Test (sahte)", variable=ai_backend_var, value="fake").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Radiobutton(backend_choice_frame, text="Arşivden Tekrar Oynat", variable=ai_backend_var, value="replay").pack(side=tk.LEFT)
+        
+        ttk.Label(backend_frame, text="Sahte arka uç ağa çıkmaz; ayarlardaki 'fake_backend' seçeneklerine göre gecikme, hata ve örnek öneriler üretir. Yük ve hız denemeleri içindir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        ttk.Label(backend_frame, text="Tekrar oynatma, projelerde kayıtlı gerçek yanıtları aynı prompt için gözlenen gecikmeyle döndürür ('replay_backend' seçenekleri). Oturumları ağ olmadan yeniden üretmek içindir.", 
+                 style="Info.TLabel").pack(anchor=tk.W)
+        
         # Alt butonlar frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=(10, 0))
@@ -296,11 +635,104 @@ class AIManager:
             except ValueError:
                 self.settings_manager.set_setting("fixed_timeout", 120)  # Varsayılan
             
+            # Performans ayarlarını kaydet
+            try:
+                full_analysis_workers = min(8, max(1, int(full_analysis_workers_var.get())))
+                self.settings_manager.set_setting("full_analysis_max_workers", full_analysis_workers)
+            except ValueError:
+                self.settings_manager.set_setting("full_analysis_max_workers", 3)  # Varsayılan
+            try:
+                self.settings_manager.set_setting("ai_max_in_flight", min(32, max(1, int(ai_max_in_flight_var.get()))))
+            except ValueError:
+                self.settings_manager.set_setting("ai_max_in_flight", 8)  # Varsayılan
+            self.ai_integration.request_worker.configure(self.settings_manager.get_setting("ai_max_in_flight", 8))
+            self.settings_manager.set_setting("adaptive_concurrency_enabled", adaptive_concurrency_var.get())
+            try:
+                self.settings_manager.set_setting("adaptive_concurrency_max", min(32, max(1, int(adaptive_concurrency_max_var.get()))))
+            except ValueError:
+                self.settings_manager.set_setting("adaptive_concurrency_max", 8)  # Varsayılan
+            
+            try:
+                self.settings_manager.set_setting("rate_limit_rpm", max(1, int(rate_limit_rpm_var.get())))
+            except ValueError:
+                self.settings_manager.set_setting("rate_limit_rpm", 15)  # Varsayılan
+            try:
+                self.settings_manager.set_setting("rate_limit_tpm", max(1000, int(rate_limit_tpm_var.get())))
+            except ValueError:
+                self.settings_manager.set_setting("rate_limit_tpm", 1000000)  # Varsayılan
+            self.ai_integration.update_rate_limits()
+            
+            try:
+                self.settings_manager.set_setting("chunk_token_budget", max(500, int(chunk_token_budget_var.get())))
+                self.settings_manager.set_setting("chunk_overlap_tokens", max(0, int(chunk_overlap_tokens_var.get())))
+            except ValueError:
+                pass  # Geçersiz değer girilirse önceki ayarlar korunur
+            self.app.editorial_process.configure_chunking(
+                self.settings_manager.get_setting("chunk_token_budget", 6000),
+                self.settings_manager.get_setting("chunk_overlap_tokens", 200)
+            )
+            self.settings_manager.set_setting("batch_packing_enabled", batch_packing_enabled_var.get())
+            try:
+                self.settings_manager.set_setting("batch_short_chapter_chars", max(100, int(batch_short_chapter_chars_var.get())))
+                self.settings_manager.set_setting("batch_token_budget", max(500, int(batch_token_budget_var.get())))
+            except ValueError:
+                pass  # Geçersiz değer girilirse önceki ayarlar korunur
+            self.app.editorial_process.configure_batching(
+                self.settings_manager.get_setting("batch_packing_enabled", False),
+                self.settings_manager.get_setting("batch_token_budget", 6000),
+                self.settings_manager.get_setting("batch_short_chapter_chars", 3000)
+            )
+            self.settings_manager.set_setting("block_isolation_enabled", block_isolation_enabled_var.get())
+            try:
+                self.settings_manager.set_setting("block_isolation_token_budget", max(0, int(block_isolation_token_budget_var.get())))
+            except ValueError:
+                pass  # Geçersiz değer girilirse önceki ayarlar korunur
+            self.app.editorial_process.configure_block_isolation(
+                self.settings_manager.get_setting("block_isolation_enabled", True),
+                self.settings_manager.get_setting("block_isolation_token_budget", 20000)
+            )
+            self.settings_manager.set_setting("paragraph_id_protocol", paragraph_id_protocol_var.get())
+            self.app.editorial_process.configure_paragraph_protocol(paragraph_id_protocol_var.get())
+            try:
+                self.settings_manager.set_setting("retrieval_token_budget", max(500, int(retrieval_token_budget_var.get())))
+                self.settings_manager.set_setting("retrieval_top_k", max(1, int(retrieval_top_k_var.get())))
+            except ValueError:
+                pass  # Geçersiz değer girilirse önceki ayarlar korunur
+            self.settings_manager.set_setting("streaming_enabled", streaming_enabled_var.get())
+            self.settings_manager.set_setting("structured_output_enabled", structured_output_var.get())
+            self.settings_manager.set_setting("prefetch_enabled", prefetch_enabled_var.get())
+            self.settings_manager.set_setting("hedging_enabled", hedging_enabled_var.get())
+            try:
+                self.settings_manager.set_setting("hedging_max_extra_ratio", min(100, max(0, float(hedging_max_extra_var.get()))) / 100)
+            except ValueError:
+                self.settings_manager.set_setting("hedging_max_extra_ratio", 0.1)  # Varsayılan
+            if not prefetch_enabled_var.get():
+                self.app.analysis_manager.prefetcher.discard()
+            if ai_backend_var.get() != self.settings_manager.get_setting("ai_backend", "gemini"):
+                self.settings_manager.set_setting("ai_backend", ai_backend_var.get())
+                self.ai_integration.update_backend()
+            self.settings_manager.set_setting("response_cache_enabled", response_cache_enabled_var.get())
+            try:
+                self.settings_manager.set_setting("response_cache_max_mb", max(1, int(response_cache_max_mb_var.get())))
+            except ValueError:
+                self.settings_manager.set_setting("response_cache_max_mb", 100)  # Varsayılan
+            self.ai_integration.update_cache_settings()
+            self.settings_manager.set_setting("context_cache_mode", context_cache_mode_var.get())
+            try:
+                self.settings_manager.set_setting("context_cache_ttl_minutes", max(5, int(context_cache_ttl_var.get())))
+            except ValueError:
+                self.settings_manager.set_setting("context_cache_ttl_minutes", 60)  # Varsayılan
+            self.ai_integration.update_context_cache_settings()
+            
             self.settings_manager.set_setting("api_key", api_key)
             self.settings_manager.set_setting("model", default_model)
             self.settings_manager.set_setting("individual_models", individual_models_config)
+            self.settings_manager.set_setting("circuit_breaker_enabled", circuit_breaker_var.get())
+            self.settings_manager.set_setting("fallback_models", {
+                analysis_type: var.get() for analysis_type, var in fallback_vars.items() if var.get() != default_fallback_label
+            })
             
-            if api_key:
+            if api_key or not self.ai_integration.backend.requires_api_key:
                 print(f"AI AYARLARI KAYDEDILIYOR: Model={default_model}, API Key={len(api_key)} karakter")
                 print(f"Timeout ayarları: Dinamik={use_dynamic_timeout.get()}, Sabit={fixed_timeout_var.get()}s")
                 print(f"Individual models: {individual_models_config}")
@@ -335,7 +767,7 @@ class AIManager:
         context = self.editorial_process.novel_context
         
         if not context or not context.strip():
-            messagebox.showinfo("Roman Kimliği", "Henüz bir Roman Kimliği oluşturulmadı.\n\nKimlik, ilk bölüm analizi başlatıldığında otomatik olarak oluşturulur.")
+            messagebox.showinfo("Roman Kimliği", "Henüz bir Roman Kimliği oluşturulmadı.\n\nKimlik, ilk bölüm analizi başlatıldığında ya da proje açıldığında arka planda otomatik olarak oluşturulur.")
             return
             
         context_window = tk.Toplevel(self.app.root)
@@ -362,3 +794,116 @@ class AIManager:
         context_text.config(state='disabled')
         
         ttk.Button(main_frame, text="Kapat", command=context_window.destroy).pack(pady=5)
+
+    def open_telemetry_dashboard(self):
+        """YZ çağrılarının gecikme, verim ve hata oranlarını gösteren pano."""
+        telemetry = self.ai_integration.telemetry
+        
+        dashboard_window = tk.Toplevel(self.app.root)
+        dashboard_window.title("YZ İstek Panosu")
+        dashboard_window.geometry("860x660")
+        
+        main_frame = ttk.Frame(dashboard_window, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Zaman aralığı seçimi
+        ranges = {"Son 1 saat": 3600, "Son 24 saat": 86400, "Son 7 gün": 7 * 86400, "Tümü": None}
+        top_frame = ttk.Frame(main_frame)
+        top_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(top_frame, text="Zaman aralığı:").pack(side=tk.LEFT)
+        range_var = tk.StringVar(value="Son 24 saat")
+        range_combo = ttk.Combobox(top_frame, textvariable=range_var, values=list(ranges.keys()), state="readonly", width=15)
+        range_combo.pack(side=tk.LEFT, padx=(5, 10))
+        
+        overall_label = ttk.Label(main_frame, text="", font=('Arial', 11, 'bold'))
+        overall_label.pack(anchor=tk.W, pady=(0, 5))
+        errors_label = ttk.Label(main_frame, text="", style="Info.TLabel")
+        errors_label.pack(anchor=tk.W, pady=(0, 10))
+        
+        # Model ve analiz türüne göre kırılım
+        columns = ('key', 'count', 'p50', 'p95', 'per_minute', 'error_rate', 'parse', 'repair', 'tokens')
+        breakdown_tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=7)
+        headings = {
+            'key': ('Model • Tür', 260), 'count': ('İstek', 60), 'p50': ('p50 (sn)', 80), 'p95': ('p95 (sn)', 80),
+            'per_minute': ('İstek/dk', 80), 'error_rate': ('Hata', 70), 'parse': ('Ayrıştırma (ms)', 100),
+            'repair': ('Onarım', 70), 'tokens': ('Prompt Token', 110)
+        }
+        for column, (title, width) in headings.items():
+            breakdown_tree.heading(column, text=title)
+            breakdown_tree.column(column, width=width, anchor=tk.W if column == 'key' else tk.E)
+        breakdown_tree.pack(fill=tk.X, pady=(0, 10))
+        
+        # Zaman içinde gecikme ve istek sayısı
+        ttk.Label(main_frame, text="Zaman içinde gecikme (açık: p95, koyu: p50) ve istek sayısı").pack(anchor=tk.W)
+        chart = tk.Canvas(main_frame, height=260, bg='white', highlightthickness=1, highlightbackground='#CCCCCC')
+        chart.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
+        
+        def format_seconds(value):
+            return f"{value:.1f}" if value is not None else "-"
+        
+        def format_rate(value):
+            return f"%{value * 100:.0f}" if value is not None else "-"
+        
+        def draw_chart(series):
+            chart.delete("all")
+            width = max(chart.winfo_width(), 600)
+            height = max(chart.winfo_height(), 200)
+            if not series:
+                chart.create_text(width / 2, height / 2, text="Bu aralıkta kayıt yok", fill='gray')
+                return
+            max_latency = max([s["p95"] or 0 for s in series] + [0.1])
+            bar_area = height - 40
+            slot = (width - 20) / len(series)
+            for index, summary in enumerate(series):
+                x0 = 10 + index * slot + slot * 0.15
+                x1 = 10 + (index + 1) * slot - slot * 0.15
+                for key, color in (("p95", '#9ECAE1'), ("p50", '#3182BD')):
+                    if summary[key] is not None:
+                        top = 10 + bar_area * (1 - summary[key] / max_latency)
+                        chart.create_rectangle(x0, top, x1, 10 + bar_area, fill=color, outline='')
+                if summary["errors"]:
+                    chart.create_text((x0 + x1) / 2, 18, text=f"⚠{summary['errors']}", fill='red', font=('Arial', 8))
+                label_time = datetime.datetime.fromtimestamp(summary["start"]).strftime('%H:%M')
+                chart.create_text((x0 + x1) / 2, height - 22, text=f"{summary['count']}", font=('Arial', 8))
+                chart.create_text((x0 + x1) / 2, height - 8, text=label_time, fill='gray', font=('Arial', 8))
+            chart.create_text(12, 12, text=f"{max_latency:.1f} sn", anchor=tk.NW, fill='gray', font=('Arial', 8))
+        
+        def refresh():
+            seconds = ranges.get(range_var.get())
+            since = time.time() - seconds if seconds else None
+            data = telemetry.get_dashboard_data(since)
+            overall = data["overall"]
+            per_minute = f"{overall['per_minute']:.1f}" if overall['per_minute'] else "-"
+            overall_label.config(text=(
+                f"{overall['count']} istek • p50 {format_seconds(overall['p50'])} sn • p95 {format_seconds(overall['p95'])} sn • "
+                f"{per_minute} istek/dk • hata %{overall['error_rate'] * 100:.1f} • önbellekten {overall['cached']} • "
+                f"şemalı ayrıştırma {format_rate(overall['schema_rate'])} • onarım {format_rate(overall['repair_rate'])} • "
+                f"kopya istek {overall['hedged']} (kazanan {overall['hedge_wins']})"
+            ))
+            error_text = ", ".join(f"{error_type}: {count}" for error_type, count in sorted(data["error_types"].items()))
+            errors_label.config(text=f"Hata türleri: {error_text}" if error_text else "Hata yok")
+            
+            breakdown_tree.delete(*breakdown_tree.get_children())
+            for key, summary in data["by_key"].items():
+                breakdown_tree.insert('', tk.END, values=(
+                    key, summary['count'], format_seconds(summary['p50']), format_seconds(summary['p95']),
+                    f"{summary['per_minute']:.1f}" if summary['per_minute'] else "-",
+                    f"%{summary['error_rate'] * 100:.0f}",
+                    f"{summary['parse_p50'] * 1000:.1f}" if summary['parse_p50'] is not None else "-",
+                    format_rate(summary['repair_rate']), summary['prompt_tokens']
+                ))
+            draw_chart(data["series"])
+        
+        def clear_telemetry():
+            if messagebox.askyesno("Kayıtları Temizle", "Tüm YZ istek kayıtları silinsin mi?", parent=dashboard_window):
+                removed = telemetry.clear()
+                print(f"YZ istek kayıtları temizlendi: {removed} kayıt silindi")
+                refresh()
+        
+        ttk.Button(top_frame, text="Yenile", command=refresh).pack(side=tk.LEFT)
+        ttk.Button(top_frame, text="Kayıtları Temizle", command=clear_telemetry).pack(side=tk.RIGHT)
+        range_combo.bind('<<ComboboxSelected>>', lambda event: refresh())
+        ttk.Button(main_frame, text="Kapat", command=dashboard_window.destroy).pack(side=tk.RIGHT)
+        
+        # Grafik boyutu ancak pencere çizildikten sonra bilinir
+        dashboard_window.after(100, refresh)
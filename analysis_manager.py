@@ -5,12 +5,18 @@ import sys
 import datetime
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, CancelledError
 
 # Import modülleri
 from modules.file_manager import FileManager
 from modules.ai_integration import AIIntegration, AIAnalysisError
 from modules.editorial_process import EditorialProcess, EditorialSuggestion
 from modules.settings_manager import SettingsManager
+from modules.request_worker import CancelToken
+from modules.rate_limiter import RateLimiter
+from modules.prefetch import AnalysisPrefetcher
+from modules.context_retrieval import ContextRetriever
+from modules.concurrency_controller import AdaptiveConcurrencyController
 from modules.ui_components import SuggestionCard, ProjectPanel
 
 class AnalysisManager:
@@ -20,6 +26,113 @@ class AnalysisManager:
         self.editorial_process = app.editorial_process
         self.file_manager = app.file_manager
         self.settings_manager = app.settings_manager
+        self._rate_limit_base_text = None
+        self._rate_limit_text = None
+        self._streamed_suggestion_keys = set()
+        # Çalışan analizin iptal işareti ("Analizi İptal Et" bunu iptal eder)
+        self._cancel_token = None
+        # Editör önerileri incelerken sıradaki bölümün aynı fazını önceden analiz eder
+        self.prefetcher = AnalysisPrefetcher()
+        # "İlgili Pasajlar" bağlam kaynağı için bölümler üzerinde arama dizini
+        self.context_retriever = ContextRetriever()
+        # Tam analizde model başına, gecikme ve hatalara göre büyüyüp küçülen eşzamanlılık penceresi
+        self.concurrency_controller = AdaptiveConcurrencyController()
+        # Hız sınırı beklemelerini ilerleme etiketinde göster
+        self.ai_integration.rate_limiter.on_wait = self._on_rate_limit_wait
+        # Uzun bölüm pencereleme ayarlarını uygula
+        self.editorial_process.configure_chunking(
+            self.settings_manager.get_setting("chunk_token_budget", 6000),
+            self.settings_manager.get_setting("chunk_overlap_tokens", 200),
+            self.settings_manager.get_setting("chunk_max_workers", 3)
+        )
+        # Kısa bölüm paketleme ayarlarını uygula
+        self.editorial_process.configure_batching(
+            self.settings_manager.get_setting("batch_packing_enabled", False),
+            self.settings_manager.get_setting("batch_token_budget", 6000),
+            self.settings_manager.get_setting("batch_short_chapter_chars", 3000)
+        )
+        # Engellenen pasaj ayıklama ayarlarını uygula
+        self.editorial_process.configure_block_isolation(
+            self.settings_manager.get_setting("block_isolation_enabled", True),
+            self.settings_manager.get_setting("block_isolation_token_budget", 20000)
+        )
+        # Paragraf kimlikli istem protokolünü uygula
+        self.editorial_process.configure_paragraph_protocol(
+            self.settings_manager.get_setting("paragraph_id_protocol", False)
+        )
+
+    def _on_rate_limit_wait(self, model_name: str, wait_seconds: float):
+        """Hız sınırlayıcı beklerken çağrılır (işçi thread'inden)."""
+        self.app.root.after(0, lambda: self._show_rate_limit_wait(model_name, wait_seconds))
+
+    def _show_rate_limit_wait(self, model_name: str, wait_seconds: float):
+        """Kalan bekleme süresini ilerleme etiketine yazar; bekleme bitince eski metni geri yükler."""
+        label = getattr(self.app, 'progress_label', None)
+        if not label:
+            return
+        current_text = label.cget("text")
+        if wait_seconds > 0:
+            if current_text != self._rate_limit_text:
+                self._rate_limit_base_text = current_text
+            self._rate_limit_text = f"{self._rate_limit_base_text} • ⏳ {model_name} hız sınırı: {wait_seconds:.0f} sn bekleniyor"
+            label.config(text=self._rate_limit_text)
+        else:
+            # Etiket bu arada başka bir mesajla değiştirildiyse dokunma
+            if current_text == self._rate_limit_text and self._rate_limit_base_text is not None:
+                label.config(text=self._rate_limit_base_text)
+            self._rate_limit_text = None
+            self._rate_limit_base_text = None
+
+    def _new_cancel_token(self) -> CancelToken:
+        """Yeni bir analiz için iptal işareti oluşturur ve etkin işaret olarak saklar."""
+        self._cancel_token = CancelToken()
+        return self._cancel_token
+
+    def cancel_analysis(self):
+        """Çalışan analizi iptal eder; uçuştaki istekler bırakılır, sıradaki bölümler başlatılmaz."""
+        if not self._cancel_token or self._cancel_token.is_cancelled:
+            self.app.show_analysis_status("Çalışan bir analiz yok.", "gray")
+            return
+        self._cancel_token.cancel("kullanıcı iptal etti")
+        in_flight = self.ai_integration.request_worker.in_flight
+        print(f"⏹️ Analiz iptal ediliyor... (uçuştaki istek: {in_flight})")
+        self.app.show_analysis_status(f"⏹️ Analiz iptal ediliyor... ({in_flight} istek kapatılıyor)", "orange")
+
+    def _on_analysis_cancelled(self, chapter, phase_name: str):
+        """İptal edilen tek bölüm analizini hata olarak işaretlemeden kapatır."""
+        print(f"=== {phase_name.upper()} ANALİZİ İPTAL EDİLDİ ===")
+        self.app.root.after(0, lambda: self.app.hide_progress())
+        self.app.root.after(0, lambda: self.app.show_analysis_status(f"⏹️ {chapter.title} - {phase_name} analizi iptal edildi", "orange"))
+        self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+
+    def refresh_novel_context_in_background(self):
+        """Roman kimliği kullanılıyorsa ve güncel değilse arka planda (artımlı olarak) yeniler.
+
+        Proje yüklendikten sonra çağrılır; böylece ilk analiz roman kimliğinin oluşmasını
+        beklemez. Analiz bu arada başlarsa `generate_novel_context` çalışan işin bitmesini bekler.
+        """
+        uses_novel_context = any(
+            self.settings_manager.get_setting(f"{analysis_type}_context_source", "none") == "novel_context"
+            for analysis_type in ("grammar_check", "style_analysis", "content_review")
+        )
+        if not uses_novel_context or not self.ai_integration.has_credentials() or not self.ai_integration.model:
+            return
+        if not self.editorial_process.is_novel_context_stale(self.file_manager):
+            return
+        self.editorial_process.summary_settings['max_workers'] = self._get_full_analysis_workers(len(self.file_manager.chapters))
+
+        def refresh():
+            try:
+                self.editorial_process.generate_novel_context(self.file_manager, self.ai_integration)
+                self.app.root.after(0, lambda: self.app.show_analysis_status("📚 Roman kimliği güncellendi", "green"))
+            except Exception as e:
+                print(f"Arka planda roman kimliği oluşturma hatası: {e}")
+
+        print("📚 Roman kimliği arka planda güncelleniyor...")
+        self.app.show_analysis_status("📚 Roman kimliği arka planda güncelleniyor...", "blue")
+        refresh_thread = threading.Thread(target=refresh, name="novel-context")
+        refresh_thread.daemon = True
+        refresh_thread.start()
 
     def _get_phase_name(self, analysis_type: str) -> str:
         """Analiz türüne göre aşama adını döndürür"""
@@ -39,6 +152,26 @@ class AnalysisManager:
                 full_text += f"### Bölüm {chapter.chapter_number}\n\n{chapter.content}\n\n---\n\n"
         return full_text
 
+    def _build_retrieved_context(self, chapter, analysis_type: str, query_text: str = None):
+        """Bağlam kaynağı "retrieval" ise bölüm için seçilmiş pasajları döndürür, değilse None.
+
+        Seçim analizinde `query_text` seçili metindir; komşu bölümler yine bölüme göre belirlenir.
+        """
+        context_source = self.settings_manager.get_setting(f"{analysis_type}_context_source", "none")
+        if context_source != "retrieval":
+            return None
+        chapters = self.file_manager.chapters
+        try:
+            chapter_index = chapters.index(chapter)
+        except ValueError:
+            return None
+        retrieved = self.context_retriever.select_context(
+            chapters, chapter_index, query_text=query_text,
+            token_budget=self.settings_manager.get_setting("retrieval_token_budget", 8000),
+            top_k=self.settings_manager.get_setting("retrieval_top_k", 8)
+        )
+        return retrieved or None
+
     def update_analysis_button(self, phase: str):
         """Analiz butonunun text'ini güncelle"""
         button_texts = {
@@ -160,9 +293,8 @@ class AnalysisManager:
             messagebox.showwarning("Uyarı", "Lütfen analiz edilecek bir bölüm seçin.")
             return
 
-        # API anahtarı kontrolü
-        api_key = self.settings_manager.get_setting("api_key", "")
-        if not api_key:
+        # API anahtarı kontrolü (sahte arka uç anahtar istemez)
+        if not self.ai_integration.has_credentials():
             response = messagebox.askyesno(
                 "YZ Ayarları Gerekli",
                 "Analiz için Gemini API anahtarı gerekli.\n\nYZ ayarlarını şimdi yapmak ister misiniz?"
@@ -244,8 +376,7 @@ class AnalysisManager:
     def start_analysis_on_selection(self, chapter, selected_text):
         """Starts a grammar analysis specifically on the selected text, respecting context settings."""
         # API key check
-        api_key = self.settings_manager.get_setting("api_key", "")
-        if not api_key:
+        if not self.ai_integration.has_credentials():
             response = messagebox.askyesno(
                 "YZ Ayarları Gerekli",
                 "Analiz için Gemini API anahtarı gerekli.\n\nYZ ayarlarını şimdi yapmak ister misiniz?"
@@ -265,6 +396,8 @@ class AnalysisManager:
         elif context_source == "full_text":
             full_novel_content_to_pass = self.generate_full_novel_content()
             print("Seçim analizi için 'Romanın Tam Metni' bağlamı kullanılacak.")
+        elif context_source == "retrieval":
+            print("Seçim analizi için 'İlgili Pasajlar' bağlamı kullanılacak.")
         else:
             print("Seçim analizi bağlam olmadan yapılacak.")
 
@@ -304,7 +437,9 @@ class AnalysisManager:
             suggestions = self.editorial_process.analyze_text_snippet(
                 selected_text, self.ai_integration, analysis_type,
                 novel_context=novel_context,
-                full_novel_content=full_novel_content
+                full_novel_content=full_novel_content,
+                retrieved_context=self._build_retrieved_context(chapter, analysis_type, query_text=selected_text),
+                interactive=True
             )
 
             print(f"=== {phase_name.upper()} ANALİZ SONUÇLARI ===")
@@ -380,30 +515,62 @@ class AnalysisManager:
             # Thread'den ana thread'e hata bildirimi
             self.app.root.after(0, lambda: self._handle_thread_error(str(e)))
 
+    def _resolve_analysis_context(self, analysis_type: str, phase_name: str, show_progress: bool = True, cancel_token=None):
+        """Ayarlara göre analizde kullanılacak bağlamı (roman kimliği veya tam metin) belirler.
+
+        `cancel_token` iptal edilirse roman kimliği için bekleyen özet istekleri de bırakılır.
+        """
+        novel_context = None
+        full_novel_content = None
+        context_setting_key = f"{analysis_type}_context_source"
+        context_source = self.settings_manager.get_setting(context_setting_key, "none")
+
+        if context_source == "novel_context":
+            # Roman kimliği yoksa, eksik bölüm özetleriyle oluştuysa ya da bölümler değiştiyse yenile;
+            # bölüm özetleri içerik özetiyle saklandığından yalnızca değişen bölümler yeniden özetlenir
+            if self.editorial_process.is_novel_context_stale(self.file_manager):
+                if show_progress:
+                    self.app.root.after(0, lambda: self.app.show_progress("Roman kimliği oluşturuluyor..."))
+                self.editorial_process.summary_settings['max_workers'] = self._get_full_analysis_workers(len(self.file_manager.chapters))
+                self.editorial_process.generate_novel_context(self.file_manager, self.ai_integration, cancel_token)
+            novel_context = self.editorial_process.novel_context
+            print(f"Analiz ({phase_name}) için 'Roman Kimliği' bağlamı kullanılacak.")
+        
+        elif context_source == "full_text":
+            # Romanın tam metnini oluştur
+            if show_progress:
+                self.app.root.after(0, lambda: self.app.show_progress("Romanın tam metni hazırlanıyor..."))
+            full_novel_content = self.generate_full_novel_content()
+            print(f"Analiz ({phase_name}) için 'Romanın Tam Metni' bağlamı kullanılacak.")
+        
+        elif context_source == "retrieval":
+            # Pasajlar bölüme göre seçilir (bkz. _build_retrieved_context)
+            print(f"Analiz ({phase_name}) için 'İlgili Pasajlar' bağlamı kullanılacak.")
+        
+        else:
+            print(f"Analiz ({phase_name}) bağlam olmadan yapılacak.")
+
+        return novel_context, full_novel_content
+
     def _perform_phase_analysis(self, chapter, analysis_type: str, phase_name: str, novel_context, full_novel_content):
         """Belirli bir faz için gerçek analiz işlemini yap"""
         try:
+            # İptal düğmesi roman kimliği hazırlığını da durdurur
+            cancel_token = self._new_cancel_token()
             # Eğer harici olarak bir bağlam sağlanmadıysa, ayarlardan belirle
             if novel_context is None and full_novel_content is None:
-                context_setting_key = f"{analysis_type}_context_source"
-                context_source = self.settings_manager.get_setting(context_setting_key, "none")
-
-                if context_source == "novel_context":
-                    # Roman kimliği oluştur veya mevcut olanı kullan
-                    if not self.editorial_process.novel_context:
-                        self.app.root.after(0, lambda: self.app.show_progress("Roman kimliği oluşturuluyor..."))
-                        self.editorial_process.generate_novel_context(self.file_manager, self.ai_integration)
-                    novel_context = self.editorial_process.novel_context
-                    print(f"Analiz ({phase_name}) için 'Roman Kimliği' bağlamı kullanılacak.")
-                
-                elif context_source == "full_text":
-                    # Romanın tam metnini oluştur
-                    self.app.root.after(0, lambda: self.app.show_progress("Romanın tam metni hazırlanıyor..."))
-                    full_novel_content = self.generate_full_novel_content()
-                    print(f"Analiz ({phase_name}) için 'Romanın Tam Metni' bağlamı kullanılacak.")
-                
-                else:
-                    print(f"Analiz ({phase_name}) bağlam olmadan yapılacak.")
+                # Bu bölüm için önceden başlatılmış bir analiz varsa onu kullan (sürüyorsa bitmesini bekle)
+                if self.prefetcher.is_pending(chapter, analysis_type):
+                    self.app.root.after(0, lambda: self.app.show_progress(f"{phase_name} analizi: önceden başlatılan sonuç bekleniyor..."))
+                prefetched = self.prefetcher.take(chapter, analysis_type)
+                if prefetched is not None:
+                    print(f"⚡ {phase_name}: {chapter.title} için önceden hazırlanmış {len(prefetched)} öneri kullanıldı")
+                    self.app.root.after(0, lambda: self.app.hide_progress())
+                    self._on_phase_analysis_success(chapter, analysis_type, phase_name, prefetched)
+                    self._schedule_prefetch(chapter, analysis_type)
+                    return
+                novel_context, full_novel_content = self._resolve_analysis_context(analysis_type, phase_name,
+                                                                                  cancel_token=cancel_token)
 
             # Analiz aşaması
             self.app.root.after(0, lambda: self.app.show_progress(f"{phase_name} analizi yapılıyor..."))
@@ -413,90 +580,39 @@ class AnalysisManager:
             if not self.ai_integration or not self.ai_integration.model:
                 raise AIAnalysisError("YZ modeli yapılandırılmamış - Lütfen YZ ayarlarını kontrol edin", "config_error")
 
+            # Akış modunda öneriler geldikçe kart olarak eklenir
+            on_suggestion = None
+            streaming = self.settings_manager.get_setting("streaming_enabled", True)
+            if streaming:
+                self.app.root.after(0, lambda: self._begin_streaming_display(chapter))
+                on_suggestion = lambda s: self.app.root.after(0, lambda: self._on_streamed_suggestion(chapter, s))
+
             # AI analizini çağır ve AIAnalysisError'u yakala
             suggestions = self.editorial_process.analyze_chapter_single_phase(
-                chapter, self.ai_integration, analysis_type, novel_context, full_novel_content
+                chapter, self.ai_integration, analysis_type, novel_context, full_novel_content,
+                on_suggestion=on_suggestion, cancel_token=cancel_token,
+                retrieved_context=self._build_retrieved_context(chapter, analysis_type),
+                interactive=True
             )
 
             print(f"=== {phase_name.upper()} ANALİZ SONUÇLARI ===")
             print(f"Bulunan öneri sayısı: {len(suggestions) if suggestions else 0}")
             self.app.root.after(0, lambda: self.app.hide_progress())
 
-            # BAŞARILI ANALİZ DURUMU
-            # Başarılı analizde hata bayraklarını temizle
-            if analysis_type == "grammar_check":
-                chapter.analysis_phases["grammar_failed"] = False
-            elif analysis_type == "style_analysis":
-                chapter.analysis_phases["style_failed"] = False
-            elif analysis_type == "content_review":
-                chapter.analysis_phases["content_failed"] = False
-
-            if suggestions:
-                self.app.root.after(0, lambda: self.app.show_analysis_status(
-                    f"✅ {phase_name} analizi tamamlandı: {len(suggestions)} öneri bulundu", "green"
-                ))
+            if streaming:
+                self.app.root.after(0, lambda: self._finish_streamed_phase(chapter, analysis_type, phase_name, suggestions))
             else:
-                self.app.root.after(0, lambda: self.app.show_analysis_status(
-                    f"✅ {phase_name} analizi tamamlandı ancak öneri bulunamadı.", "green"
-                ))
-            
-            self.app.root.after(0, lambda: self.app.display_suggestions(suggestions or []))
-            chapter.suggestions = suggestions or []
-            
-            # Bölüm listesini güncelle (öneri sayıları için)
-            self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
-
-            # Fazı tamamlanmış olarak işaretle ve sonraki faza geç
-            if analysis_type == "grammar_check":
-                self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "grammar", completed=True))
-            elif analysis_type == "style_analysis":
-                self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "style", completed=True))
-            elif analysis_type == "content_review":
-                self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "content", completed=True))
-
-            next_phase = {"grammar_check": "grammar", "style_analysis": "style", "content_review": "content"}.get(analysis_type)
-            self.app.root.after(0, lambda: self.update_analysis_button(next_phase))
-            
-            # UI güncellemeleri
-            self.app.root.after(0, lambda: self.app.project_panel.update_preview(chapter))
-            self.app.root.after(0, lambda: self.app.project_panel.update_status())
-            self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
-            self.app.root.after(0, lambda: self.app.mark_as_modified())
-            
-            # Bölüm listesini güncelle (öneri sayıları için)
-            self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+                self._on_phase_analysis_success(chapter, analysis_type, phase_name, suggestions)
+            self._schedule_prefetch(chapter, analysis_type)
 
         except AIAnalysisError as e:
+            if e.error_type == "cancelled":
+                self._on_analysis_cancelled(chapter, phase_name)
+                return
             print(f"=== {phase_name.upper()} ANALİZ HATASI (AI) ===")
             print(f"Hata mesajı: {str(e)}")
-            
-            error_msg = f"❌ {phase_name} analizi başarısız oldu: {str(e)}"
             self.app.root.after(0, lambda: self.app.hide_progress())
-            self.app.root.after(0, lambda: self.app.show_analysis_status(error_msg, "red"))
-            self.app.root.after(0, lambda msg=str(e): messagebox.showwarning(f"{phase_name} Analiz Uyarısı", f"Analiz tamamlanamadı:\n\n{msg}"))
-
-            # Analiz fazını başarısız olarak işaretle ve UI'ı güncelle
-            if analysis_type == "grammar_check":
-                chapter.analysis_phases["grammar_completed"] = False
-                chapter.analysis_phases["grammar_failed"] = True  # Hata bayrağı
-                self.app.current_analysis_phase = "none"
-                self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "none", completed=False))
-                self.app.root.after(0, lambda: self.update_analysis_button("none"))
-            elif analysis_type == "style_analysis":
-                chapter.analysis_phases["style_completed"] = False
-                chapter.analysis_phases["style_failed"] = True  # Hata bayrağı
-                self.app.current_analysis_phase = "grammar"
-                self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "grammar", completed=False))
-                self.app.root.after(0, lambda: self.update_analysis_button("grammar"))
-            elif analysis_type == "content_review":
-                chapter.analysis_phases["content_completed"] = False
-                chapter.analysis_phases["content_failed"] = True  # Hata bayrağı
-                self.app.current_analysis_phase = "style"
-                self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "style", completed=False))
-                self.app.root.after(0, lambda: self.update_analysis_button("style"))
-            
-            # Proje panelini (bölüm listesi ve önizleme) güncelle
-            self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+            self._on_phase_analysis_failure(chapter, analysis_type, phase_name, e)
 
         except Exception as e:
             print(f"=== {phase_name.upper()} ANALİZ HATASI (Genel) ===")
@@ -508,6 +624,149 @@ class AnalysisManager:
             self.app.root.after(0, lambda: self.app.show_analysis_status(error_msg, "red"))
             self.app.root.after(0, lambda msg=str(e): messagebox.showwarning("Analiz Uyarısı", f"Beklenmedik bir sistem hatası oluştu:\n{msg}"))
 
+    # Bölümün kayıtlı fazına göre bir sonraki analiz düğmesinin başlatacağı analiz türü
+    NEXT_ANALYSIS_TYPE = {
+        "none": "grammar_check",
+        "grammar": "style_analysis",
+        "style": "content_review",
+    }
+
+    def _schedule_prefetch(self, chapter, analysis_type: str):
+        """Ayar açıksa sıradaki bölümün aynı fazını arka planda başlatır."""
+        if not self.settings_manager.get_setting("prefetch_enabled", False):
+            return
+        chapters = self.file_manager.chapters
+        try:
+            next_index = chapters.index(chapter) + 1
+        except ValueError:
+            return
+        if next_index >= len(chapters):
+            return
+        next_chapter = chapters[next_index]
+        if not next_chapter.content or not next_chapter.content.strip():
+            return
+        # Bekleyen önerisi olan bölümde analiz zaten başlatılamaz
+        if getattr(next_chapter, 'suggestions', None):
+            return
+        next_phase = self.get_chapter_analysis_phase(next_chapter)
+        if self.NEXT_ANALYSIS_TYPE.get(next_phase) != analysis_type:
+            return
+
+        phase_name = self._get_phase_name(analysis_type)
+
+        def run_prefetch(cancel_token):
+            novel_context, full_novel_content = self._resolve_analysis_context(analysis_type, phase_name, show_progress=False,
+                                                                              cancel_token=cancel_token)
+            return self.editorial_process.analyze_chapter_single_phase(
+                next_chapter, self.ai_integration, analysis_type, novel_context, full_novel_content,
+                cancel_token=cancel_token,
+                retrieved_context=self._build_retrieved_context(next_chapter, analysis_type)
+            )
+
+        self.prefetcher.schedule(next_chapter, analysis_type, run_prefetch)
+
+    def _on_phase_analysis_success(self, chapter, analysis_type: str, phase_name: str, suggestions,
+                                   notify_blocked: bool = True):
+        """Başarılı bir faz analizinin sonuçlarını bölüme işler ve UI güncellemelerini ana thread'e sıralar.
+
+        Bölümde güvenlik filtresine takılan pasajlar varsa `notify_blocked` ile editöre ayrıca bildirilir.
+        """
+        # BAŞARILI ANALİZ DURUMU
+        # Başarılı analizde hata bayraklarını temizle
+        if analysis_type == "grammar_check":
+            chapter.analysis_phases["grammar_failed"] = False
+        elif analysis_type == "style_analysis":
+            chapter.analysis_phases["style_failed"] = False
+        elif analysis_type == "content_review":
+            chapter.analysis_phases["content_failed"] = False
+
+        if suggestions:
+            self.app.root.after(0, lambda: self.app.show_analysis_status(
+                f"✅ {phase_name} analizi tamamlandı: {len(suggestions)} öneri bulundu", "green"
+            ))
+        else:
+            self.app.root.after(0, lambda: self.app.show_analysis_status(
+                f"✅ {phase_name} analizi tamamlandı ancak öneri bulunamadı.", "green"
+            ))
+        
+        blocked_passages = getattr(chapter, 'blocked_passages', None)
+        if blocked_passages:
+            self.app.root.after(0, lambda: self.app.show_analysis_status(
+                f"⚠️ {phase_name} analizi tamamlandı: {len(suggestions or [])} öneri; "
+                f"{len(blocked_passages)} pasaj güvenlik filtresi nedeniyle analiz edilemedi", "orange"
+            ))
+            if notify_blocked:
+                message = self._describe_blocked_passages([chapter])
+                self.app.root.after(0, lambda: messagebox.showwarning("Engellenen Pasajlar", message))
+        
+        self.app.root.after(0, lambda: self.app.display_suggestions(suggestions or []))
+        chapter.suggestions = suggestions or []
+        
+        # Bölüm listesini güncelle (öneri sayıları için)
+        self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+
+        # Fazı tamamlanmış olarak işaretle ve sonraki faza geç
+        if analysis_type == "grammar_check":
+            self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "grammar", completed=True))
+        elif analysis_type == "style_analysis":
+            self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "style", completed=True))
+        elif analysis_type == "content_review":
+            self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "content", completed=True))
+
+        next_phase = {"grammar_check": "grammar", "style_analysis": "style", "content_review": "content"}.get(analysis_type)
+        self.app.root.after(0, lambda: self.update_analysis_button(next_phase))
+        
+        # UI güncellemeleri
+        self.app.root.after(0, lambda: self.app.project_panel.update_preview(chapter))
+        self.app.root.after(0, lambda: self.app.project_panel.update_status())
+        self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+        self.app.root.after(0, lambda: self.app.mark_as_modified())
+        
+        # Bölüm listesini güncelle (öneri sayıları için)
+        self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+
+    @staticmethod
+    def _describe_blocked_passages(chapters) -> str:
+        """Güvenlik filtresine takılan pasajları editöre gösterilecek metne çevirir."""
+        lines = ["Aşağıdaki pasajlar YZ güvenlik filtresine takıldığı için analiz edilemedi; "
+                 "bölümlerin geri kalanı analiz edildi. Bu pasajları elle gözden geçirin.\n"]
+        for chapter in chapters:
+            for passage in chapter.blocked_passages:
+                location = f"paragraf {passage['paragraph']}" if passage.get('paragraph') else "konum bulunamadı"
+                note = "" if passage['verified'] else " (kurtarma bütçesi doldu, denenmedi)"
+                preview = passage['text'] if len(passage['text']) <= 120 else passage['text'][:120] + "..."
+                lines.append(f"• {chapter.title}, {location}{note}:\n  \"{preview}\"")
+        return "\n".join(lines)
+
+    def _on_phase_analysis_failure(self, chapter, analysis_type: str, phase_name: str, error: AIAnalysisError):
+        """Başarısız bir faz analizini bölüme işler ve fazı bir önceki duruma geri alır."""
+        error_msg = f"❌ {phase_name} analizi başarısız oldu: {str(error)}"
+        self.app.root.after(0, lambda: self.app.show_analysis_status(error_msg, "red"))
+        self.app.root.after(0, lambda msg=str(error): messagebox.showwarning(f"{phase_name} Analiz Uyarısı", f"Analiz tamamlanamadı:\n\n{msg}"))
+
+        # Analiz fazını başarısız olarak işaretle ve UI'ı güncelle
+        if analysis_type == "grammar_check":
+            chapter.analysis_phases["grammar_completed"] = False
+            chapter.analysis_phases["grammar_failed"] = True  # Hata bayrağı
+            self.app.current_analysis_phase = "none"
+            self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "none", completed=False))
+            self.app.root.after(0, lambda: self.update_analysis_button("none"))
+        elif analysis_type == "style_analysis":
+            chapter.analysis_phases["style_completed"] = False
+            chapter.analysis_phases["style_failed"] = True  # Hata bayrağı
+            self.app.current_analysis_phase = "grammar"
+            self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "grammar", completed=False))
+            self.app.root.after(0, lambda: self.update_analysis_button("grammar"))
+        elif analysis_type == "content_review":
+            chapter.analysis_phases["content_completed"] = False
+            chapter.analysis_phases["content_failed"] = True  # Hata bayrağı
+            self.app.current_analysis_phase = "style"
+            self.app.root.after(0, lambda: self.set_chapter_analysis_phase(chapter, "style", completed=False))
+            self.app.root.after(0, lambda: self.update_analysis_button("style"))
+        
+        # Proje panelini (bölüm listesi ve önizleme) güncelle
+        self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+
     def _has_pending_suggestions(self) -> bool:
         """Bekleyen öneri var mı kontrol et - doğrudan veri modelinden"""
         current_chapter = self.app.project_panel.get_current_chapter()
@@ -593,9 +852,8 @@ class AnalysisManager:
                 messagebox.showerror("Hata", "Dosya operasyonları yöneticisi bulunamadı. Proje kaydedilemiyor.")
                 return
 
-        # API anahtarı kontrolü
-        api_key = self.settings_manager.get_setting("api_key", "")
-        if not api_key:
+        # API anahtarı kontrolü (sahte arka uç anahtar istemez)
+        if not self.ai_integration.has_credentials():
             response = messagebox.askyesno(
                 "YZ Ayarları Gerekli",
                 "Analiz için Gemini API anahtarı gerekli.\n\nYZ ayarlarını şimdi yapmak ister misiniz?"
@@ -621,8 +879,121 @@ class AnalysisManager:
         full_analysis_thread.daemon = True
         full_analysis_thread.start()
 
+    def _is_adaptive_concurrency_enabled(self) -> bool:
+        return bool(self.settings_manager.get_setting("adaptive_concurrency_enabled", True))
+
+    def _configure_concurrency_controller(self):
+        """Uyarlanır pencerenin başlangıç değerini ve üst sınırını ayarlardan yükler."""
+        try:
+            max_limit = int(self.settings_manager.get_setting("adaptive_concurrency_max", 8))
+        except (TypeError, ValueError):
+            max_limit = 8
+        self.concurrency_controller.configure(self._get_full_analysis_workers(max_limit), max_limit)
+        return self.concurrency_controller.max_limit
+
+    def _get_full_analysis_workers(self, chapter_count: int) -> int:
+        """Tam analizde aynı anda gönderilecek en fazla istek sayısını ayarlardan okur."""
+        try:
+            max_workers = int(self.settings_manager.get_setting("full_analysis_max_workers", 3))
+        except (TypeError, ValueError):
+            max_workers = 3
+        return max(1, min(max_workers, chapter_count))
+
+    @staticmethod
+    def _format_eta(seconds: float) -> str:
+        seconds = int(max(0, seconds))
+        if seconds < 60:
+            return f"{seconds} sn"
+        return f"{seconds // 60} dk {seconds % 60} sn"
+
+    def _run_with_concurrency_control(self, func, analysis_type: str, cancel_token=None, expected_seconds=None, size_chars: int = 0):
+        """`func()`'u uyarlanır eşzamanlılık penceresi içinde çalıştırır.
+
+        Uyarlanır eşzamanlılık açıksa istek, modelin penceresinde yer açılana kadar bekler ve
+        sonucu (süre, kota/zaman aşımı hatası) pencereyi güncellemek için bildirilir.
+        """
+        if cancel_token and cancel_token.is_cancelled:
+            raise AIAnalysisError("Analiz iptal edildi.", error_type="cancelled")
+        controller = self.concurrency_controller if self._is_adaptive_concurrency_enabled() else None
+        if not controller:
+            return func()
+        model_name = self.ai_integration._get_model_name(analysis_type)
+        try:
+            started = controller.acquire(model_name, cancel_check=lambda: cancel_token is not None and cancel_token.is_cancelled)
+        except InterruptedError:
+            raise AIAnalysisError("Analiz iptal edildi.", error_type="cancelled")
+        error_type = None
+        try:
+            return func()
+        except AIAnalysisError as e:
+            error_type = e.error_type
+            raise
+        except Exception:
+            error_type = "system_error"
+            raise
+        finally:
+            controller.release(model_name, started, error_type, expected_seconds, size_chars)
+
+    def _analyze_chapter_for_full_analysis(self, chapter, analysis_type: str, novel_context, full_novel_content, cancel_token=None,
+                                           expected_seconds=None):
+        """Havuzdaki bir işçi thread'inde tek bir bölümü analiz eder; UI'a dokunmaz."""
+        def analyze():
+            print(f"=== TAM ANALİZ: Bölüm {chapter.chapter_number} ({analysis_type}) işçi thread'inde başladı ===")
+            return self.editorial_process.analyze_chapter_single_phase(
+                chapter, self.ai_integration, analysis_type, novel_context, full_novel_content,
+                cancel_token=cancel_token,
+                retrieved_context=self._build_retrieved_context(chapter, analysis_type)
+            )
+        return self._run_with_concurrency_control(analyze, analysis_type, cancel_token, expected_seconds, len(chapter.content or ""))
+
+    def _analyze_unit_for_full_analysis(self, chapters, analysis_type: str, novel_context, full_novel_content, cancel_token=None,
+                                        expected_seconds=None):
+        """Bir analiz birimini (tek bölüm ya da kısa bölüm paketi) analiz eder; UI'a dokunmaz.
+
+        Bölüm sırasıyla öneri listelerini döndürür. Paket isteği başarısız olursa bölümler tek
+        tek analiz edilir; tek başına da başarısız olan bölümün yerinde hata nesnesi döner.
+        """
+        if len(chapters) == 1:
+            return [self._analyze_chapter_for_full_analysis(chapters[0], analysis_type, novel_context, full_novel_content,
+                                                            cancel_token, expected_seconds)]
+
+        def analyze_batch():
+            print(f"=== TAM ANALİZ: {len(chapters)} bölümlük paket ({analysis_type}) işçi thread'inde başladı ===")
+            # "İlgili Pasajlar" paketin tüm metnine göre, ilk bölümün komşuluğundan seçilir
+            retrieved_context = self._build_retrieved_context(
+                chapters[0], analysis_type, query_text="\n\n".join(chapter.content for chapter in chapters))
+            return self.editorial_process.analyze_chapter_batch(
+                chapters, self.ai_integration, analysis_type, novel_context, full_novel_content,
+                cancel_token=cancel_token, retrieved_context=retrieved_context
+            )
+
+        try:
+            return self._run_with_concurrency_control(analyze_batch, analysis_type, cancel_token, expected_seconds,
+                                                      sum(len(chapter.content or "") for chapter in chapters))
+        except AIAnalysisError as e:
+            # İptal, kota ve yapılandırma hataları bölüm bölüm denemekle düzelmez
+            if e.error_type in ("cancelled", "quota_exceeded", "invalid_api_key", "circuit_open", "config_error"):
+                raise
+            print(f"⚠️ Paket analizi başarısız ({e.error_type}); {len(chapters)} bölüm tek tek analiz edilecek")
+        results = []
+        for chapter in chapters:
+            try:
+                results.append(self._analyze_chapter_for_full_analysis(chapter, analysis_type, novel_context, full_novel_content,
+                                                                       cancel_token))
+            except AIAnalysisError as chapter_error:
+                if chapter_error.error_type == "cancelled":
+                    raise
+                results.append(chapter_error)
+        return results
+
     def _threaded_full_analysis(self):
-        """Tüm bölümlerin analizini arka planda yürüten asıl metot."""
+        """Tüm bölümlerin analizini arka planda yürüten asıl metot.
+
+        Bölümler sınırlı bir işçi havuzu üzerinden eşzamanlı olarak analiz edilir;
+        sonuçlar ise bölüm sırasına göre ana (Tk) thread'e aktarılır. Paketleme açıksa
+        ardışık kısa bölümler tek istekte analiz edilir.
+        """
+        cancel_token = self._new_cancel_token()
         try:
             # Sadece sıradaki bir görevi al
             task = self._get_next_analysis_task()
@@ -633,53 +1004,160 @@ class AnalysisManager:
                 return
 
             analysis_type, chapters_to_analyze, phase_name = task
-            total_chapters = len(chapters_to_analyze)
-            
-            self.app.root.after(0, lambda: self.app.show_analysis_status(f"🚀 {phase_name} analizi başlıyor ({total_chapters} bölüm)...", "blue"))
 
-            for i, chapter in enumerate(chapters_to_analyze):
-                # Arayüzü güncelle: Analiz edilen bölümü seç ve içeriğini göster
+            # Proje listesinde artık bulunmayan bölümleri atla
+            chapter_indices = {}
+            for chapter in chapters_to_analyze:
                 try:
-                    chapter_index = self.file_manager.chapters.index(chapter)
-                    self.app.root.after(0, lambda idx=chapter_index: self.app.project_panel.select_chapter(idx))
+                    chapter_indices[id(chapter)] = self.file_manager.chapters.index(chapter)
                 except ValueError:
                     print(f"Hata: Bölüm '{chapter.title}' proje listesinde bulunamadı. Atlanıyor.")
-                    continue
+            chapters_to_analyze = [c for c in chapters_to_analyze if id(c) in chapter_indices]
+            total_chapters = len(chapters_to_analyze)
+            if not total_chapters:
+                return
 
-                progress_text = f"{phase_name} analizi: Bölüm {i+1}/{total_chapters} ({chapter.title})"
-                self.app.root.after(0, lambda p=progress_text: self.app.show_progress(p))
-                
-                try:
-                    # Bağlam parametrelerini None olarak göndererek _perform_phase_analysis'in
-                    # ayarlara göre doğru bağlamı seçmesini sağlıyoruz.
-                    self._perform_phase_analysis(chapter, analysis_type, phase_name, None, None)
-                    time.sleep(2)  # API limitleri için bekleme
-
-                except Exception as e:
-                    error_msg = f"Bölüm {chapter.chapter_number} analizi başarısız: {e}"
-                    print(error_msg)
-                    self.app.root.after(0, lambda msg=error_msg: self.app.show_analysis_status(f"❌ {msg}", "red"))
-                    continue
+            # Analiz birimleri: tek bölümler ve (paketleme açıksa) kısa bölüm paketleri
+            units = self.editorial_process.plan_chapter_batches(chapters_to_analyze)
+            if len(units) < total_chapters:
+                print(f"📦 {total_chapters} bölüm {len(units)} istekte analiz edilecek")
+
+            adaptive = self._is_adaptive_concurrency_enabled()
+            model_name = self.ai_integration._get_model_name(analysis_type)
+            if adaptive:
+                # Havuz üst sınır kadar thread açar; aynı anda kaç bölümün istek göndereceğini pencere belirler
+                pool_size = min(self._configure_concurrency_controller(), len(units))
+                start_text = f"{self.concurrency_controller.window(model_name)} eşzamanlı istekle başlayarak, en fazla {pool_size}"
+            else:
+                pool_size = self._get_full_analysis_workers(len(units))
+                start_text = f"{pool_size} eşzamanlı istek"
+            if len(units) < total_chapters:
+                start_text += f", {len(units)} istek"
+            self.app.root.after(0, lambda: self.app.show_analysis_status(
+                f"🚀 {phase_name} analizi başlıyor ({total_chapters} bölüm, {start_text})...", "blue"))
+
+            # Bağlam tüm bölümler için aynıdır; bir kez hazırlanır ("İlgili Pasajlar" hariç, o bölüm başına seçilir).
+            novel_context, full_novel_content = self._resolve_analysis_context(analysis_type, phase_name,
+                                                                              cancel_token=cancel_token)
+
+            if not self.ai_integration or not self.ai_integration.model:
+                raise AIAnalysisError("YZ modeli yapılandırılmamış - Lütfen YZ ayarlarını kontrol edin", "config_error")
+
+            self.app.root.after(0, lambda: self.app.show_progress(
+                f"{phase_name} analizi: 0/{total_chapters} bölüm tamamlandı"))
+
+            # Kalan süre tahmini: ölçüm varsa gecikme modelinden, yoksa bu çalıştırmanın hızından
+            context_tokens = RateLimiter.estimate_tokens(full_novel_content or novel_context or "")
+            predicted_seconds = [
+                self.ai_integration.estimate_analysis_seconds("\n\n".join(chapter.content for chapter in unit), analysis_type, context_tokens)
+                for unit in units
+            ]
+            def current_workers() -> int:
+                return min(self.concurrency_controller.window(model_name), pool_size) if adaptive else pool_size
+
+            if all(seconds is not None for seconds in predicted_seconds):
+                total_eta = sum(predicted_seconds) / current_workers()
+                print(f"⏱️ Tahmini süre: {self._format_eta(total_eta)}")
+            else:
+                predicted_seconds = None
+            analysis_started = time.time()
+
+            completed_chapters = 0
+            finished_chapters = 0
+            # Engellenen pasajlar her bölüm için ayrı değil, faz sonunda tek mesajla bildirilir
+            blocked_chapters = []
+            with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="full-analysis") as executor:
+                futures = [
+                    executor.submit(self._analyze_unit_for_full_analysis, unit, analysis_type,
+                                    novel_context, full_novel_content, cancel_token,
+                                    predicted_seconds[index] if predicted_seconds else None)
+                    for index, unit in enumerate(units)
+                ]
+                # İptalde henüz başlamamış bölümler hiç başlatılmaz
+                cancel_token.add_callback(lambda: [f.cancel() for f in futures])
+
+                # Sonuçları gönderim sırasıyla topla; böylece UI bölüm sırasını korur.
+                for unit_index, (unit, future) in enumerate(zip(units, futures)):
+                    try:
+                        unit_results = future.result()
+                    except CancelledError:
+                        continue
+                    except Exception as e:
+                        # Paketin tamamına ait hata her bölüm için ayrı işlenir
+                        unit_results = [e] * len(unit)
+
+                    for chapter, result in zip(unit, unit_results):
+                        finished_chapters += 1
+                        try:
+                            if isinstance(result, AIAnalysisError):
+                                if result.error_type == "cancelled":
+                                    continue  # İptal edilen bölüm hata olarak işaretlenmez
+                                print(f"=== {phase_name.upper()} ANALİZ HATASI (AI) - Bölüm {chapter.chapter_number} ===")
+                                print(f"Hata mesajı: {str(result)}")
+                                self._on_phase_analysis_failure(chapter, analysis_type, phase_name, result)
+                                continue
+                            if isinstance(result, Exception):
+                                error_msg = f"Bölüm {chapter.chapter_number} analizi başarısız: {result}"
+                                print(error_msg)
+                                self.app.root.after(0, lambda msg=error_msg: self.app.show_analysis_status(f"❌ {msg}", "red"))
+                                continue
+                        finally:
+                            progress_text = f"{phase_name} analizi: {finished_chapters}/{total_chapters} bölüm tamamlandı ({chapter.title})"
+                            remaining = total_chapters - finished_chapters
+                            if remaining:
+                                if predicted_seconds:
+                                    eta = sum(predicted_seconds[unit_index + 1:]) / current_workers()
+                                else:
+                                    eta = (time.time() - analysis_started) / finished_chapters * remaining
+                                progress_text += f" • kalan ~{self._format_eta(eta)}"
+                            if adaptive:
+                                progress_text += f" • {self.concurrency_controller.describe(model_name)}"
+                            self.app.root.after(0, lambda p=progress_text: self.app.show_progress(p))
+
+                        # Arayüzü güncelle: Analiz edilen bölümü seç ve içeriğini göster
+                        idx = chapter_indices[id(chapter)]
+                        self.app.root.after(0, lambda idx=idx: self.app.project_panel.select_chapter(idx))
+                        self._on_phase_analysis_success(chapter, analysis_type, phase_name, result, notify_blocked=False)
+                        completed_chapters += 1
+                        if chapter.blocked_passages:
+                            blocked_chapters.append(chapter)
+            
+            if cancel_token.is_cancelled:
+                cancel_message = f"⏹️ {phase_name} analizi iptal edildi ({completed_chapters}/{total_chapters} bölüm tamamlandı)"
+                print(cancel_message)
+                self.app.root.after(0, lambda: self.app.show_analysis_status(cancel_message, "orange"))
+                self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+                return
             
-            # Faz tamamlandıktan sonra kullanıcıyı bilgilendir ve paneli güncelle
-            self.app.root.after(0, lambda: self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True))
+            if blocked_chapters:
+                message = self._describe_blocked_passages(blocked_chapters)
+                self.app.root.after(0, lambda: messagebox.showwarning("Engellenen Pasajlar", message))
             
-            # Bir sonraki görevi kontrol et ve ona göre mesaj göster
-            next_task = self._get_next_analysis_task()
-            if not next_task:
-                final_message = f"✅ {phase_name} analizi ve tüm analiz süreci tamamlandı!"
-                self.app.root.after(0, lambda: messagebox.showinfo("Analiz Tamamlandı", "Tüm bölümlerin analizi başarıyla tamamlandı."))
-                self.app.root.after(0, lambda: self.app.show_analysis_status(final_message, "green"))
-            else:
-                next_phase_name = self._get_phase_name(next_task[0])
-                phase_complete_message = f"✅ {phase_name} analizi tamamlandı. Sonraki aşama ({next_phase_name}) için tekrar 'Tümünü Analiz Et'e tıklayın."
-                self.app.root.after(0, lambda: self.app.show_analysis_status(phase_complete_message, "green"))
+            # Faz bayrakları ana thread'de güncellendiği için sonraki görev kontrolü de orada,
+            # sıradaki tüm UI güncellemelerinden sonra yapılır.
+            self.app.root.after(0, lambda: self._finish_full_analysis_phase(phase_name))
 
         except Exception as e:
             self.app.root.after(0, lambda: self._handle_thread_error(str(e)))
         finally:
             self.app.root.after(0, self.app.hide_progress)
 
+    def _finish_full_analysis_phase(self, phase_name: str):
+        """Bir tam analiz fazı bittiğinde kullanıcıyı bilgilendirir (ana thread'de çalışır)."""
+        # Faz tamamlandıktan sonra kullanıcıyı bilgilendir ve paneli güncelle
+        self.app.project_panel.update_chapters(self.app.project_panel.chapters, preserve_selection=True)
+        
+        # Bir sonraki görevi kontrol et ve ona göre mesaj göster
+        next_task = self._get_next_analysis_task()
+        if not next_task:
+            final_message = f"✅ {phase_name} analizi ve tüm analiz süreci tamamlandı!"
+            messagebox.showinfo("Analiz Tamamlandı", "Tüm bölümlerin analizi başarıyla tamamlandı.")
+            self.app.show_analysis_status(final_message, "green")
+        else:
+            next_phase_name = self._get_phase_name(next_task[0])
+            phase_complete_message = f"✅ {phase_name} analizi tamamlandı. Sonraki aşama ({next_phase_name}) için tekrar 'Tümünü Analiz Et'e tıklayın."
+            self.app.show_analysis_status(phase_complete_message, "green")
+
     def _get_next_analysis_task(self):
         """Sıradaki analiz görevini (tür ve bölümler) belirler."""
         all_chapters = sorted(self.file_manager.chapters, key=lambda c: c.chapter_number)
@@ -778,6 +1256,9 @@ class AnalysisManager:
             # Yatay düzen için container frame oluştur
             cards_container = ttk.Frame(self.app.suggestions_frame)
             cards_container.pack(fill=tk.BOTH, expand=True)
+            # Akış sırasında yeni kartların eklenebilmesi için sakla
+            self._suggestion_cards_container = cards_container
+            self._suggestion_card_count = len(suggestions)
             
             # Özelleştirilebilir değerler
             cards_per_row = 3
@@ -885,6 +1366,74 @@ class AnalysisManager:
             )
             self.app.no_suggestions_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
 
+    def append_suggestion_card(self, suggestion):
+        """Mevcut kartları yeniden çizmeden listenin sonuna tek bir öneri kartı ekler."""
+        cards_container = getattr(self, '_suggestion_cards_container', None)
+        if cards_container is None or not cards_container.winfo_exists():
+            current_chapter = self.app.project_panel.get_current_chapter()
+            self.display_suggestions(getattr(current_chapter, 'suggestions', None) or [suggestion])
+            return
+        
+        cards_per_row = 3
+        max_width = 350
+        max_height = 400
+        
+        rows = cards_container.winfo_children()
+        if self._suggestion_card_count % cards_per_row == 0 or not rows:
+            current_row = ttk.Frame(cards_container)
+            current_row.pack(fill=tk.X, pady=5)
+        else:
+            current_row = rows[-1]
+        
+        try:
+            card_container = ttk.Frame(current_row, width=max_width, height=max_height)
+            card_container.pack(side=tk.LEFT, padx=5, fill=tk.BOTH, expand=True)
+            card_container.pack_propagate(False)
+            card = SuggestionCard(card_container, suggestion, self.app.handle_suggestion)
+            card.pack(fill=tk.BOTH, expand=True, padx=3, pady=3)
+        except Exception as card_error:
+            print(f"❌ Akış önerisi kartı oluşturulamadı: {card_error}")
+        self._suggestion_card_count += 1
+
+    def _begin_streaming_display(self, chapter):
+        """Akış başlarken öneri panelini boşaltır (ana thread'de çalışır)."""
+        self._streamed_suggestion_keys = set()
+        chapter.suggestions = []
+        self._suggestion_cards_container = None
+        self._suggestion_card_count = 0
+
+    def _on_streamed_suggestion(self, chapter, suggestion):
+        """Akış sırasında tamamlanan öneriyi panele ekler (ana thread'de çalışır)."""
+        key = (suggestion.original_sentence, suggestion.suggested_sentence)
+        self._streamed_suggestion_keys.add(key)
+        chapter.suggestions.append(suggestion)
+        if self.app.project_panel.get_current_chapter() is not chapter:
+            return
+        if len(chapter.suggestions) == 1:
+            self.display_suggestions(chapter.suggestions)
+            self.app.show_analysis_status("⚡ İlk öneri geldi, diğerleri yükleniyor...", "blue")
+        else:
+            self.append_suggestion_card(suggestion)
+
+    def _finish_streamed_phase(self, chapter, analysis_type: str, phase_name: str, suggestions):
+        """Akış bittiğinde kullanıcının bu arada işlediği önerileri nihai listeden çıkarır."""
+        remaining_keys = {
+            (s.original_sentence, s.suggested_sentence) for s in getattr(chapter, 'suggestions', [])
+            if not isinstance(s, dict)
+        }
+        handled_keys = self._streamed_suggestion_keys - remaining_keys
+        if handled_keys:
+            print(f"📋 Akış sırasında işlenen {len(handled_keys)} öneri nihai listeden çıkarıldı")
+        final_suggestions = [
+            s for s in (suggestions or [])
+            if (s.original_sentence, s.suggested_sentence) not in handled_keys
+        ]
+        self._streamed_suggestion_keys = set()
+        ttfs = self.ai_integration.last_request_metrics.get("time_to_first_suggestion")
+        if ttfs is not None:
+            print(f"📈 {phase_name}: ilk öneri {ttfs:.1f} sn'de gösterildi")
+        self._on_phase_analysis_success(chapter, analysis_type, phase_name, final_suggestions)
+
     def handle_suggestion(self, suggestion=None, action=None, update_display=True):
         """Öneri kabul/red işlemleri - Kapsamlı geçmiş ve vurgulama bilgisi kaydetme ile"""
         # Handle None cases
@@ -1367,6 +1916,9 @@ class AnalysisManager:
             status_message += f"\n🤖 YZ Durumu:\n"
             status_message += f"  🔑 API Anahtarı: {'✅ Ayarlanmış' if api_key else '❌ Ayarlanmamış'}\n"
             status_message += f"  🧠 Model: {model}\n"
+            status_message += f"  🔌 Arka Uç: {self.ai_integration.backend.name}\n"
+            worker_stats = self.ai_integration.request_worker.get_stats()
+            status_message += f"  📡 Uçuştaki İstek: {worker_stats['in_flight']}/{worker_stats['max_in_flight']} (bırakılmış: {worker_stats['abandoned']})\n"
             
             # Otomatik kaydetme durumu
             auto_save_enabled = self.settings_manager.get_setting('auto_save', True)
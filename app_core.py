@@ -11,7 +11,7 @@ from typing import Optional, Any, Callable, Union
 from modules.file_manager import FileManager
 from modules.ai_integration import AIIntegration
 from modules.editorial_process import EditorialProcess
-from modules.settings_manager import SettingsManager
+from modules.settings_manager import DEFAULT_INDIVIDUAL_MODELS, SettingsManager
 from modules.ui_components import SuggestionCard, ProjectPanel
 
 # Manager classes
@@ -87,21 +87,14 @@ class EditorialApp:
         api_key = self.settings_manager.get_setting("api_key", "")
         default_model = self.settings_manager.get_setting("model", "gemini-1.5-flash")
         
-        # Define default model settings
-        default_individual_models = {
-            "style_analysis": "gemini-1.5-flash",
-            "grammar_check": "gemini-1.5-flash",
-            "content_review": "gemini-1.5-flash",
-            "novel_context": "gemini-1.5-pro"
-        }
         # Load saved settings
         saved_individual_models = self.settings_manager.get_setting("individual_models", {})
         
         # Merge defaults with saved (saved take precedence)
         # This allows new models to be added to old settings files.
-        individual_models = {**default_individual_models, **saved_individual_models}
+        individual_models = {**DEFAULT_INDIVIDUAL_MODELS, **saved_individual_models}
         
-        if api_key:
+        if api_key or not self.ai_integration.backend.requires_api_key:
             print(f"Yapay zeka entegrasyonu başlatılıyor: Varsayılan model={default_model}")
             print(f"Bireysel modeller: {individual_models}")
             self.ai_integration.update_settings(api_key, default_model, individual_models)
@@ -357,6 +350,10 @@ class EditorialApp:
         if self.ai_manager is not None and hasattr(self.ai_manager, 'show_novel_context'):
             self.ai_manager.show_novel_context()
     
+    def open_telemetry_dashboard(self):
+        if self.ai_manager is not None and hasattr(self.ai_manager, 'open_telemetry_dashboard'):
+            self.ai_manager.open_telemetry_dashboard()
+    
     def open_auto_save_settings(self):
         if self.auto_save_manager is not None and hasattr(self.auto_save_manager, 'open_auto_save_settings'):
             self.auto_save_manager.open_auto_save_settings()
@@ -366,6 +363,10 @@ class EditorialApp:
             # Pass the context arguments to the analysis manager
             self.analysis_manager.start_analysis(novel_context=novel_context, full_novel_content=full_novel_content)
     
+    def cancel_analysis(self):
+        if self.analysis_manager is not None and hasattr(self.analysis_manager, 'cancel_analysis'):
+            self.analysis_manager.cancel_analysis()
+    
     def next_chapter(self):
         if self.analysis_manager is not None and hasattr(self.analysis_manager, 'next_chapter'):
             self.analysis_manager.next_chapter()
@@ -457,6 +458,7 @@ class EditorialApp:
             self.chapter_content_text.config(state='disabled')
         if self.analysis_manager:
             self.analysis_manager.display_suggestions([]) # Clear suggestions
+            self.analysis_manager.prefetcher.discard()
         
         # Reset analysis phase
         self.current_analysis_phase = "none"
@@ -0,0 +1,109 @@
+"""Analiz hattının sahte (çevrimdışı) arka uçla yük testi.
+
+Kullanım:
+    python benchmarks/bench_fake_backend.py [--chapters 24] [--workers 3] [--time-scale 0.2]
+                                            [--error-rate 0.05] [--quota-rate 0.05] [--stream] [--structured]
+
+`AIIntegration.analyze_chapter` gerçek hattıyla (hız sınırlayıcı, yeniden deneme, akış,
+ayrıştırma) çalıştırılır; yalnızca model çağrıları `FakeBackend`'e gider. Ayarlar yalnızca
+bellekte değiştirilir, settings.json'a yazılmaz. Yanıt önbelleği kapatılır.
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.ai_integration import AIAnalysisError, AIIntegration
+from modules.settings_manager import SettingsManager
+
+SENTENCES = [
+    "Sabah sisi kasabanın üzerine ağır bir örtü gibi çökmüştü.",
+    "Ayşe pencerenin önünde durmuş, uzaklardaki tepeleri seyrediyordu.",
+    "Kapı çalındığında ikisi de yerinden sıçradı ve birbirlerine baktılar.",
+    "Yaşlı adam bastonuna yaslanarak yavaş yavaş merdivenlerden indi.",
+    "Mektubu okuduktan sonra uzun süre hiçbir şey söylemedi.",
+    "Rüzgar, açık kalan pencereden içeri dolup perdeleri havalandırdı.",
+]
+
+
+def make_chapter(index: int, paragraphs: int = 12) -> str:
+    lines = []
+    for p in range(paragraphs):
+        lines.append(" ".join(SENTENCES[(index + p + k) % len(SENTENCES)] for k in range(4)))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chapters", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--time-scale", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--quota-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--structured", action="store_true", help="Şemalı JSON çıktı modu")
+    args = parser.parse_args()
+
+    settings = SettingsManager()
+    settings.settings.update({
+        "ai_backend": "fake",
+        "fake_backend": {
+            "seed": args.seed,
+            "time_scale": args.time_scale,
+            "error_rate": args.error_rate,
+            "quota_error_rate": args.quota_rate,
+            "retry_after": 1,
+        },
+        "response_cache_enabled": False,
+        "streaming_enabled": args.stream,
+        "structured_output_enabled": args.structured,
+        "rate_limit_rpm": args.rpm,
+        "context_cache_mode": "off",
+    })
+    ai = AIIntegration(settings)
+    ai.update_settings("", "gemini-1.5-flash")
+
+    latencies = []
+    failures = {}
+    suggestion_total = 0
+
+    def run(index):
+        start = time.perf_counter()
+        on_suggestion = (lambda suggestion: None) if args.stream else None
+        try:
+            suggestions = ai.analyze_chapter(make_chapter(index), "grammar_check", on_suggestion=on_suggestion)
+            return time.perf_counter() - start, len(suggestions), None
+        except AIAnalysisError as e:
+            return time.perf_counter() - start, 0, e.error_type
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(run, range(args.chapters)))
+    wall = time.perf_counter() - started
+
+    for elapsed, count, error_type in results:
+        latencies.append(elapsed)
+        suggestion_total += count
+        if error_type:
+            failures[error_type] = failures.get(error_type, 0) + 1
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"Bölüm: {args.chapters}, eşzamanlı: {args.workers}, akış: {'açık' if args.stream else 'kapalı'}")
+    print(f"Toplam süre: {wall:.2f}s, verim: {args.chapters / wall:.2f} bölüm/s")
+    print(f"Gecikme: medyan {statistics.median(latencies):.2f}s, p95 {p95:.2f}s, en fazla {latencies[-1]:.2f}s")
+    print(f"Öneri: {suggestion_total}, başarısız bölüm: {sum(failures.values())} {failures or ''}")
+    print(f"Sahte arka uç: {ai.backend.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
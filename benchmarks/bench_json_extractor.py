@@ -0,0 +1,148 @@
+"""Tek geçişli JSON ayrıştırıcı ile eski temizleme zincirinin karşılaştırması.
+
+Kullanım:
+    python benchmarks/bench_json_extractor.py [Responses ya da Archive klasörü ...]
+
+Klasör verilmezse proje dizinindeki (data/projects/*/Archive ve eski data/projects/*/Responses)
+arşivlenmiş YZ yanıtları kullanılır. Gerçek yanıtlara ek olarak, 100 KB üzerindeki yanıtlar için kontrol
+karakterleri, kaçışsız tırnaklar ve yarıda kesilmiş sonlar içeren sentetik yanıtlar üretilir.
+Her yanıt için süre (en iyi değer) ve tracemalloc ile en yüksek bellek kullanımı ölçülür.
+"""
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.ai_integration import AIIntegration
+from modules.json_extractor import TolerantJSONExtractor
+from modules.prompt_archive import PromptArchive
+from modules.settings_manager import SettingsManager, get_base_path
+
+REPEATS = 5
+
+
+def load_archived_responses(folders):
+    """Verilen klasörlerdeki (ya da tüm projelerdeki) yanıt arşivlerini ve eski yanıt dosyalarını okur."""
+    if not folders:
+        projects = os.path.join(get_base_path(), "data", "projects", "*")
+        folders = glob.glob(os.path.join(projects, "Archive")) + glob.glob(os.path.join(projects, "Responses"))
+    corpus = []
+    for folder in folders:
+        if os.path.exists(os.path.join(folder, "index.jsonl")):
+            archive = PromptArchive(folder)
+            for record in archive.iter_records("response"):
+                corpus.append((f"{record['analysis_type']}_{record['id']}", archive.load_text(record)))
+            continue
+        for path in sorted(glob.glob(os.path.join(folder, "*_response_*.txt"))):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                corpus.append((os.path.basename(path), f.read()))
+    return corpus
+
+
+def make_synthetic_response(target_size: int, seed: int, truncate: bool = False, dirty: bool = True) -> str:
+    """Gerçek yanıtlarda görülen bozuklukları içeren büyük bir yanıt üretir."""
+    rng = random.Random(seed)
+    words = ["roman", "karakter", "sahne", "cümle", "anlatıcı", "geçiş", "diyalog", "betimleme",
+             "zaman", "mekân", "çatışma", "ritim", "ses", "bakış", "açısı", "okur"]
+    items = []
+    size = 0
+    index = 0
+    while size < target_size:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(8, 30)))
+        if dirty and index % 7 == 0:
+            sentence = f'Dedi ki "{sentence}" ve sustu.'  # Kaçışsız iç tırnak
+        if dirty and index % 5 == 0:
+            sentence = sentence.replace(" ", "\u00a0", 2) + "\u200b"  # Bölünemez ve sıfır genişlikli boşluk
+        explanation = " ".join(rng.choice(words) for _ in range(rng.randint(10, 40)))
+        if dirty and index % 3 == 0:
+            explanation += "\nİkinci satır\x07"  # Ham satır sonu ve kontrol karakteri
+        item = (
+            '  {\n'
+            f'    "original_sentence": "{sentence}",\n'
+            f'    "suggested_sentence": "{sentence.capitalize()}.",\n'
+            f'    "explanation": "{explanation}",\n'
+            '    "severity": "medium"\n'
+            '  }'
+        )
+        items.append(item)
+        size += len(item)
+        index += 1
+    text = "İşte önerilerim:\n```json\n[\n" + ",\n".join(items) + "\n]\n```\nUmarım faydalı olur."
+    if truncate:
+        text = text[:int(len(text) * 0.97)]
+    return text
+
+
+def run_legacy(legacy: AIIntegration, text: str):
+    """parse_ai_response'un eski yolunu birebir çalıştırır: JSON zinciri, olmazsa metin ayrıştırma."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        json_start = text.find('[')
+        json_end = text.rfind(']') + 1
+        if json_start != -1 and json_end != 0:
+            cleaned = legacy._clean_json_control_chars(text[json_start:json_end])
+            cleaned = legacy._remove_extra_json_data(cleaned)
+            try:
+                result = json.loads(cleaned)
+                if isinstance(result, list):
+                    return result
+            except json.JSONDecodeError:
+                pass
+        return legacy._parse_text_response(text, "grammar_check")
+
+
+def run_extractor(text: str):
+    return TolerantJSONExtractor().extract(text)
+
+
+def measure(func, *args):
+    best = float("inf")
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    corpus = load_archived_responses(sys.argv[1:])
+    print(f"Arşivden {len(corpus)} yanıt yüklendi")
+    variants = [(100_000, False, False), (100_000, False, True), (250_000, False, True),
+                (500_000, False, True), (150_000, True, True)]
+    for i, (size, truncate, dirty) in enumerate(variants):
+        label = f"sentetik_{size // 1000}KB{'_bozuk' if dirty else '_temiz'}{'_yarim' if truncate else ''}"
+        corpus.append((label, make_synthetic_response(size, seed=i, truncate=truncate, dirty=dirty)))
+
+    legacy = AIIntegration(SettingsManager())
+
+    print(f"{'yanıt':<40} {'boyut':>8} | {'eski ms':>8} {'eski KB':>8} {'öneri':>5} | "
+          f"{'yeni ms':>8} {'yeni KB':>8} {'öneri':>5}")
+    totals = [0.0, 0, 0.0, 0]
+    for name, text in corpus:
+        legacy_time, legacy_peak, legacy_result = measure(run_legacy, legacy, text)
+        new_time, new_peak, new_result = measure(run_extractor, text)
+        legacy_count = len(legacy_result)
+        totals[0] += legacy_time
+        totals[1] += legacy_peak
+        totals[2] += new_time
+        totals[3] += new_peak
+        print(f"{name[:40]:<40} {len(text) // 1024:>6}KB | {legacy_time * 1000:>8.2f} {legacy_peak // 1024:>8} "
+              f"{legacy_count:>5} | {new_time * 1000:>8.2f} {new_peak // 1024:>8} {len(new_result):>5}")
+
+    print(f"{'TOPLAM':<40} {'':>8} | {totals[0] * 1000:>8.2f} {totals[1] // 1024:>8} {'':>5} | "
+          f"{totals[2] * 1000:>8.2f} {totals[3] // 1024:>8}")
+
+
+if __name__ == "__main__":
+    main()
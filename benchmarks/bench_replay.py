@@ -0,0 +1,70 @@
+"""Arşivlenmiş gerçek YZ yanıtlarıyla ayrıştırıcı regresyon testi.
+
+Kullanım:
+    python benchmarks/bench_replay.py [proje klasörü ...] [--save temel.json] [--baseline temel.json]
+
+Proje klasörü verilmezse proje dizinindeki tüm projelerin `Archive/` ve eski `Responses/`
+kayıtları `ReplayBackend` ile yüklenir. Her yanıt `parse_ai_response` ile ayrıştırılır; öneri
+sayıları ve ayrıştırma süresi yazdırılır. `--save` sonuçları temel olarak kaydeder,
+`--baseline` önceki bir temelle karşılaştırıp öneri sayısı değişen yanıtları listeler.
+Tam analiz hattını ağ olmadan çalıştırmak için uygulamada "Arşivden Tekrar Oynat" arka ucu seçilir.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.ai_integration import AIIntegration
+from modules.llm_backends import ReplayBackend
+from modules.settings_manager import SettingsManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("projects", nargs="*")
+    parser.add_argument("--save")
+    parser.add_argument("--baseline")
+    args = parser.parse_args()
+
+    settings = SettingsManager()
+    replay = ReplayBackend({"archive_dirs": args.projects, "projects_dir": settings.projects_dir})
+    ai = AIIntegration(settings)
+
+    results = {}
+    seen = {}
+    parse_total = 0.0
+    for prompt_hash, analysis_type, response, latency in replay.iter_entries():
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            suggestions = ai.parse_ai_response(response, analysis_type)
+        elapsed = time.perf_counter() - started
+        parse_total += elapsed
+        # Aynı prompt'un tekrarlanan yanıtları sıra numarasıyla ayrılır
+        base_key = f"{analysis_type}:{prompt_hash[:16]}"
+        seen[base_key] = seen.get(base_key, 0) + 1
+        key = f"{base_key}:{seen[base_key]}"
+        results[key] = len(suggestions)
+        print(f"{key:<50} {len(response) // 1024:>6}KB {len(suggestions):>5} öneri {elapsed * 1000:>8.2f} ms")
+
+    print(f"Toplam: {len(results)} yanıt, {sum(results.values())} öneri, ayrıştırma {parse_total:.2f}s")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        changed = {key: (baseline.get(key), count) for key, count in results.items() if baseline.get(key) != count}
+        for key, (before, after) in sorted(changed.items()):
+            print(f"DEĞİŞTİ {key}: {before} -> {after}")
+        print(f"Temelle farklı: {len(changed)} / {len(results)}")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Temel kaydedildi: {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Arayüzsüz (komut satırı) toplu analiz.
+
+Kullanım:
+    python cli.py roman.docx [--split number_only|keywords|custom] [--custom-word Kısım]
+                  [--phases grammar_check,style_analysis,content_review] [--chapters 1-5,8]
+                  [--workers 3] [--output sonuc.jsonl] [--set anahtar=değer ...] [--verbose]
+
+Roman `FileManager.load_novel` ile yüklenir, `split_into_chapters` ile bölümlere ayrılır ve
+her bölüm × faz işi `EditorialProcess`/`AIIntegration` ile masaüstü uygulamasıyla aynı
+ayarlarla (settings.json) analiz edilir. Öneriler uygulanmadığı için fazlar birbirini
+beklemez; tüm işler aynı işçi havuzunda çalışır. Her iş için bir JSON satırı, en sonda da
+bir özet satırı yazılır. `--set` ile verilen ayarlar yalnızca bellekte değişir. Uygulama
+logları stderr'e yazılır (`--verbose` olmadan gizlenir); Tk penceresi açılmaz.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from modules.headless_analysis import HeadlessAnalyzer
+from modules.request_worker import CancelToken
+from modules.settings_manager import SettingsManager
+
+SPLIT_METHODS = ("number_only", "keywords", "custom")
+
+
+def parse_chapter_selection(text: str) -> set:
+    """"1-5,8" biçimindeki bölüm numaralarını kümeye çevirir."""
+    selected = set()
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = part.split("-", 1)
+            selected.update(range(int(start), int(end) + 1))
+        elif part:
+            selected.add(int(part))
+    return selected
+
+
+def parse_setting(assignment: str):
+    """"anahtar=değer" ayarını çözer; değer JSON olarak okunamazsa metin kabul edilir."""
+    key, _, value = assignment.partition("=")
+    try:
+        return key.strip(), json.loads(value)
+    except ValueError:
+        return key.strip(), value
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("novel", help=".txt veya .docx roman dosyası")
+    parser.add_argument("--split", choices=SPLIT_METHODS, default="number_only", help="Bölümlere ayırma yöntemi")
+    parser.add_argument("--custom-word", help="--split custom için bölüm başlığı kelimesi")
+    parser.add_argument("--phases", default=",".join(HeadlessAnalyzer.PHASES),
+                        help="Virgülle ayrılmış analiz türleri")
+    parser.add_argument("--chapters", help="Yalnızca bu bölümler (ör. 1-5,8)")
+    parser.add_argument("--workers", type=int, help="Aynı anda çalışan bölüm × faz işi "
+                                                    "(varsayılan: full_analysis_max_workers ayarı)")
+    parser.add_argument("--output", default="-", help="JSON Lines çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="ANAHTAR=DEĞER",
+                        help="Ayarı yalnızca bu çalıştırma için değiştir (ör. ai_backend=\"fake\")")
+    parser.add_argument("--verbose", action="store_true", help="Uygulama loglarını stderr'e yaz")
+    args = parser.parse_args(argv)
+
+    phases = [phase.strip() for phase in args.phases.split(",") if phase.strip()]
+    unknown = [phase for phase in phases if phase not in HeadlessAnalyzer.PHASES]
+    if unknown:
+        parser.error(f"Bilinmeyen analiz türü: {', '.join(unknown)}")
+    if args.split == "custom" and not args.custom_word:
+        parser.error("--split custom için --custom-word gerekli")
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    # Modüller ilerlemeyi print ile yazar; JSON çıktısına karışmaması için stdout yönlendirilir
+    log_stream = sys.stderr if args.verbose else open(os.devnull, "w", encoding="utf-8")
+
+    def emit(record):
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    try:
+        with contextlib.redirect_stdout(log_stream):
+            settings = SettingsManager()
+            for assignment in args.overrides:
+                key, value = parse_setting(assignment)
+                settings.settings[key] = value
+            # Masaüstü uygulamasının son projesi bu çalıştırmayı etkilemesin
+            settings.settings["last_project"] = None
+            analyzer = HeadlessAnalyzer(settings)
+            if not analyzer.initialize_ai():
+                print("YZ modeli yapılandırılamadı", file=sys.stderr)
+                return 2
+
+            try:
+                file_manager, chapters = analyzer.load_chapters(args.novel, args.split, args.custom_word)
+            except ValueError as e:
+                print(str(e), file=sys.stderr)
+                return 2
+            if args.chapters:
+                selected = parse_chapter_selection(args.chapters)
+                chapters = [chapter for chapter in chapters if chapter.chapter_number in selected]
+            jobs = [(chapter, phase) for phase in phases for chapter in chapters if chapter.content.strip()]
+            workers = args.workers or int(settings.get_setting("full_analysis_max_workers", 3))
+            workers = max(1, min(workers, len(jobs) or 1))
+            # İstek havuzu en az işçi sayısı kadar olmalı; pencereler ek istek açabilir
+            analyzer.ai_integration.request_worker.configure(max(workers, settings.get_setting("ai_max_in_flight", 8)))
+            print(f"{len(chapters)} bölüm × {len(phases)} faz = {len(jobs)} iş, {workers} eşzamanlı", file=sys.stderr)
+
+            cancel_token = CancelToken()
+            started = time.time()
+            failed = 0
+            suggestion_total = 0
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cli-analysis") as executor:
+                futures = [executor.submit(analyzer.analyze, file_manager, chapter, phase, cancel_token)
+                           for chapter, phase in jobs]
+                try:
+                    for future in as_completed(futures):
+                        record = future.result()
+                        failed += record["status"] != "ok"
+                        suggestion_total += record["suggestion_count"]
+                        emit(dict(type="job", **record))
+                except KeyboardInterrupt:
+                    cancel_token.cancel("kullanıcı iptal etti")
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+            emit({
+                "type": "summary",
+                "novel": os.path.basename(args.novel),
+                "chapters": len(chapters),
+                "phases": phases,
+                "jobs": len(jobs),
+                "failed": failed,
+                "suggestions": suggestion_total,
+                "workers": workers,
+                "wall_seconds": round(time.time() - started, 3),
+                "stats": analyzer.get_stats(),
+            })
+        return 1 if failed else 0
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if log_stream is not sys.stderr:
+            log_stream.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -514,6 +514,9 @@ class FileOperationsManager:
                             self.app.display_suggestions([])
 
             print(f"Proje başarıyla yüklendi: {project_file}")
+            # Roman kimliğini ilk analizi bekletmeden arka planda güncelle
+            if getattr(self.app, 'analysis_manager', None):
+                self.app.analysis_manager.refresh_novel_context_in_background()
             return True
             
         except Exception as e:
@@ -50,6 +50,7 @@ def main():
     app.open_ai_settings = ai_manager.open_ai_settings
     app.open_prompt_settings = ai_manager.open_prompt_settings
     app.show_novel_context = ai_manager.show_novel_context
+    app.open_telemetry_dashboard = ai_manager.open_telemetry_dashboard
     
     # Auto save operations
     app.open_auto_save_settings = auto_save_manager.open_auto_save_settings
@@ -59,6 +60,7 @@ def main():
     
     # Analysis operations
     app.start_analysis = analysis_manager.start_analysis
+    app.cancel_analysis = analysis_manager.cancel_analysis
     app.next_chapter = analysis_manager.next_chapter
     app.prev_chapter = analysis_manager.prev_chapter
     app.apply_all_suggestions = analysis_manager.apply_all_suggestions
@@ -3,13 +3,24 @@
 # type: ignore
 
 # Lazy import - Google AI sadece ihtiyaç duyulduğunda yüklenecek
-from typing import Dict, List, Optional, Any, TYPE_CHECKING
+from typing import Dict, List, Optional, Any, Callable, Tuple, TYPE_CHECKING
 import json
 import time
 import os
-import datetime
+import threading
 import re
 from .settings_manager import SettingsManager
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+from .incremental_json import IncrementalJSONArrayParser
+from .json_extractor import TolerantJSONExtractor
+from .context_cache import CachedContextHandle, ContextCache, GeminiContextCache, LocalContextCache
+from .llm_backends import LLMBackend, ReplayMissError, create_backend
+from .request_worker import CancelToken, RequestCancelled, RequestWorker
+from .latency_model import LatencyModel
+from .telemetry import TelemetryStore
+from .prompt_archive import PromptArchive
+from .circuit_breaker import CircuitBreaker
 
 # Type checking için - çalışma zamanında import edilmez
 if TYPE_CHECKING:
@@ -31,6 +42,70 @@ class AIAnalysisError(Exception):
         self.details = details
 
 class AIIntegration:
+    # Bağlam önbellekten verildiğinde prompt'taki bağlam bölümünün yerine geçen not
+    CACHED_CONTEXT_NOTE = (
+        "Bu bölümün ait olduğu romanın bağlamı (tam metin veya özet) bu isteğe önbelleğe alınmış içerik olarak eklenmiştir. "
+        "Analizini, bölümün bu bağlam içindeki tutarlılığını gözeterek yap.\n\n"
+    )
+    # Paketlenmiş (çok bölümlü) isteklerde bölüm sınırları ve bölüm kimliği talimatı
+    BATCH_CHAPTER_START = "=== BÖLÜM {chapter_id} BAŞLANGICI ==="
+    BATCH_CHAPTER_END = "=== BÖLÜM {chapter_id} SONU ==="
+    BATCH_INSTRUCTION = (
+        "DİKKAT: Bu istekte birden fazla kısa bölüm vardır. Her bölüm '=== BÖLÜM <kimlik> BAŞLANGICI ===' ve "
+        "'=== BÖLÜM <kimlik> SONU ===' satırları arasındadır. Her bölümü kendi içinde incele ve her öneri nesnesine, "
+        "önerinin ait olduğu bölümün kimliğini \"chapter_id\" alanı olarak ekle (ör. \"chapter_id\": \"B2\"). "
+        "Bir öneri birden fazla bölüme yayılamaz.\n\n"
+    )
+    # Paragraf kimlikli protokol: bölüm paragrafları [P<n>] etiketiyle gönderilir, model cümleleri
+    # tekrar yazmak yerine paragraf kimliği + karakter aralığı + yeni metin döndürür
+    PARAGRAPH_PROTOCOL_INSTRUCTION = (
+        "YANIT BİÇİMİ (PARAGRAF KİMLİKLİ): Aşağıdaki bölümde her paragrafın başında [P<numara>] biçiminde bir kimlik vardır. "
+        "Yukarıdaki cevap formatı yerine değişiklikleri aşağıdaki kısa biçimde bildir; cümleleri tekrar yazma:\n"
+        "```json\n"
+        '[{"paragraph_id": "P3", "start": 12, "end": 19, "original": "değişen kısım", "replacement": "yeni hali", '
+        '"explanation": "kısa açıklama", "severity": "low"}]\n'
+        "```\n"
+        "- paragraph_id: değişikliğin yapıldığı paragrafın kimliği.\n"
+        "- original: paragrafta birebir geçen, değişecek EN KISA metin parçası (yalnızca değişen kelime veya kelimeler).\n"
+        "- start / end: bu parçanın, [P<numara>] etiketi hariç paragraf metnindeki karakter konumu (0'dan başlar, end hariç).\n"
+        "- replacement: parçanın yerine gelecek metin.\n\n"
+    )
+    PARAGRAPH_EDIT_RESPONSE_SCHEMA = {
+        "type": "ARRAY",
+        "items": {
+            "type": "OBJECT",
+            "properties": {
+                "paragraph_id": {"type": "STRING"},
+                "start": {"type": "INTEGER"},
+                "end": {"type": "INTEGER"},
+                "original": {"type": "STRING"},
+                "replacement": {"type": "STRING"},
+                "explanation": {"type": "STRING"},
+                "editor_type": {"type": "STRING"},
+                "severity": {"type": "STRING", "enum": ["low", "medium", "high"]},
+            },
+            "required": ["paragraph_id", "original", "replacement", "explanation"],
+        },
+    }
+    # Yeniden denemekle düzelmeyecek hatalar (geçersiz/yetkisiz API anahtarı)
+    NON_RETRYABLE_ERROR_MARKERS = ("API_KEY_INVALID", "API key not valid", "PERMISSION_DENIED")
+    # Yapılandırılmış çıktı modunda modelden istenen yanıt şeması (öneri nesneleri listesi)
+    SUGGESTION_RESPONSE_SCHEMA = {
+        "type": "ARRAY",
+        "items": {
+            "type": "OBJECT",
+            "properties": {
+                "original_sentence": {"type": "STRING"},
+                "suggested_sentence": {"type": "STRING"},
+                "explanation": {"type": "STRING"},
+                "editor_type": {"type": "STRING"},
+                "severity": {"type": "STRING", "enum": ["low", "medium", "high"]},
+                "chapter_id": {"type": "STRING"},
+            },
+            "required": ["original_sentence", "suggested_sentence", "explanation"],
+        },
+    }
+    
     def __init__(self, settings_manager: SettingsManager):
         self.settings_manager = settings_manager
         self.api_key: str = ""
@@ -43,53 +118,242 @@ class AIIntegration:
             "novel_context": "gemini-1.5-pro" # Özetleme için daha güçlü bir model
         }
         self.model_instances = {}
+        self.model = None
+        # Analiz türü başına devre kesici ve devre açıkken kullanılan yedek model
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.fallback_models: Dict[str, str] = {}
+        self.fallback_instances: Dict[str, Any] = {}
         self.prompts: Dict[str, str] = self.load_default_prompts()
+        # Model nesnelerini oluşturan YZ arka ucu (Gemini ya da çevrimdışı sahte arka uç)
+        self.backend: LLMBackend = self._create_backend()
+        # Tüm Gemini çağrılarının paylaştığı hız sınırlayıcı
+        self.rate_limiter = RateLimiter()
+        self.update_rate_limits()
+        # Tüm analiz istekleri aynı sınırlı, iptal edilebilir işçi havuzundan geçer
+        self.request_worker = RequestWorker(self.settings_manager.get_setting("ai_max_in_flight", 8))
+        # Değişmeyen prompt'lar için diskteki yanıt önbelleği
+        self.response_cache = ResponseCache(os.path.join(self.settings_manager.base_path, "data", "cache", "responses"))
+        self.update_cache_settings()
+        # Gözlenen istek sürelerinden öğrenilen zaman aşımı ve süre tahmini
+        self.latency_model = LatencyModel(os.path.join(self.settings_manager.base_path, "data", "cache", "latency.json"))
+        # Her YZ çağrısının yapılandırılmış kaydı (gecikme/verim panosu için)
+        self.telemetry = TelemetryStore(os.path.join(self.settings_manager.base_path, "data", "telemetry.db"))
+        # Proje klasörü başına prompt/yanıt arşivi (arka planda, tekilleştirilmiş olarak yazılır)
+        self._prompt_archives: Dict[str, PromptArchive] = {}
+        self._archive_lock = threading.Lock()
+        # Etkileşimli analizde yavaş isteklerin kopyalanması: ek harcama sınırı ve sayaçlar
+        self._hedge_lock = threading.Lock()
+        self.hedge_stats = {"interactive_requests": 0, "hedged": 0, "hedge_wins": 0}
+        # Son analiz isteğine ait ölçümler (ilk öneri süresi vb.)
+        self.last_request_metrics: Dict[str, Any] = {}
+        # Roman bağlamının her istekte yeniden gönderilmemesi için bağlam önbelleği
+        self.safety_settings = None
+        self.context_cache: Optional[ContextCache] = None
+        self.update_context_cache_settings()
+    
+    def _create_backend(self) -> LLMBackend:
+        """Ayardaki arka ucu, kendi seçenekleriyle (`fake_backend`, `replay_backend`) oluşturur."""
+        name = self.settings_manager.get_setting("ai_backend", "gemini")
+        options = dict(self.settings_manager.get_setting(f"{name}_backend", {}) or {})
+        if name == "replay":
+            # Tekrar oynatma varsayılan olarak proje klasöründeki tüm arşivleri tarar
+            options.setdefault("projects_dir", self.settings_manager.projects_dir)
+        return create_backend(name, options)
+
+    def update_backend(self):
+        """Arka uç ayarını yeniden yükle. Modellerin yeniden oluşturulması için ardından `update_settings` çağrılmalıdır."""
+        self.backend = self._create_backend()
+        self.model = None
+        self.model_instances = {}
+        print(f"YZ arka ucu: {self.backend.name}")
+    
+    def has_credentials(self) -> bool:
+        """Analiz başlatmak için gereken kimlik bilgisi var mı (sahte arka uç anahtar istemez)."""
+        return bool(self.settings_manager.get_setting("api_key", "")) or not self.backend.requires_api_key
+    
+    def update_context_cache_settings(self):
+        """Bağlam önbelleği modunu ve süresini ayarlardan yeniden yükle."""
+        mode = self.settings_manager.get_setting("context_cache_mode", "gemini")
+        ttl_minutes = self.settings_manager.get_setting("context_cache_ttl_minutes", 60)
+        max_contexts = self.settings_manager.get_setting("context_cache_max_contexts", ContextCache.DEFAULT_MAX_CONTEXTS)
+        if self.context_cache:
+            self.context_cache.clear()
+        if mode == "gemini" and self.backend.supports_context_cache:
+            min_tokens = self.settings_manager.get_setting("context_cache_min_tokens", GeminiContextCache.DEFAULT_MIN_TOKENS)
+            self.context_cache = GeminiContextCache(ttl_minutes, min_tokens, self.safety_settings, max_contexts)
+        elif mode == "local":
+            # Yerel önbellek yalnızca açıkça seçildiğinde kullanılır; Gemini modu desteklemeyen arka
+            # uçlarda (sahte, tekrar oynatma) bağlam prompt'a gömülür ve arşivdeki prompt'la aynı kalır
+            self.context_cache = LocalContextCache(ttl_minutes, max_contexts=max_contexts)
+        else:
+            self.context_cache = None
+    
+    def update_cache_settings(self):
+        """Yanıt önbelleği ayarlarını ayarlardan yeniden yükle."""
+        self.response_cache.enabled = bool(self.settings_manager.get_setting("response_cache_enabled", True))
+        max_size_mb = self.settings_manager.get_setting("response_cache_max_mb", 100)
+        self.response_cache.max_size_bytes = int(float(max_size_mb) * 1024 * 1024)
+    
+    def is_structured_output_enabled(self) -> bool:
+        """Yapılandırılmış çıktı (JSON MIME türü + şema) ayarı açık ve arka uç destekliyor mu?"""
+        return bool(self.settings_manager.get_setting("structured_output_enabled", False)) and self.backend.supports_structured_output
+    
+    def update_rate_limits(self):
+        """Hız sınırı bütçelerini ayarlardan yeniden yükle."""
+        self.rate_limiter.configure(
+            self.settings_manager.get_setting("rate_limit_rpm", 15),
+            self.settings_manager.get_setting("rate_limit_tpm", 1000000),
+            self.settings_manager.get_setting("rate_limits", {})
+        )
+    
+    def _get_model_name(self, analysis_type: str) -> str:
+        """Analiz türü için kullanılan modelin adını döndür."""
+        if analysis_type in self.model_instances:
+            return self.models.get(analysis_type, self.model_name)
+        return self.model_name
+    
+    def _acquire_rate_limit(self, model_name: str, prompt: str, cancel_token: Optional[CancelToken] = None):
+        """İstek göndermeden önce modelin RPM/TPM bütçesinden pay al."""
+        cancel_check = (lambda: cancel_token.is_cancelled) if cancel_token else None
+        try:
+            self.rate_limiter.acquire(model_name, RateLimiter.estimate_tokens(prompt), cancel_check=cancel_check)
+        except InterruptedError:
+            raise AIAnalysisError("Analiz iptal edildi.", error_type="cancelled")
+    
+    def _handle_rate_limit_error(self, model_name: str, error: Exception) -> bool:
+        """Hata bir kota hatasıysa sınırlayıcıya bildir ve True döndür."""
+        if RateLimiter.is_quota_error(error):
+            self.rate_limiter.report_quota_error(model_name, error)
+            return True
+        return False
     
     def update_settings(self, api_key: str, model_name: str, models_config: Dict[str, str] = None):
         """AI ayarlarını güncelle"""
         self.api_key = api_key
         self.model_name = model_name
+        self.update_rate_limits()
         
         # Update individual models if provided
         if models_config:
             self.models.update(models_config)
         
-        if api_key:
+        if api_key or not self.backend.requires_api_key:
             try:
-                import google.generativeai as genai
-                from google.generativeai.types import HarmCategory, HarmBlockThreshold
-                genai.configure(api_key=api_key)
+                self.backend.configure(api_key)
 
                 # En az kısıtlayıcı güvenlik ayarlarını tanımla
-                safety_settings = {
-                    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                }
+                safety_settings = self.backend.default_safety_settings()
+                self.safety_settings = safety_settings
                 
                 # Create model instances for each analysis type with safety settings
                 self.model_instances = {}
                 print("AI Modelleri güvenlik ayarlarıyla başlatılıyor...")
                 for analysis_type, model_name_str in self.models.items():
                     print(f"  - {analysis_type}: {model_name_str}")
-                    self.model_instances[analysis_type] = genai.GenerativeModel(
-                        model_name=model_name_str,
-                        safety_settings=safety_settings
-                    )
+                    self.model_instances[analysis_type] = self.backend.create_model(model_name_str, safety_settings)
                 
                 # Also create a default model instance with safety settings
-                self.model = genai.GenerativeModel(
-                    model_name=self.model_name,
-                    safety_settings=safety_settings
-                )
+                self.model = self.backend.create_model(self.model_name, safety_settings)
+                self._configure_fallbacks(safety_settings)
                 print("✅ Tüm AI modelleri en az kısıtlayıcı güvenlik ayarlarıyla yapılandırıldı.")
+                # Önceki anahtarla oluşturulmuş bağlam önbelleklerini bırak
+                self.update_context_cache_settings()
                 return True
             except Exception as e:
                 print(f"AI ayar hatası: {e}")
                 return False
         return False
     
+    def _configure_fallbacks(self, safety_settings: Optional[Dict]):
+        """Her analiz türü için devre kesiciyi ve yedek modeli oluşturur.
+
+        Yedek model `fallback_models` ayarından alınır; ayarlanmamışsa, türün modeli
+        varsayılan modelden farklıysa varsayılan model yedek olarak kullanılır.
+        """
+        configured = self.settings_manager.get_setting("fallback_models", {}) or {}
+        cooldown = float(self.settings_manager.get_setting("circuit_breaker_cooldown", 60))
+        slow_seconds = self.settings_manager.get_setting("circuit_breaker_slow_seconds", 120)
+        self.circuit_breakers = {}
+        self.fallback_models = {}
+        self.fallback_instances = {}
+        for analysis_type, model_name_str in self.models.items():
+            self.circuit_breakers[analysis_type] = CircuitBreaker(
+                f"{analysis_type} ({model_name_str})", cooldown=cooldown, slow_seconds=slow_seconds
+            )
+            fallback_name = configured.get(analysis_type) or self.model_name
+            if fallback_name and fallback_name != model_name_str:
+                self.fallback_models[analysis_type] = fallback_name
+                self.fallback_instances[analysis_type] = self.backend.create_model(fallback_name, safety_settings)
+                print(f"  - {analysis_type} yedek model: {fallback_name}")
+    
+    def _select_model(self, analysis_type: str, model_instance: Any) -> Tuple[Any, str, Optional[CircuitBreaker]]:
+        """İstek için (model nesnesi, model adı, devre kesici) seçer.
+        
+        Türün devresi açıksa yedek modele yönlendirir (yedek modelin sonucu devreye
+        yazılmaz); yedek model de yoksa istek hiç gönderilmeden `circuit_open` hatası verilir.
+        """
+        model_name = self._get_model_name(analysis_type)
+        breaker = self.circuit_breakers.get(analysis_type)
+        if breaker is None or not self.settings_manager.get_setting("circuit_breaker_enabled", True):
+            return model_instance, model_name, None
+        if breaker.allow_request():
+            return model_instance, model_name, breaker
+        fallback = self.fallback_instances.get(analysis_type)
+        if fallback is not None:
+            print(f"🔌 {model_name} devresi açık, {analysis_type} isteği yedek modele gidiyor: {self.fallback_models[analysis_type]}")
+            return fallback, self.fallback_models[analysis_type], None
+        retry_in = breaker.get_stats()["retry_in"]
+        raise AIAnalysisError(
+            f"{model_name} modeli son isteklerde art arda başarısız oldu ve yedek model tanımlı değil. "
+            f"Yaklaşık {retry_in:.0f} saniye sonra yeniden denenecek.",
+            error_type="circuit_open"
+        )
+    
+    def _is_non_retryable_error(self, error_message: str) -> bool:
+        return any(marker in error_message for marker in self.NON_RETRYABLE_ERROR_MARKERS)
+    
+    @staticmethod
+    def _is_blocked_error(error_message: str) -> bool:
+        """Hata, prompt'un güvenlik filtresine takıldığını mı gösteriyor?"""
+        return "prompt_feedback" in error_message or "candidate" in error_message
+    
+    def get_circuit_breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Ayarlar penceresi için analiz türü başına devre durumu."""
+        stats = {}
+        for analysis_type, breaker in self.circuit_breakers.items():
+            stats[analysis_type] = dict(breaker.get_stats(), model=self.models.get(analysis_type),
+                                        fallback=self.fallback_models.get(analysis_type))
+        return stats
+    
+    def _hedge_delay(self, model_name: str, analysis_type: str, prompt_tokens: int, timeout_seconds: float) -> Optional[float]:
+        """Kopya isteğin gönderileceği süre: model ve boyut için öğrenilen p95.
+
+        Kopyalama kapalıysa, yeterli gecikme örneği yoksa ya da süre zaman aşımını
+        aşıyorsa None döner (kopya gönderilmez).
+        """
+        p95 = self.latency_model.predict(model_name, analysis_type, prompt_tokens, "p95")
+        if p95 is None:
+            return None
+        delay = max(p95, float(self.settings_manager.get_setting("hedging_min_delay", 2)))
+        return delay if delay < timeout_seconds else None
+    
+    def _allow_hedge(self) -> bool:
+        """Ek harcama sınırı: kopya istekler etkileşimli isteklerin `hedging_max_extra_ratio` payını aşamaz."""
+        ratio = float(self.settings_manager.get_setting("hedging_max_extra_ratio", 0.1))
+        with self._hedge_lock:
+            if self.hedge_stats["hedged"] + 1 > ratio * self.hedge_stats["interactive_requests"]:
+                print("⏱️ Kopya istek bütçesi dolu, ilk isteğin yanıtı bekleniyor")
+                return False
+            self.hedge_stats["hedged"] += 1
+            return True
+    
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """Kopya istek sayaçları: etkileşimli istek, gönderilen kopya ve kopyanın kazandığı istek sayısı."""
+        with self._hedge_lock:
+            stats = dict(self.hedge_stats)
+        stats["win_rate"] = (stats["hedge_wins"] / stats["hedged"]) if stats["hedged"] else None
+        return stats
+    
     def load_default_prompts(self) -> Dict[str, str]:
         """Varsayılan promptları yükle"""
         return {
@@ -205,7 +469,7 @@ SADECE aşağıdaki konulara odaklan:
 {content}
 """,
             "novel_context": """
-Sen uzman bir edebiyat analistisin. Görevin, aşağıda verilen romanın tamamını okuyup, romanın temel yapı taşlarını içeren bir "Roman Kimliği" özeti oluşturmaktır.
+Sen uzman bir edebiyat analistisin. Görevin, aşağıda bölüm bölüm verilen özetleri kullanarak romanın temel yapı taşlarını içeren bir "Roman Kimliği" özeti oluşturmaktır.
 
 Bu özet, diğer yapay zeka editörleri tarafından romanın bütünlüğünü korumak için bir referans olarak kullanılacaktır. Bu nedenle özetin net, anlaşılır ve kapsamlı olması çok önemlidir.
 
@@ -220,13 +484,71 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
 
 ÖNEMLİ: Cevabını sadece bu başlıkları içeren düz metin olarak ver. Başka bir yorum veya giriş/sonuç cümlesi ekleme.
 
-İşte romanın tam metni:
+İşte romanın bölüm özetleri:
+{content}
+""",
+            "chapter_summary": """
+Sen uzman bir edebiyat analistisin. Aşağıda bir romanın bir bölümü (ya da ardışık bölümlerinin özetleri) verilmiştir. Bu metnin, daha sonra romanın bütününe ait bir "Roman Kimliği" oluşturmakta kullanılacak kısa ve bilgi yoğun bir özetini çıkar.
+
+Özette şunlara yer ver:
+- Olay örgüsünde olan başlıca olaylar (sırasıyla)
+- Görünen karakterler, aralarındaki ilişkiler ve karakterlerde gözlenen değişimler
+- Zaman, mekan ve anlatıcı sesine dair ipuçları
+- Tekrar eden semboller, motifler ve genel ton
+
+ÖNEMLİ: Cevabını yalnızca düz metin olarak ver ve özeti kısa tut (en fazla 300 kelime). Başka bir yorum veya giriş/sonuç cümlesi ekleme.
+
+Özetlenecek metin:
 {content}
 """
         }
     
-    def analyze_chapter(self, content: str, analysis_type: str = "style_analysis", novel_context: Optional[str] = None, full_novel_content: Optional[str] = None) -> List[Dict]:
-        """Bölümü analiz et ve öneriler döndür - Timeout ve hata yönetimi ile"""
+    def analyze_chapter(self, content: str, analysis_type: str = "style_analysis", novel_context: Optional[str] = None, full_novel_content: Optional[str] = None,
+                        on_suggestion: Optional[Callable[[Dict], None]] = None, cancel_token: Optional[CancelToken] = None,
+                        retrieved_context: Optional[str] = None, interactive: bool = False,
+                        paragraph_ids: bool = False) -> List[Dict]:
+        """Bölümü analiz et ve öneriler döndür - Timeout ve hata yönetimi ile
+
+        `on_suggestion` verilirse ve akış modu açıksa yanıt parça parça alınır; her öneri
+        tamamlandığı anda (istek thread'inden) bu fonksiyona gönderilir. Dönüş değeri her
+        durumda tam yanıttan ayrıştırılan öneri listesidir. `cancel_token` iptal edilirse
+        istek bırakılır ve "cancelled" türünde AIAnalysisError fırlatılır. `retrieved_context`,
+        romanın tam metni yerine gönderilecek seçilmiş pasajlardır (bkz. ContextRetriever).
+        `interactive`, kullanıcının sonucu beklediği çağrıları belirtir; kopyalama açıksa bu
+        isteklerde yavaş kalan isteğin bir kopyası gönderilir (bkz. `_hedge_delay`).
+        `paragraph_ids` True ise `content` paragrafları [P<n>] etiketli olmalıdır; model öneri
+        başına paragraf kimliği ve karakter aralığı döndürür (bkz. EditorialProcess.resolve_paragraph_edits).
+        """
+        telemetry: Dict[str, Any] = {"kind": "analysis", "analysis_type": analysis_type, "retries": 0}
+        context_leases: List[Tuple[ContextCache, CachedContextHandle]] = []
+        started = time.time()
+        try:
+            suggestions = self._analyze_chapter(content, analysis_type, novel_context, full_novel_content,
+                                                on_suggestion, cancel_token, retrieved_context, telemetry, interactive,
+                                                paragraph_ids, context_leases)
+            telemetry["suggestion_count"] = len(suggestions)
+            return suggestions
+        except AIAnalysisError as e:
+            telemetry["error_type"] = e.error_type
+            raise
+        except Exception:
+            telemetry["error_type"] = "system_error"
+            raise
+        finally:
+            # Kullanılan önbellek kaydı bırakılır; önbellekten çıkarılmışsa ancak şimdi silinir
+            for context_cache, handle in context_leases:
+                context_cache.release(handle)
+            # İstek hazırlanmadan dönen çağrılar (boş içerik, model yok) kaydedilmez
+            if "prompt_chars" in telemetry:
+                telemetry["total_time"] = time.time() - started
+                self.telemetry.record(telemetry)
+
+    def _analyze_chapter(self, content: str, analysis_type: str, novel_context: Optional[str], full_novel_content: Optional[str],
+                         on_suggestion: Optional[Callable[[Dict], None]], cancel_token: Optional[CancelToken],
+                         retrieved_context: Optional[str], telemetry: Dict[str, Any], interactive: bool = False,
+                         paragraph_ids: bool = False, context_leases: Optional[List[Tuple[ContextCache, CachedContextHandle]]] = None) -> List[Dict]:
+        """`analyze_chapter` gövdesi; istek ölçümlerini `telemetry` sözlüğüne, kullanılan bağlam
+        önbelleği kaydını `context_leases` listesine yazar (çağıran istek bitince bırakır)."""
         print(f"AI ANALIZ BAŞLATILDI: Tip={analysis_type}, İçerik uzunluğu={len(content) if content else 0}")
         
         # Use the specific model for this analysis type
@@ -252,6 +574,7 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
 
         # Bağlam (context) bölümünü, ayarlara göre dinamik olarak oluştur
         context_section = ""
+        context_section_is_retrieved = False
         if full_novel_content and analysis_type in ["style_analysis", "content_review", "grammar_check"]:
             # Tam metin kullanılıyorsa
             cleaned_full_content = self._clean_content_for_ai(full_novel_content)
@@ -260,6 +583,15 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
                 "Analizini, bölümün bu bütün içindeki tutarlılığını gözeterek yap:\n\n"
                 f"--- ROMAN TAM METNİ ---\n{cleaned_full_content}\n--- ROMAN TAM METNİ SONU ---\n\n"
             )
+        elif retrieved_context:
+            # Tam metin yerine bölümle ilgili seçilmiş pasajlar kullanılıyorsa
+            cleaned_retrieved = self._clean_content_for_ai(retrieved_context)
+            context_section_is_retrieved = True
+            context_section = (
+                "Bu bölümün ait olduğu romandan, bölüme komşu kısımlar ve bölümle en ilgili pasajlar referans olarak aşağıdadır. "
+                "Analizini, bölümün bu pasajlarla tutarlılığını gözeterek yap:\n\n"
+                f"--- ROMANDAN SEÇİLMİŞ PASAJLAR ---\n{cleaned_retrieved}\n--- SEÇİLMİŞ PASAJLAR SONU ---\n\n"
+            )
         elif novel_context:
             # Roman Kimliği (özet) kullanılıyorsa
             cleaned_novel_context = self._clean_content_for_ai(novel_context)
@@ -273,91 +605,265 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
         # Prompt'u formatla
         # AI'ye göndermeden önce metindeki özel etiketleri temizle
         cleaned_content = self._clean_content_for_ai(content)
+        if paragraph_ids:
+            cleaned_content = self.PARAGRAPH_PROTOCOL_INSTRUCTION + cleaned_content
         # Not: consistency_check hala ayrı bir mantık kullanabilir, ancak şimdilik genel yapıya dahil edelim.
         prompt = prompt_template.format(content=cleaned_content, context_section=context_section)
         
-        # Prompt'u dosyaya kaydet
-        self._save_prompt_to_file(prompt, analysis_type)
-            
         print(f"PROMPT HAZIRLANDI: {len(prompt)} karakter")
         
-        # Dinamik timeout hesaplama - metin uzunluğuna göre
-        timeout_seconds = self._calculate_timeout(content, analysis_type)
+        # Zaman aşımı her denemede, gözlenen gecikmelere göre yeniden hesaplanır
+        prompt_tokens = RateLimiter.estimate_tokens(prompt)
         max_retries = 2
+        model_instance, request_model_name, breaker = self._select_model(analysis_type, model_instance)
+        telemetry.update(model=request_model_name, prompt_chars=len(prompt), prompt_tokens=prompt_tokens)
+        # Güvenlik ayarları artık modelin kendisinde yapılandırıldığı için
+        # burada tekrar belirtmeye gerek yok. Sadece generation_config yeterli.
+        generation_config = {
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "top_k": 40
+        }
+        # Yapılandırılmış çıktı: model yanıtı şemaya uyan saf JSON olarak üretir, onarım gerekmez
+        structured_output = self.is_structured_output_enabled()
+        if structured_output:
+            schema = self.PARAGRAPH_EDIT_RESPONSE_SCHEMA if paragraph_ids else self.SUGGESTION_RESPONSE_SCHEMA
+            generation_config.update(response_mime_type="application/json", response_schema=schema)
+        
+        # Aynı model + prompt + ayarlar için daha önce alınmış yanıt varsa ağa gitme
+        cached_response = self.response_cache.get(request_model_name, prompt, generation_config)
+        if cached_response is not None:
+            print(f"💾 ÖNBELLEKTEN YANIT: {analysis_type} ({len(cached_response)} karakter)")
+            parse_started = time.time()
+            suggestions = self.parse_ai_response(cached_response, analysis_type, structured_output, telemetry)
+            telemetry.update(cached=1, response_chars=len(cached_response), parse_time=time.time() - parse_started)
+            for suggestion in suggestions:
+                suggestion["model_name"] = request_model_name
+            print(f"✅ PARSING TAMAMLANDI: {len(suggestions)} öneri oluşturuldu")
+            self.last_request_metrics = {
+                "analysis_type": analysis_type,
+                "model_name": request_model_name,
+                "cached": True,
+                "streamed": False,
+                "suggestion_count": len(suggestions)
+            }
+            return suggestions
         
-        print(f"💡 Dinamik timeout hesaplandı: {timeout_seconds} saniye (Metin: {len(content)} karakter)")
+        # Bağlam önbelleği: roman bağlamı bu içerik sürümü için bir kez yüklenir, sonraki
+        # isteklerde prompt'a gömülmek yerine önbellekteki kayda başvurulur. Seçilmiş pasajlar
+        # bölüme özgü olduğundan (tekrar kullanılmaz) önbelleğe alınmaz.
+        request_prompt = prompt
+        cached_context_tokens = 0
+        context_handle = None
+        context_cache = self.context_cache
+        if context_section and context_cache and not context_section_is_retrieved:
+            context_handle = context_cache.get_or_create(request_model_name, context_section, model_instance)
+            if context_handle:
+                if context_leases is not None:
+                    context_leases.append((context_cache, context_handle))
+                model_instance = context_handle.model
+                cached_context_tokens = context_handle.context_tokens
+                request_prompt = prompt_template.format(content=cleaned_content, context_section=self.CACHED_CONTEXT_NOTE)
+                print(f"📦 Önbellekteki bağlam kullanılıyor: prompt {len(prompt)} -> {len(request_prompt)} karakter")
+        
+        # Prompt'u modele gönderildiği haliyle arşive kaydet (yerel önbellek bağlamı önüne ekler);
+        # tekrar oynatma arka ucu gönderilen prompt'u bu kayıtla eşleştirir
+        sent_prompt = (context_handle.prompt_prefix if context_handle else "") + request_prompt
+        archive_id = self._save_prompt_to_file(sent_prompt, analysis_type, request_model_name)
+        
+        use_streaming = on_suggestion is not None and self.settings_manager.get_setting("streaming_enabled", True)
+        telemetry.update(cached=0, streamed=int(use_streaming), queue_wait=0.0, hedge=0)
+        hedging = interactive and bool(self.settings_manager.get_setting("hedging_enabled", False))
+        if hedging:
+            with self._hedge_lock:
+                self.hedge_stats["interactive_requests"] += 1
+        # Yeniden denemelerde aynı önerinin ikinci kez gönderilmemesi için
+        streamed_keys = set()
         
         for attempt in range(max_retries):
             try:
-                print(f"Google AI kütüphanesi yüklenmeye çalışılıyor... (Deneme {attempt + 1}/{max_retries})")
-                import google.generativeai as genai  # type: ignore
+                print(f"YZ isteği hazırlanıyor... (Arka uç: {self.backend.name}, Deneme {attempt + 1}/{max_retries})")
+                if cancel_token and cancel_token.is_cancelled:
+                    raise AIAnalysisError("Analiz iptal edildi.", error_type="cancelled")
+                timeout_seconds = self._calculate_timeout(content, analysis_type, prompt_tokens, request_model_name)
+                telemetry["retries"] = attempt
+                attempt_started = time.time()
                 
-                print(f"AI modeline prompt gönderiliyor... (Timeout: {timeout_seconds}s)")
+                # Model bütçesi uygun olana kadar bekle (kota doluysa burada sıraya girer)
+                self._acquire_rate_limit(request_model_name, request_prompt, cancel_token)
                 
-                # Timeout ile AI isteği
-                import signal
-                import time
-                
-                def timeout_handler(signum, frame):
-                    raise TimeoutError(f"AI analizi {timeout_seconds} saniye sonra zaman aşımına uğradı")
+                print(f"AI modeline prompt gönderiliyor... (Timeout: {timeout_seconds}s)")
                 
-                # Windows için timeout alternatifi
                 start_time = time.time()
                 response = None
                 
                 try:
-                    # Threading ile timeout simülasyonu
-                    import threading
+                    metrics = {'time_to_first_chunk': None, 'time_to_first_suggestion': None, 'request_started': None}
                     
-                    result = {'response': None, 'error': None}
-                    
-                    def ai_request():
+                    def emit_streamed(ai_suggestion):
+                        suggestion = self._build_suggestion(ai_suggestion, analysis_type, len(streamed_keys) + 1)
+                        if not suggestion:
+                            return
+                        key = (suggestion['original_sentence'], suggestion['suggested_sentence'])
+                        if key in streamed_keys:
+                            return
+                        streamed_keys.add(key)
+                        suggestion["model_name"] = request_model_name
+                        if metrics['time_to_first_suggestion'] is None:
+                            metrics['time_to_first_suggestion'] = time.time() - start_time
+                            print(f"⚡ İlk öneri {metrics['time_to_first_suggestion']:.1f} sn'de geldi")
                         try:
-                            # Güvenlik ayarları artık modelin kendisinde yapılandırıldığı için
-                            # burada tekrar belirtmeye gerek yok. Sadece generation_config yeterli.
-                            generation_config = {
-                                "temperature": 0.7,
-                                "top_p": 0.95,
-                                "top_k": 40
-                            }
-                            
-                            result['response'] = model_instance.generate_content(
-                                prompt,
-                                generation_config=generation_config
-                            )
-                        except Exception as e:
-                            result['error'] = e
+                            on_suggestion(suggestion)
+                        except Exception as callback_error:
+                            print(f"Akış önerisi iletilemedi: {callback_error}")
+                    
+                    # Kopya istek gönderilirse akışı ilk parçayı alan istek sahiplenir; diğeri
+                    # öneri iletmeden okumaya devam eder ve önce biterse tam yanıtıyla kazanır.
+                    request_starts: Dict[int, float] = {}
+                    stream_owner = {"index": None}
+                    stream_lock = threading.Lock()
                     
-                    thread = threading.Thread(target=ai_request)
-                    thread.daemon = True
-                    thread.start()
-                    thread.join(timeout=timeout_seconds)
+                    def ai_request(request_token: CancelToken, hedge_index: int = 0):
+                        if hedge_index:
+                            # Kopya istek de modelin hız sınırı bütçesinden pay alır
+                            self._acquire_rate_limit(request_model_name, request_prompt, request_token)
+                        # Gecikme ölçümü havuzdaki sıra beklemesini içermez
+                        request_starts[hedge_index] = time.time()
+                        if not hedge_index:
+                            metrics['request_started'] = request_starts[0]
+                            # Sıra bekleme: hız sınırlayıcı ve işçi havuzunda geçen süre
+                            telemetry["queue_wait"] += metrics['request_started'] - attempt_started
+                        # Ağ çağrısı da aynı süreyle sınırlanır; böylece vazgeçilen istek bağlantıyı
+                        # süresiz tutmaz ve havuzdaki yerini kısa sürede bırakır.
+                        request_options = {"timeout": timeout_seconds}
+                        if not use_streaming:
+                            return model_instance.generate_content(
+                                request_prompt,
+                                generation_config=generation_config,
+                                request_options=request_options
+                            )
+                        
+                        stream = model_instance.generate_content(
+                            request_prompt,
+                            generation_config=generation_config,
+                            stream=True,
+                            request_options=request_options
+                        )
+                        parser = IncrementalJSONArrayParser()
+                        for chunk in stream:
+                            # İptal veya zaman aşımında akışı bırak; kalan parçalar okunmaz
+                            request_token.raise_if_cancelled()
+                            try:
+                                chunk_text = chunk.text
+                            except Exception:
+                                chunk_text = ""  # Güvenlik filtresi vb. nedeniyle metni olmayan parça
+                            if not chunk_text:
+                                continue
+                            if stream_owner["index"] != hedge_index:
+                                with stream_lock:
+                                    if stream_owner["index"] is None:
+                                        stream_owner["index"] = hedge_index
+                                if stream_owner["index"] != hedge_index:
+                                    continue
+                            if metrics['time_to_first_chunk'] is None:
+                                metrics['time_to_first_chunk'] = time.time() - start_time
+                            for ai_suggestion in parser.feed(chunk_text):
+                                emit_streamed(ai_suggestion)
+                        # Akış tamamen okunduktan sonra yanıt nesnesi birleşik metni içerir
+                        return stream
                     
-                    if thread.is_alive():
+                    try:
+                        hedge_after = self._hedge_delay(request_model_name, analysis_type, prompt_tokens, timeout_seconds) if hedging else None
+                        if hedge_after is None:
+                            response = self.request_worker.run(ai_request, timeout_seconds, cancel_token)
+                            winner = 0
+                        else:
+                            hedge_sent = []
+                            
+                            def may_hedge():
+                                if not self._allow_hedge():
+                                    return False
+                                hedge_sent.append(True)
+                                print(f"⏱️ İstek {hedge_after:.1f} sn'de (p95) yanıt vermedi, kopyası gönderiliyor")
+                                return True
+                            
+                            response, winner = self.request_worker.run_hedged(ai_request, timeout_seconds, hedge_after,
+                                                                              cancel_token, may_hedge)
+                            if hedge_sent:
+                                telemetry["hedge"] = TelemetryStore.HEDGE_WON if winner else TelemetryStore.HEDGE_SENT
+                        finished = time.time()
+                        # Kullanıcının beklediği süre ilk isteğin başlangıcından sayılır
+                        telemetry["network_latency"] = finished - metrics['request_started']
+                        self.latency_model.record(request_model_name, analysis_type, prompt_tokens, finished - request_starts[winner])
+                        if winner:
+                            with self._hedge_lock:
+                                self.hedge_stats["hedge_wins"] += 1
+                            # İlk istek en az bu kadar sürdü; tamamlanmamış gözlem olarak kaydedilir
+                            self.latency_model.record(request_model_name, analysis_type, prompt_tokens,
+                                                      telemetry["network_latency"], timed_out=True)
+                            print(f"⏱️ Kopya istek kazandı: {telemetry['network_latency']:.1f} sn "
+                                  f"(kopya {finished - request_starts[winner]:.1f} sn)")
+                        if breaker:
+                            breaker.record_success(telemetry["network_latency"])
+                    except TimeoutError:
+                        # Süre en az zaman aşımı kadardır; model bir sonraki hesapta bunu dikkate alır
+                        self.latency_model.record(request_model_name, analysis_type, prompt_tokens, timeout_seconds, timed_out=True)
+                        telemetry["network_latency"] = timeout_seconds
                         message = f"AI analizi {timeout_seconds} saniye sonra zaman aşımına uğradı. Lütfen internet bağlantınızı kontrol edin veya daha kısa bir metinle tekrar deneyin."
                         print(f"⚠️ {message}")
                         raise AIAnalysisError(message, error_type="timeout")
 
-                    if result['error']:
-                        raise result['error']
-
-                    response = result['response']
-
                 except Exception as e:
+                    if isinstance(e, RequestCancelled) or (cancel_token and cancel_token.is_cancelled):
+                        print("⏹️ AI isteği iptal edildi")
+                        raise AIAnalysisError("Analiz iptal edildi.", error_type="cancelled")
+                    if isinstance(e, ReplayMissError):
+                        # Arşiv değişmeden aynı prompt yine bulunamaz; yeniden deneme ve devre kesici sayacı anlamsız
+                        print(f"❌ Tekrar oynatma arşivinde yanıt yok: {e}")
+                        user_message = ("Tekrar oynatma arşivinde bu istek için kayıtlı yanıt yok. Arşivin aynı prompt, "
+                                        f"bağlam kaynağı ve bağlam önbelleği ayarlarıyla kaydedildiğinden emin olun. Sistem Detayı: {str(e)[:150]}")
+                        raise AIAnalysisError(user_message, error_type="replay_miss", details=str(e))
+
                     elapsed = time.time() - start_time
                     print(f"❌ AI istek hatası (Süre: {elapsed:.1f}s): {e}")
 
-                    if attempt < max_retries - 1:
-                        wait_time = (attempt + 1) * 2
-                        print(f"🔄 {wait_time} saniye bekleyip tekrar denenecek...")
-                        time.sleep(wait_time)
+                    is_quota_error = self._handle_rate_limit_error(request_model_name, e)
+                    error_message = str(e)
+                    # Geçersiz anahtar gibi hatalar yeniden denemeyle düzelmez ve modelin sağlığını göstermez
+                    non_retryable = self._is_non_retryable_error(error_message)
+                    # Güvenlik engeli prompt'un kendisinden kaynaklanır: aynı prompt yine engellenir
+                    # ve modelin sağlığıyla ilgisi yoktur
+                    blocked = self._is_blocked_error(error_message)
+                    if breaker and not non_retryable and not blocked:
+                        failure_type = e.error_type if isinstance(e, AIAnalysisError) else ("quota_exceeded" if is_quota_error else "api_error")
+                        breaker.record_failure(failure_type, time.time() - start_time)
+
+                    if attempt < max_retries - 1 and not non_retryable and not blocked:
+                        # Devre bu hatayla açıldıysa kalan deneme yedek modelle yapılır. Bağlam önbellekteyse
+                        # prompt o modele bağlı olduğundan model değiştirilmez.
+                        fallback = self.fallback_instances.get(analysis_type)
+                        if breaker and breaker.state == CircuitBreaker.OPEN and fallback is not None and not cached_context_tokens:
+                            model_instance, request_model_name, breaker = fallback, self.fallback_models[analysis_type], None
+                            telemetry["model"] = request_model_name
+                            print(f"🔌 Devre açıldı, son deneme yedek modelle yapılacak: {request_model_name}")
+                        # Kota hatasında bekleme, bir sonraki denemede hız sınırlayıcı tarafından yapılır
+                        print("🔄 Tekrar denenecek...")
                         continue
                     else:
                         print(f"❌ Tüm denemeler başarısız oldu. Son hata: {e}")
-                        error_message = str(e)
-                        if "prompt_feedback" in error_message or "candidate" in error_message:
+                        if non_retryable:
+                            user_message = f"API anahtarı geçersiz ya da bu model için yetkisi yok. Lütfen YZ ayarlarından anahtarınızı kontrol edin. Sistem Detayı: {error_message[:150]}..."
+                            raise AIAnalysisError(user_message, error_type="invalid_api_key", details=error_message)
+                        if blocked:
                             user_message = f"AI sorgusu güvenlik nedeniyle engellendi. Google AI, metninizi hassas içerik olarak değerlendirdi. Lütfen metni gözden geçirin. Sistem Detayı: {error_message[:100]}..."
                             raise AIAnalysisError(user_message, error_type="prompt_blocked", details=error_message)
+                        if is_quota_error:
+                            user_message = f"API kullanım kotası aşıldı. Lütfen bir süre sonra tekrar deneyin veya Performans ayarlarından istek limitlerini düşürün. Sistem Detayı: {error_message[:150]}..."
+                            raise AIAnalysisError(user_message, error_type="quota_exceeded", details=error_message)
+                        if (isinstance(e, AIAnalysisError) and e.error_type == "timeout") or "deadline" in error_message.lower():
+                            # İstemci tarafı ağ zaman aşımı da kullanıcıya zaman aşımı olarak bildirilir
+                            user_message = f"AI analizi {timeout_seconds} saniye içinde tamamlanamadı. Lütfen internet bağlantınızı kontrol edin veya daha kısa bir metinle tekrar deneyin. Sistem Detayı: {error_message[:150]}..."
+                            raise AIAnalysisError(user_message, error_type="timeout", details=error_message)
                         
                         user_message = f"AI analizi sırasında bir hata oluştu. API ayarlarınızı kontrol edin. Sistem Detayı: {error_message[:150]}..."
                         raise AIAnalysisError(user_message, error_type="api_error", details=error_message)
@@ -372,12 +878,9 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
                 if not response.candidates:
                     feedback_str = f"Prompt Geri Bildirimi: {getattr(response, 'prompt_feedback', 'N/A')}"
                     print(f"HATA: AI yanıtında aday bulunamadı. Muhtemelen prompt engellendi. {feedback_str}")
-                    if attempt < max_retries - 1:
-                        time.sleep((attempt + 1) * 2)
-                        continue
-                    else:
-                        user_message = f"AI sorgusu güvenlik nedeniyle engellendi. Google AI, metninizi hassas içerik olarak değerlendirdi. Lütfen metni gözden geçirin. {feedback_str}"
-                        raise AIAnalysisError(user_message, error_type="prompt_blocked", details=str(getattr(response, 'prompt_feedback', '')))
+                    # Aynı prompt tekrar gönderildiğinde de engellenir; yeniden deneme yapılmaz
+                    user_message = f"AI sorgusu güvenlik nedeniyle engellendi. Google AI, metninizi hassas içerik olarak değerlendirdi. Lütfen metni gözden geçirin. {feedback_str}"
+                    raise AIAnalysisError(user_message, error_type="prompt_blocked", details=str(getattr(response, 'prompt_feedback', '')))
 
                 if not hasattr(response, 'text') or not response.text:
                     print("HATA: AI yanıtında text bulunamadı")
@@ -389,16 +892,44 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
                 print(f"✅ AI YANITINI ALDI: {len(response.text)} karakter (Süre: {elapsed:.1f}s)")
                 print(f"Yanıt önizleme: {response.text[:200]}...")
                 
-                # Yanıtı dosyaya kaydet
-                self._save_response_to_file(response.text, analysis_type)
+                # Yanıtı arşive ve önbelleğe kaydet
+                self._save_response_to_file(response.text, analysis_type, archive_id, request_model_name,
+                                            telemetry.get("network_latency"))
+                self.response_cache.put(request_model_name, prompt, response.text, generation_config)
                 
                 # Update the model name in the suggestions
-                suggestions = self.parse_ai_response(response.text, analysis_type)
+                parse_started = time.time()
+                suggestions = self.parse_ai_response(response.text, analysis_type, structured_output, telemetry)
+                telemetry.update(response_chars=len(response.text), parse_time=time.time() - parse_started)
                 # Add model information to each suggestion
                 for suggestion in suggestions:
-                    suggestion["model_name"] = self.models.get(analysis_type, self.model_name)
+                    suggestion["model_name"] = request_model_name
                 print(f"✅ PARSING TAMAMLANDI: {len(suggestions)} öneri oluşturuldu")
                 
+                self.last_request_metrics = {
+                    "analysis_type": analysis_type,
+                    "model_name": request_model_name,
+                    "cached": False,
+                    "streamed": use_streaming,
+                    "time_to_first_chunk": metrics['time_to_first_chunk'],
+                    "time_to_first_suggestion": metrics['time_to_first_suggestion'],
+                    "total_time": elapsed,
+                    "streamed_suggestion_count": len(streamed_keys),
+                    "suggestion_count": len(suggestions),
+                    "prompt_tokens_sent": RateLimiter.estimate_tokens(request_prompt),
+                    "cached_context_tokens": cached_context_tokens
+                }
+                usage = getattr(response, 'usage_metadata', None)
+                if usage is not None:
+                    self.last_request_metrics["prompt_token_count"] = getattr(usage, 'prompt_token_count', None)
+                    self.last_request_metrics["cached_content_token_count"] = getattr(usage, 'cached_content_token_count', None)
+                print(f"📊 Gönderilen prompt: ~{self.last_request_metrics['prompt_tokens_sent']} token, "
+                      f"önbellekten bağlam: ~{cached_context_tokens} token")
+                if use_streaming:
+                    ttfs = metrics['time_to_first_suggestion']
+                    ttfs_text = f"{ttfs:.1f}s" if ttfs is not None else "yok"
+                    print(f"📈 Akış ölçümleri: İlk öneri={ttfs_text}, Toplam={elapsed:.1f}s, Akışta gelen={len(streamed_keys)}/{len(suggestions)}")
+                
                 return suggestions
                 
             except AIAnalysisError:
@@ -411,10 +942,10 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
                 print(f"AI ANALIZ HATASI (Genel): {str(e)}")
                 print(f"Hata tipi: {type(e).__name__}")
 
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    print(f"🔄 {wait_time} saniye bekleyip tekrar denenecek...")
-                    time.sleep(wait_time)
+                self._handle_rate_limit_error(request_model_name, e)
+
+                if attempt < max_retries - 1 and not self._is_blocked_error(str(e)):
+                    print("🔄 Tekrar denenecek...")
                     continue
                 else:
                     import traceback
@@ -422,7 +953,7 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
                     print(f"❌ Hata detayı: {error_details}")
                     error_message = str(e)
 
-                    if "prompt_feedback" in error_message or "candidate" in error_message:
+                    if self._is_blocked_error(error_message):
                         user_message = f"AI sorgusu güvenlik nedeniyle engellendi. Sistem Detayı: {error_message[:100]}..."
                         raise AIAnalysisError(user_message, error_type="prompt_blocked", details=error_details)
                     
@@ -432,20 +963,93 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
         # Bu satıra normalde ulaşılmamalı, ancak her ihtimale karşı bir hata fırlat
         raise AIAnalysisError("Tüm denemelerden sonra analiz tamamlanamadı.", error_type="retries_failed")
 
-    def generate_summary(self, content: str, summary_type: str) -> str:
-        """Verilen metin için bir özet oluşturur (örn: roman kimliği)."""
+    def analyze_chapter_batch(self, chapters: List[Tuple[str, str]], analysis_type: str = "style_analysis",
+                              novel_context: Optional[str] = None, full_novel_content: Optional[str] = None,
+                              cancel_token: Optional[CancelToken] = None,
+                              retrieved_context: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """Birkaç kısa bölümü tek istekte analiz eder ve önerileri bölümlerine dağıtır.
+
+        `chapters` (bölüm kimliği, içerik) çiftleridir. Bölümler sınır satırlarıyla tek bir
+        içerikte birleştirilir; bağlam bölümü ve istek ek yükü böylece bölüm başına değil paket
+        başına bir kez ödenir. Dönüş değeri bölüm kimliğinden öneri listesine eşlemedir.
+        """
+        blocks = [
+            f"{self.BATCH_CHAPTER_START.format(chapter_id=chapter_id)}\n{content.strip()}\n{self.BATCH_CHAPTER_END.format(chapter_id=chapter_id)}"
+            for chapter_id, content in chapters
+        ]
+        packed_content = self.BATCH_INSTRUCTION + "\n\n".join(blocks)
+        print(f"📦 Paketlenmiş analiz: {len(chapters)} bölüm, {len(packed_content)} karakter")
+        suggestions = self.analyze_chapter(packed_content, analysis_type, novel_context, full_novel_content,
+                                           cancel_token=cancel_token, retrieved_context=retrieved_context)
+        return self._demultiplex_batch_suggestions(suggestions, chapters, analysis_type)
+
+    def _demultiplex_batch_suggestions(self, suggestions: List[Dict], chapters: List[Tuple[str, str]],
+                                       analysis_type: str) -> Dict[str, List[Dict]]:
+        """Paket yanıtındaki önerileri `chapter_id` alanına göre bölümlerine ayırır.
+
+        Kimlik eksik ya da yanlışsa (orijinal cümle o bölümde geçmiyorsa) öneri, orijinal cümlenin
+        geçtiği tek bölüme yönlendirilir; hiçbir bölüme bağlanamayan öneri atlanır. Öneri
+        numaraları bölüm içinde yeniden verilir.
+        """
+        def normalize(text: str) -> str:
+            return ' '.join((text or '').split())
+
+        chapter_texts = {chapter_id: normalize(self._clean_content_for_ai(content)) for chapter_id, content in chapters}
+        routed: Dict[str, List[Dict]] = {chapter_id: [] for chapter_id, _ in chapters}
+        dropped = 0
+        for suggestion in suggestions:
+            chapter_id = suggestion.pop('chapter_id', None)
+            original = normalize(suggestion.get('original_sentence', ''))
+            if chapter_id not in routed or original not in chapter_texts[chapter_id]:
+                matches = [cid for cid, text in chapter_texts.items() if original and original in text]
+                if len(matches) == 1:
+                    chapter_id = matches[0]
+                elif chapter_id not in routed:
+                    dropped += 1
+                    print(f"⚠️ Bölümü belirlenemeyen öneri atlandı: '{original[:50]}...'")
+                    continue
+            routed[chapter_id].append(suggestion)
+        for chapter_suggestions in routed.values():
+            for number, suggestion in enumerate(chapter_suggestions, 1):
+                suggestion['id'] = f"{analysis_type}_{number}"
+                suggestion['title'] = f"{number}. Öneri"
+        print(f"📦 Paket yanıtı dağıtıldı: " + ", ".join(f"{cid}={len(items)}" for cid, items in routed.items())
+              + (f" ({dropped} öneri atlandı)" if dropped else ""))
+        return routed
+
+    def generate_summary(self, content: str, summary_type: str, model_type: Optional[str] = None,
+                         cancel_token: Optional[CancelToken] = None) -> str:
+        """Verilen metin için bir özet oluşturur (örn: roman kimliği).
+
+        `model_type` verilirse prompt `summary_type`'tan, model ise `model_type`'tan seçilir
+        (bölüm özetleri roman kimliği modeliyle üretilir). `cancel_token` iptal edilirse
+        bekleyen istek bırakılır ve boş özet döner.
+        """
+        telemetry: Dict[str, Any] = {"kind": "summary", "analysis_type": summary_type, "retries": 0}
+        started = time.time()
+        summary = self._generate_summary(content, summary_type, model_type, telemetry, cancel_token)
+        if "prompt_chars" in telemetry:
+            telemetry["total_time"] = time.time() - started
+            self.telemetry.record(telemetry)
+        return summary
+
+    def _generate_summary(self, content: str, summary_type: str, model_type: Optional[str], telemetry: Dict[str, Any],
+                          cancel_token: Optional[CancelToken] = None) -> str:
+        """`generate_summary` gövdesi; istek ölçümlerini `telemetry` sözlüğüne yazar."""
         print(f"AI ÖZET OLUŞTURMA BAŞLATILDI: Tip={summary_type}, İçerik uzunluğu={len(content)}")
         
-        model_instance = self.model_instances.get(summary_type)
+        model_type = model_type or summary_type
+        model_instance = self.model_instances.get(model_type)
         if not model_instance:
-            print(f"UYARI: {summary_type} için özel model bulunamadı, varsayılan model kullanılacak")
+            print(f"UYARI: {model_type} için özel model bulunamadı, varsayılan model kullanılacak")
             model_instance = self.model
 
         if not model_instance:
             print("HATA: AI model yapılandırılmamış.")
             return ""
 
-        prompt_template = self.prompts.get(summary_type)
+        # Eski sürümlerden yüklenen prompt dosyalarında bölüm özeti prompt'u yoktur; varsayılan kullanılır
+        prompt_template = self.prompts.get(summary_type) or self.load_default_prompts().get(summary_type)
         if not prompt_template:
             print(f"HATA: {summary_type} için özet prompt'u bulunamadı.")
             return ""
@@ -454,48 +1058,110 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
         cleaned_content = self._clean_content_for_ai(content)
         prompt = prompt_template.format(content=cleaned_content)
         
+        try:
+            model_instance, summary_model_name, breaker = self._select_model(model_type, model_instance)
+        except AIAnalysisError as e:
+            print(f"AI ÖZET OLUŞTURMA ATLANDI: {e}")
+            return ""
+        prompt_tokens = RateLimiter.estimate_tokens(prompt)
+        telemetry.update(model=summary_model_name, prompt_chars=len(prompt), prompt_tokens=prompt_tokens, cached=0, streamed=0)
+        cached_response = self.response_cache.get(summary_model_name, prompt)
+        if cached_response is not None:
+            print(f"💾 ÖNBELLEKTEN ÖZET: {summary_type} ({len(cached_response)} karakter)")
+            telemetry.update(cached=1, response_chars=len(cached_response))
+            return cached_response.strip()
+        
         # Prompt'u ve yanıtı kaydet
-        self._save_prompt_to_file(prompt, summary_type)
+        archive_id = self._save_prompt_to_file(prompt, summary_type, summary_model_name)
         
         try:
-            import google.generativeai as genai
             print("AI modeline özet prompt'u gönderiliyor...")
             # Güvenlik ayarları artık modelin kendisinde yapılandırıldığı için
             # burada tekrar belirtmeye gerek yok.
-            response = model_instance.generate_content(prompt)
+            timeout_seconds = self._calculate_timeout(content, summary_type, prompt_tokens, summary_model_name)
+            queue_started = time.time()
+            self._acquire_rate_limit(summary_model_name, prompt, cancel_token)
+            request_started = time.time()
+            telemetry["queue_wait"] = request_started - queue_started
+            try:
+                response = self.request_worker.run(
+                    lambda request_token: model_instance.generate_content(prompt, request_options={"timeout": timeout_seconds}),
+                    timeout_seconds, cancel_token)
+            except TimeoutError:
+                self.latency_model.record(summary_model_name, summary_type, prompt_tokens, timeout_seconds, timed_out=True)
+                if breaker:
+                    breaker.record_failure("timeout", time.time() - request_started)
+                raise
+            except RequestCancelled:
+                raise
+            except Exception as request_error:
+                if breaker and not self._is_non_retryable_error(str(request_error)) and not isinstance(request_error, ReplayMissError):
+                    breaker.record_failure("api_error", time.time() - request_started)
+                raise
+            telemetry["network_latency"] = time.time() - request_started
+            self.latency_model.record(summary_model_name, summary_type, prompt_tokens, telemetry["network_latency"])
+            if breaker:
+                breaker.record_success(telemetry["network_latency"])
             
             if response and hasattr(response, 'text') and response.text:
                 print(f"✅ ÖZET ALINDI: {len(response.text)} karakter")
-                self._save_response_to_file(response.text, summary_type)
+                telemetry.update(response_chars=len(response.text), suggestion_count=0)
+                self._save_response_to_file(response.text, summary_type, archive_id, summary_model_name,
+                                            telemetry.get("network_latency"))
+                self.response_cache.put(summary_model_name, prompt, response.text)
                 return response.text.strip()
             else:
                 print("HATA: AI'dan boş özet yanıtı geldi.")
+                telemetry["error_type"] = "invalid_response"
                 return ""
+        except TimeoutError as e:
+            telemetry["error_type"] = "timeout"
+            print(f"AI ÖZET OLUŞTURMA ZAMAN AŞIMI: {e}")
+            return ""
+        except RequestCancelled:
+            telemetry["error_type"] = "cancelled"
+            print("⏹️ AI özet isteği iptal edildi")
+            return ""
         except Exception as e:
+            if isinstance(e, AIAnalysisError) and e.error_type == "cancelled":
+                telemetry["error_type"] = "cancelled"
+                print("⏹️ AI özet isteği iptal edildi")
+                return ""
+            is_quota_error = self._handle_rate_limit_error(summary_model_name, e)
+            if isinstance(e, ReplayMissError):
+                telemetry["error_type"] = "replay_miss"
+            else:
+                telemetry["error_type"] = "quota_exceeded" if is_quota_error else "api_error"
             print(f"AI ÖZET OLUŞTURMA HATASI: {e}")
             return ""
     
     
-    def _calculate_timeout(self, content: str, analysis_type: str) -> int:
-        """Metin uzunluğu ve analiz türüne göre dinamik timeout hesapla"""
+    def _calculate_timeout(self, content: str, analysis_type: str, prompt_tokens: Optional[int] = None,
+                           model_name: Optional[str] = None) -> int:
+        """Analiz isteği için zaman aşımını hesapla.
+
+        Bu model ve analiz türü için yeterli gecikme ölçümü varsa zaman aşımı gözlenen p99
+        süresine göre belirlenir; yoksa (soğuk başlangıç) metin uzunluğu ve analiz türüne
+        göre sabit katsayılar kullanılır.
+        """
         if not content:
             return 30
         
         # Kullanıcı ayarlarını kontrol et
-        try:
-            from .settings_manager import SettingsManager
-            settings = SettingsManager()
-            
-            use_dynamic = settings.get_setting("use_dynamic_timeout", True)
-            fixed_timeout = settings.get_setting("fixed_timeout", 120)
-            
-            # Eğer dinamik timeout kapalıysa sabit süreyi kullan
-            if not use_dynamic:
-                print(f"🕒 Sabit timeout kullanılıyor: {fixed_timeout} saniye")
-                return max(30, fixed_timeout)  # En az 30 saniye
-                
-        except Exception as e:
-            print(f"Ayarlar alınamıyor, varsayılan dinamik sistem kullanılıyor: {e}")
+        use_dynamic = self.settings_manager.get_setting("use_dynamic_timeout", True)
+        fixed_timeout = self.settings_manager.get_setting("fixed_timeout", 120)
+        
+        # Eğer dinamik timeout kapalıysa sabit süreyi kullan
+        if not use_dynamic:
+            print(f"🕒 Sabit timeout kullanılıyor: {fixed_timeout} saniye")
+            return max(30, fixed_timeout)  # En az 30 saniye
+        
+        if prompt_tokens is not None:
+            model_name = model_name or self._get_model_name(analysis_type)
+            learned_timeout = self.latency_model.timeout_for(model_name, analysis_type, prompt_tokens)
+            if learned_timeout is not None:
+                print(f"🕒 Ölçümlere dayalı timeout: {learned_timeout}s ({model_name}, {analysis_type}, ~{prompt_tokens} token)")
+                return learned_timeout
         
         content_length = len(content)
         
@@ -538,16 +1204,54 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
         print(f"   ⏰ Toplam timeout: {final_timeout}s ({final_timeout // 60}dk {final_timeout % 60}s)")
         
         return final_timeout
+
+    def estimate_analysis_seconds(self, content: str, analysis_type: str, context_tokens: int = 0) -> Optional[float]:
+        """Bir bölüm analizinin tahmini (medyan) süresi; yeterli ölçüm yoksa None."""
+        prompt_template = self.prompts.get(analysis_type, self.prompts["style_analysis"])
+        prompt_tokens = RateLimiter.estimate_tokens(prompt_template) + RateLimiter.estimate_tokens(content or "") + context_tokens
+        return self.latency_model.predict(self._get_model_name(analysis_type), analysis_type, prompt_tokens)
     
-    def parse_ai_response(self, response_text: str, analysis_type: str) -> List[Dict]:
-        """AI yanıtını yapılandırılmış önerilere çevir - JSON format destekli"""
+    def parse_ai_response(self, response_text: str, analysis_type: str, structured: bool = False,
+                          telemetry: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """AI yanıtını yapılandırılmış önerilere çevir - JSON format destekli
+        
+        `structured` açıksa (yanıt şemalı JSON modunda alındıysa) önce onarımsız hızlı yol
+        denenir; onarım zinciri yalnızca yedek olarak çalışır. Kullanılan yol `telemetry`
+        sözlüğüne `parse_path` olarak yazılır: schema, tolerant, repair veya text.
+        """
         suggestions = []
+        if telemetry is None:
+            telemetry = {}
         
         print(f"JSON PARSING BAŞLATILDI: {len(response_text)} karakter")
         print(f"Yanıt içeriği önizleme: {response_text[:300]}...")
         
+        if structured:
+            structured_suggestions = self._parse_structured_response(response_text, analysis_type)
+            if structured_suggestions is not None:
+                telemetry["parse_path"] = "schema"
+                print(f"JSON PARSING TAMAMLANDI (şema): {len(structured_suggestions)} öneri oluşturuldu")
+                return structured_suggestions
+            print("⚠️ Şemalı yanıt doğrudan ayrıştırılamadı, onarım zincirine geçiliyor...")
+        
+        # Önce tek geçişli hoşgörülü ayrıştırıcıyı dene
+        telemetry["parse_path"] = "tolerant"
+        extractor = TolerantJSONExtractor()
+        ai_suggestions_list = extractor.extract(response_text)
+        if ai_suggestions_list or (extractor.array_found and not extractor.failed_objects):
+            for ai_suggestion in ai_suggestions_list:
+                suggestion = self._build_suggestion(ai_suggestion, analysis_type, len(suggestions) + 1)
+                if suggestion:
+                    suggestions.append(suggestion)
+            stats = extractor.get_stats()
+            print(f"JSON PARSING TAMAMLANDI (tek geçiş): {len(suggestions)} öneri oluşturuldu "
+                  f"(bozuk nesne: {stats['failed_objects']}, yarım yanıt: {'evet' if stats['truncated'] else 'hayır'})")
+            return suggestions
+        
+        print("Tek geçişli ayrıştırıcı JSON bulamadı, eski temizleme zincirine geçiliyor...")
+        telemetry["parse_path"] = "repair"
         try:
-            # Önce direkt JSON parse deneme
+            # Eski yöntem: JSON bloğunu kes, temizle ve tek seferde parse et
             import json
             try:
                 # JSON formatindaki yanıtı parse et
@@ -570,39 +1274,10 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
                     ai_suggestions_list = json.loads(json_text_cleaned)
                     
                     if isinstance(ai_suggestions_list, list):
-                        for i, ai_suggestion in enumerate(ai_suggestions_list, 1):
-                            if isinstance(ai_suggestion, dict):
-                                # Zorunlu alanları kontrol et
-                                original = ai_suggestion.get('original_sentence', '').strip()
-                                suggested = ai_suggestion.get('suggested_sentence', '').strip()
-                                explanation = ai_suggestion.get('explanation', 'Açıklama bulunamadı').strip()
-                                
-                                # Gereksiz önerileri filtrele
-                                if self._is_useless_suggestion(original, suggested, explanation):
-                                    print(f"GEREKSİZ ÖNERİ ATLANDI: '{original[:50]}...' = '{suggested[:50]}...'")
-                                    continue
-                                
-                                if original and suggested:
-                                    # Geçerli önerilerin sayısına göre doğru numara ver
-                                    actual_suggestion_number = len(suggestions) + 1
-                                    
-                                    suggestion = {
-                                        'id': f"{analysis_type}_{actual_suggestion_number}",
-                                        'type': analysis_type,
-                                        'title': f"{actual_suggestion_number}. Öneri",
-                                        'original_sentence': original,
-                                        'suggested_sentence': suggested,
-                                        'explanation': explanation,
-                                        'description': f"Orijinal: {original}\n\nÖnerilen: {suggested}\n\nAçıklama: {explanation}",
-                                        'severity': ai_suggestion.get('severity', 'medium'),
-                                        'location': original[:30] + "...",
-                                        'suggested_fix': suggested,
-                                        'editor_type': ai_suggestion.get('editor_type', self.get_editor_name(analysis_type)),
-                                        'model_name': self.model_name
-                                    }
-                                    
-                                    suggestions.append(suggestion)
-                                    print(f"JSON önerisi eklendi: {actual_suggestion_number} - Açıklama: {explanation[:50]}...")
+                        for ai_suggestion in ai_suggestions_list:
+                            suggestion = self._build_suggestion(ai_suggestion, analysis_type, len(suggestions) + 1)
+                            if suggestion:
+                                suggestions.append(suggestion)
                     
                     print(f"JSON PARSING TAMAMLANDI: {len(suggestions)} öneri oluşturuldu")
                     return suggestions
@@ -619,8 +1294,76 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
             print("Eski metin parsing yöntemine geçiliyor...")
         
         # JSON parsing başarısız olursa eski yönteme geri dön
+        telemetry["parse_path"] = "text"
         return self._parse_text_response(response_text, analysis_type)
     
+    def _parse_structured_response(self, response_text: str, analysis_type: str) -> Optional[List[Dict]]:
+        """Şemalı JSON yanıtını onarım yapmadan önerilere çevirir; yanıt geçerli bir liste değilse None."""
+        try:
+            ai_suggestions_list = json.loads(response_text)
+        except ValueError:
+            return None
+        if not isinstance(ai_suggestions_list, list):
+            return None
+        suggestions = []
+        for ai_suggestion in ai_suggestions_list:
+            suggestion = self._build_suggestion(ai_suggestion, analysis_type, len(suggestions) + 1)
+            if suggestion:
+                suggestions.append(suggestion)
+        return suggestions
+    
+    def _build_suggestion(self, ai_suggestion, analysis_type: str, suggestion_number: int) -> Optional[Dict]:
+        """YZ'nin döndürdüğü tek bir JSON nesnesini öneri sözlüğüne çevirir; geçersizse None."""
+        if not isinstance(ai_suggestion, dict):
+            return None
+        
+        # Zorunlu alanları kontrol et (paragraf kimlikli yanıtta yalnızca değişen parça gelir)
+        paragraph_id = ai_suggestion.get('paragraph_id')
+        if paragraph_id:
+            original = str(ai_suggestion.get('original') or '').strip()
+            suggested = str(ai_suggestion.get('replacement') or '').strip()
+        else:
+            original = str(ai_suggestion.get('original_sentence') or '').strip()
+            suggested = str(ai_suggestion.get('suggested_sentence') or '').strip()
+        explanation = str(ai_suggestion.get('explanation') or 'Açıklama bulunamadı').strip()
+        
+        # Gereksiz önerileri filtrele (paragraf kimlikli yanıtta tek kelimelik kısa parçalar geçerlidir)
+        if paragraph_id:
+            useless = ' '.join(original.split()) == ' '.join(suggested.split())
+        else:
+            useless = self._is_useless_suggestion(original, suggested, explanation)
+        if useless:
+            print(f"GEREKSİZ ÖNERİ ATLANDI: '{original[:50]}...' = '{suggested[:50]}...'")
+            return None
+        
+        if not (original and suggested):
+            return None
+        
+        suggestion = {
+            'id': f"{analysis_type}_{suggestion_number}",
+            'type': analysis_type,
+            'title': f"{suggestion_number}. Öneri",
+            'original_sentence': original,
+            'suggested_sentence': suggested,
+            'explanation': explanation,
+            'description': f"Orijinal: {original}\n\nÖnerilen: {suggested}\n\nAçıklama: {explanation}",
+            'severity': ai_suggestion.get('severity', 'medium'),
+            'location': original[:30] + "...",
+            'suggested_fix': suggested,
+            'editor_type': ai_suggestion.get('editor_type', self.get_editor_name(analysis_type)),
+            'model_name': self.model_name
+        }
+        if paragraph_id:
+            # Tam cümleler bölüm metninden EditorialProcess.resolve_paragraph_edits ile çıkarılır
+            suggestion['paragraph_id'] = str(paragraph_id).strip()
+            suggestion['span_start'] = ai_suggestion.get('start')
+            suggestion['span_end'] = ai_suggestion.get('end')
+        if ai_suggestion.get('chapter_id'):
+            # Paketlenmiş istekte önerinin ait olduğu bölüm (bkz. analyze_chapter_batch)
+            suggestion['chapter_id'] = str(ai_suggestion['chapter_id']).strip()
+        print(f"JSON önerisi eklendi: {suggestion_number} - Açıklama: {explanation[:50]}...")
+        return suggestion
+    
     def _parse_text_response(self, response_text: str, analysis_type: str) -> List[Dict]:
         """Eski metin tabanlı parsing yöntemi - yedek olarak kullanılır"""
         suggestions = []
@@ -934,24 +1677,34 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
         
         return text.strip()
     
-    def custom_analysis(self, content: str, custom_prompt: str) -> List[Dict]:
+    def custom_analysis(self, content: str, custom_prompt: str, cancel_token: Optional[CancelToken] = None) -> List[Dict]:
         """Özel prompt ile analiz yap"""
         if not self.model or not content or not custom_prompt:
             return []
         
         full_prompt = f"{custom_prompt}\n\nMetin bölümü:\n{content}"
+        model = self.model
+        timeout_seconds = self._calculate_timeout(content, "custom", RateLimiter.estimate_tokens(full_prompt), self.model_name)
         
         try:
-            # Google AI import'u burada yapılıyor
-            import google.generativeai as genai  # type: ignore
-            response = self.model.generate_content(full_prompt)
+            self._acquire_rate_limit(self.model_name, full_prompt, cancel_token)
+            response = self.request_worker.run(
+                lambda request_token: model.generate_content(full_prompt, request_options={"timeout": timeout_seconds}),
+                timeout_seconds, cancel_token)
             suggestions = self.parse_ai_response(response.text, "custom")
             return suggestions
         
+        except TimeoutError:
+            print(f"Özel analiz {timeout_seconds} saniye sonra zaman aşımına uğradı.")
+            return []
+        except RequestCancelled:
+            print("⏹️ Özel analiz iptal edildi")
+            return []
         except ImportError:
             print("Google AI kütüphanesi yüklenemedi. 'py -m pip install google-generativeai' komutuyla yükleyin.")
             return []
         except Exception as e:
+            self._handle_rate_limit_error(self.model_name, e)
             print(f"Özel analiz hatası: {e}")
             return []
     
@@ -1194,12 +1947,14 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
             return False
         
         try:
-            # Google AI import'u burada yapılıyor
-            import google.generativeai as genai  # type: ignore
-            
             # Basit bir test prompt'u gönder
             test_prompt = "Bu bir bağlantı testidir. Lütfen 'Bağlantı başarılı' şeklinde kısa bir yanıt verin."
-            response = self.model.generate_content(test_prompt)
+            model = self.model
+            timeout_seconds = self._calculate_timeout(test_prompt, "test_connection")
+            self._acquire_rate_limit(self.model_name, test_prompt)
+            response = self.request_worker.run(
+                lambda request_token: model.generate_content(test_prompt, request_options={"timeout": timeout_seconds}),
+                timeout_seconds)
             
             # Yanıt geldiğini kontrol et
             if response and hasattr(response, 'text') and response.text:
@@ -1209,11 +1964,15 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
                 print("Bağlantı kuruldu ancak boş yanıt alındı.")
                 return False
                 
+        except TimeoutError:
+            print(f"Bağlantı testi {timeout_seconds} saniye içinde yanıt almadı.")
+            return False
         except ImportError:
             print("Google AI kütüphanesi yüklenemedi.")
             return False
         except Exception as e:
             error_msg = str(e)
+            self._handle_rate_limit_error(self.model_name, e)
             if "API_KEY_INVALID" in error_msg:
                 print("API anahtarı geçersiz.")
             elif "PERMISSION_DENIED" in error_msg:
@@ -1226,50 +1985,53 @@ Lütfen aşağıdaki başlıkları kullanarak bir özet oluştur:
                 print(f"Bağlantı test hatası: {e}")
             return False
 
-    def _save_prompt_to_file(self, prompt: str, analysis_type: str):
-        """Oluşturulan prompt'u bir dosyaya kaydeder."""
+    def _get_prompt_archive(self) -> Optional[PromptArchive]:
+        """Aktif projenin `Archive/` klasöründeki prompt/yanıt arşivi."""
+        project_path = self.settings_manager.get_setting('last_project')
+        if not project_path:
+            return None
+        archive_dir = os.path.join(os.path.dirname(project_path), "Archive")
+        with self._archive_lock:
+            archive = self._prompt_archives.get(archive_dir)
+            if archive is None:
+                archive = PromptArchive(archive_dir)
+                self._prompt_archives[archive_dir] = archive
+            return archive
+
+    def _save_prompt_to_file(self, prompt: str, analysis_type: str, model_name: str = "") -> Optional[str]:
+        """Oluşturulan prompt'u proje arşivine yazılmak üzere kuyruğa ekler ve istek kimliğini döndürür."""
+        if self.backend.name == "replay":
+            return None  # Tekrar oynatılan yanıtlar arşivde zaten var
         try:
-            project_path = self.settings_manager.get_setting('last_project')
-            if not project_path:
+            archive = self._get_prompt_archive()
+            if archive is None:
                 print("Prompt kaydetmek için aktif proje bulunamadı.")
-                return
-
-            project_dir = os.path.dirname(project_path)
-            prompts_dir = os.path.join(project_dir, "Prompts")
-            os.makedirs(prompts_dir, exist_ok=True)
-
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{analysis_type}_{timestamp}.txt"
-            filepath = os.path.join(prompts_dir, filename)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(prompt)
-            
-            print(f"Prompt başarıyla kaydedildi: {filepath}")
-
+                return None
+            request_id = PromptArchive.new_request_id()
+            archive.submit(request_id, "prompt", prompt, analysis_type, model_name)
+            return request_id
         except Exception as e:
-            print(f"Prompt dosyaya kaydedilirken hata oluştu: {e}")
+            print(f"Prompt arşive eklenirken hata oluştu: {e}")
+            return None
 
-    def _save_response_to_file(self, response: str, analysis_type: str):
-        """AI'dan gelen yanıtı bir dosyaya kaydeder."""
+    def _save_response_to_file(self, response: str, analysis_type: str, request_id: Optional[str] = None,
+                               model_name: str = "", latency: Optional[float] = None):
+        """AI'dan gelen yanıtı, prompt'uyla aynı istek kimliğiyle proje arşivine ekler."""
+        if self.backend.name == "replay":
+            return
         try:
-            project_path = self.settings_manager.get_setting('last_project')
-            if not project_path:
+            archive = self._get_prompt_archive()
+            if archive is None:
                 print("Yanıtı kaydetmek için aktif proje bulunamadı.")
                 return
-
-            project_dir = os.path.dirname(project_path)
-            responses_dir = os.path.join(project_dir, "Responses")
-            os.makedirs(responses_dir, exist_ok=True)
-
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{analysis_type}_response_{timestamp}.txt"
-            filepath = os.path.join(responses_dir, filename)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(response)
-            
-            print(f"Yanıt başarıyla kaydedildi: {filepath}")
-
+            archive.submit(request_id or PromptArchive.new_request_id(), "response", response, analysis_type,
+                           model_name, {"latency": round(latency, 3) if latency is not None else None})
         except Exception as e:
-            print(f"Yanıt dosyaya kaydedilirken hata oluştu: {e}")
+            print(f"Yanıt arşive eklenirken hata oluştu: {e}")
+
+    def flush_prompt_archives(self):
+        """Kuyrukta bekleyen arşiv kayıtlarının diske yazılmasını bekler."""
+        with self._archive_lock:
+            archives = list(self._prompt_archives.values())
+        for archive in archives:
+            archive.flush()
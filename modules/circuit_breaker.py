@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class CircuitBreaker:
+    """Bir modelin son isteklerindeki hata ve yavaşlık oranına göre açılıp kapanan devre kesici.
+
+    Kapalı (closed) durumda tüm istekler geçer. Son `window` isteğin en az `min_requests`
+    tanesi bilindiğinde hatalı ya da `slow_seconds`'tan uzun süren isteklerin oranı
+    `failure_rate`'i aşarsa veya art arda `consecutive_failures` hata olursa devre açılır
+    (open): `cooldown` saniye boyunca istek geçmez, çağıran yedek modele yönlenir. Süre
+    dolunca yarı açık (half_open) durumda tek bir deneme isteği geçer; başarılıysa devre
+    kapanır, başarısızsa bekleme süresi ikiye katlanarak (`max_cooldown`'a kadar) yeniden açılır.
+    Sonucu hiç bildirilmeyen deneme isteği (ör. önbellekten dönen çağrı) bekleme süresi
+    kadar sonra geçersiz sayılır ve yeni bir denemeye izin verilir.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, window: int = 20, min_requests: int = 4, failure_rate: float = 0.5,
+                 consecutive_failures: int = 3, slow_seconds: Optional[float] = 120.0,
+                 cooldown: float = 60.0, max_cooldown: float = 600.0):
+        self.name = name
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.consecutive_failures = consecutive_failures
+        self.slow_seconds = slow_seconds
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        # (başarılı mı, süre, hata türü)
+        self._outcomes: Deque[Tuple[bool, Optional[float], Optional[str]]] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._consecutive = 0
+        self._cooldown = cooldown
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._last_error: Optional[str] = None
+        self.open_count = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Bekleme süresi dolmuş açık devreyi yarı açığa geçirir (kilit altında çağrılmalı)."""
+        if self._state == self.OPEN and time.time() - self._opened_at >= self._cooldown:
+            self._state = self.HALF_OPEN
+            self._probe_started = 0.0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """İstek bu modele gönderilebilir mi? Yarı açık durumda yalnızca tek deneme isteğine izin verir."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            now = time.time()
+            if state == self.HALF_OPEN and now - self._probe_started >= self._cooldown:
+                self._probe_started = now
+                return True
+            return False
+
+    def record_success(self, seconds: Optional[float] = None):
+        slow = self.slow_seconds is not None and seconds is not None and seconds > self.slow_seconds
+        with self._lock:
+            self._outcomes.append((not slow, seconds, "slow" if slow else None))
+            if self._state == self.HALF_OPEN:
+                if slow:
+                    self._open()
+                else:
+                    # Deneme başarılı: model toparlandı, eski sonuçlar artık geçerli değil
+                    self._state = self.CLOSED
+                    self._cooldown = self.base_cooldown
+                    self._outcomes.clear()
+                    print(f"🔌 Devre kapandı: {self.name}")
+                return
+            self._consecutive = 0
+            if slow:
+                self._evaluate()
+
+    def record_failure(self, error_type: str = "error", seconds: Optional[float] = None):
+        with self._lock:
+            self._outcomes.append((False, seconds, error_type))
+            self._consecutive += 1
+            self._last_error = error_type
+            if self._state == self.HALF_OPEN:
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._open()
+                return
+            self._evaluate()
+
+    def _evaluate(self):
+        if self._state != self.CLOSED:
+            return
+        failures = sum(1 for ok, _, _ in self._outcomes if not ok)
+        if self._consecutive >= self.consecutive_failures or (
+                len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.failure_rate):
+            self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.time()
+        self._consecutive = 0
+        self.open_count += 1
+        print(f"🔌 Devre açıldı: {self.name} ({self._cooldown:.0f} sn, son hata: {self._last_error or 'yavaş yanıt'})")
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._consecutive = 0
+            self._cooldown = self.base_cooldown
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            outcomes = list(self._outcomes)
+            latencies = sorted(seconds for ok, seconds, _ in outcomes if seconds is not None)
+            return {
+                "state": state,
+                "requests": len(outcomes),
+                "failure_rate": (sum(1 for ok, _, _ in outcomes if not ok) / len(outcomes)) if outcomes else 0.0,
+                "median_latency": latencies[len(latencies) // 2] if latencies else None,
+                "last_error": self._last_error,
+                "retry_in": max(0.0, self._cooldown - (time.time() - self._opened_at)) if state == self.OPEN else 0.0,
+                "open_count": self.open_count,
+            }
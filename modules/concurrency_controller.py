@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class AdaptiveConcurrencyController:
+    """Arka plan (tam analiz) istekleri için model başına AIMD eşzamanlılık penceresi.
+
+    Her model için ayrı bir pencere tutulur: sağlıklı biten her istekte pencere 1/pencere
+    kadar büyür (yaklaşık her tam turda +1, toplamsal artış); kota hatası (429) ya da zaman
+    aşımında yarıya iner (çarpımsal azalış). Gecikme beklenenin `latency_tolerance` katını
+    aşarsa pencere büyütülmez ve `latency_backoff` oranında küçültülür. Aynı tıkanıklık
+    dalgasında dönen hatalar pencereyi bir kez küçültür: yalnızca son küçültmeden sonra
+    başlamış isteklerin hatası yeni bir küçültme yapar. Pencereler çalıştırmalar arasında
+    korunur; böylece gün içinde değişen kota durumuna kaldığı yerden uyum sağlanır.
+    """
+
+    BACKOFF_ERRORS = ("quota_exceeded", "timeout")
+
+    def __init__(self, initial: int = 3, max_limit: int = 8, min_limit: int = 1,
+                 backoff: float = 0.5, latency_tolerance: float = 2.0, latency_backoff: float = 0.8):
+        self._condition = threading.Condition()
+        self.initial = initial
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.latency_backoff = latency_backoff
+        self._windows: Dict[str, float] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._last_decrease: Dict[str, float] = {}
+        # Beklenen süre bilinmediğinde sağlık ölçütü: modelin saniye/1K karakter ortalaması
+        self._baseline: Dict[str, float] = {}
+        self.decisions: Deque[Tuple[float, str, str]] = deque(maxlen=50)
+
+    def configure(self, initial: int, max_limit: int):
+        """Başlangıç penceresini ve üst sınırı ayarlar; mevcut pencereler yeni sınıra çekilir."""
+        with self._condition:
+            self.max_limit = max(self.min_limit, int(max_limit))
+            self.initial = max(self.min_limit, min(int(initial), self.max_limit))
+            for model_name, window in self._windows.items():
+                self._windows[model_name] = max(self.min_limit, min(window, self.max_limit))
+            self._condition.notify_all()
+
+    def window(self, model_name: str) -> int:
+        """Modelin şu anki eşzamanlı istek sınırı."""
+        with self._condition:
+            return int(self._window(model_name))
+
+    def _window(self, model_name: str) -> float:
+        return self._windows.setdefault(model_name, float(self.initial))
+
+    def acquire(self, model_name: str, cancel_check: Optional[Callable[[], bool]] = None) -> float:
+        """Pencerede yer açılana kadar bekler; isteğin başlangıç zamanını döndürür.
+
+        `cancel_check` True döndürürse InterruptedError fırlatılır.
+        """
+        with self._condition:
+            while self._in_flight.get(model_name, 0) >= int(self._window(model_name)):
+                if cancel_check and cancel_check():
+                    raise InterruptedError("Eşzamanlılık beklemesi iptal edildi")
+                self._condition.wait(0.2)
+            self._in_flight[model_name] = self._in_flight.get(model_name, 0) + 1
+            return time.time()
+
+    def release(self, model_name: str, started: float, error_type: Optional[str] = None,
+                expected_seconds: Optional[float] = None, size_chars: int = 0):
+        """İsteğin sonucunu bildirir ve pencereyi günceller.
+
+        `error_type` hatasız biten istek için None, iptal için "cancelled" olmalıdır (iptal
+        pencereyi etkilemez). `expected_seconds` gecikme modelinin tahminidir; yoksa
+        `size_chars` ile modelin bu çalıştırmadaki ortalama hızına göre karşılaştırılır.
+        """
+        seconds = time.time() - started
+        with self._condition:
+            self._in_flight[model_name] = max(0, self._in_flight.get(model_name, 0) - 1)
+            window = self._window(model_name)
+            if error_type in self.BACKOFF_ERRORS:
+                if started >= self._last_decrease.get(model_name, 0.0):
+                    self._decrease(model_name, window, self.backoff, "kota hatası" if error_type == "quota_exceeded" else "zaman aşımı")
+            elif error_type is None:
+                expected = expected_seconds
+                per_kchar = seconds / max(1.0, size_chars / 1000)
+                if expected is None and model_name in self._baseline:
+                    expected = self._baseline[model_name] * max(1.0, size_chars / 1000)
+                if size_chars:
+                    previous = self._baseline.get(model_name)
+                    self._baseline[model_name] = per_kchar if previous is None else previous * 0.8 + per_kchar * 0.2
+                if expected and seconds > expected * self.latency_tolerance:
+                    if started >= self._last_decrease.get(model_name, 0.0):
+                        self._decrease(model_name, window, self.latency_backoff,
+                                       f"gecikme arttı ({seconds:.0f} sn, beklenen ~{expected:.0f} sn)")
+                elif window < self.max_limit:
+                    new_window = min(float(self.max_limit), window + 1.0 / window)
+                    self._windows[model_name] = new_window
+                    if int(new_window) > int(window):
+                        self._record(model_name, f"↑ {int(new_window)} (sağlıklı)")
+            self._condition.notify_all()
+
+    def _decrease(self, model_name: str, window: float, factor: float, reason: str):
+        """Pencereyi küçültür (kilit altında çağrılmalı)."""
+        new_window = max(float(self.min_limit), window * factor)
+        self._windows[model_name] = new_window
+        self._last_decrease[model_name] = time.time()
+        self._record(model_name, f"↓ {int(new_window)} ({reason})")
+
+    def _record(self, model_name: str, decision: str):
+        self.decisions.append((time.time(), model_name, decision))
+        print(f"🎚️ Eşzamanlılık {model_name}: {decision}")
+
+    def last_decision(self, model_name: str) -> Optional[str]:
+        with self._condition:
+            for _, name, decision in reversed(self.decisions):
+                if name == model_name:
+                    return decision
+        return None
+
+    def describe(self, model_name: str) -> str:
+        """İlerleme alanı için kısa durum metni."""
+        with self._condition:
+            window = int(self._window(model_name))
+            in_flight = self._in_flight.get(model_name, 0)
+        decision = self.last_decision(model_name)
+        text = f"eşzamanlı {in_flight}/{window}"
+        return f"{text} ({decision})" if decision else text
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._condition:
+            return {
+                model_name: {"window": round(window, 2), "in_flight": self._in_flight.get(model_name, 0)}
+                for model_name, window in self._windows.items()
+            }
@@ -0,0 +1,262 @@
+import datetime
+import hashlib
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from .rate_limiter import RateLimiter
+
+
+class CachedContextHandle:
+    """Önbelleğe alınmış bir bağlamı ve ona bağlı model nesnesini temsil eder."""
+
+    def __init__(self, key: str, model_name: str, model: Any, context_tokens: int, expires_at: float, remote: Any = None,
+                 prompt_prefix: str = ""):
+        self.key = key
+        self.model_name = model_name
+        self.model = model
+        self.context_tokens = context_tokens
+        self.expires_at = expires_at
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.remote = remote  # Gemini CachedContent nesnesi (yerel önbellekte None)
+        self.prompt_prefix = prompt_prefix  # Model çağrısında prompt'un önüne eklenen metin (yerel önbellek)
+        self.ref_count = 0      # Bu bağlamı kullanan, henüz bitmemiş istekler
+        self.retired = False    # Önbellekten çıkarıldı; son kullanan bitince bırakılır
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        # Süre bitmeden hemen önce kullanılmasın diye küçük bir pay bırakılır
+        return (now or time.time()) >= self.expires_at - 30
+
+
+class ContextCache:
+    """Roman bağlamını içerik sürümü başına bir kez yükleyip sonraki isteklerde yeniden kullanır.
+
+    Alt sınıflar `_create_handle` ve `_release_handle` metotlarını uygular. Kayıtlar model +
+    bağlam anahtarıyla tutulur; böylece farklı bağlamlarla (farklı fazlar, aynı anda analiz
+    edilen romanlar) gelen istekler birbirinin kaydını silmez. `get_or_create` ile alınan
+    handle, istek bitince `release` ile bırakılmalıdır. Süresi dolan ya da `max_contexts`
+    sınırını aşınca en uzun süredir kullanılmayan kayıt önbellekten çıkarılır; kayıt ancak
+    onu kullanan istek kalmadığında bırakılır (`_release_handle`).
+
+    Yükleme ve silme ağ isteği olduğundan kilit dışında yapılır; aynı anahtar için eşzamanlı
+    gelen çağıranlar tek yüklemenin sonucunu bekler, diğer anahtarlar beklemez.
+    """
+
+    DEFAULT_MAX_CONTEXTS = 4
+
+    def __init__(self, ttl_minutes: int = 60, min_tokens: int = 0, max_contexts: int = DEFAULT_MAX_CONTEXTS):
+        self.ttl_seconds = max(60, int(ttl_minutes) * 60)
+        self.min_tokens = min_tokens
+        self.max_contexts = max(1, int(max_contexts))
+        self._lock = threading.Lock()
+        self._handles: Dict[str, CachedContextHandle] = {}  # model + bağlam anahtarı -> handle
+        self._creating: Dict[str, Future] = {}  # Yüklemesi süren anahtarlar -> sonuç (handle veya None)
+        self._failed_models = set()
+        self.stats = {
+            "uploads": 0,
+            "hits": 0,
+            "expired": 0,
+            "tokens_uploaded": 0,
+            "tokens_reused": 0,
+            "evicted": 0,
+        }
+
+    @staticmethod
+    def make_key(model_name: str, context_text: str) -> str:
+        return hashlib.sha256(f"{model_name}\n{context_text}".encode("utf-8")).hexdigest()
+
+    def get_or_create(self, model_name: str, context_text: str, base_model: Any) -> Optional[CachedContextHandle]:
+        """Bağlam için geçerli bir handle döndürür; önbellekleme uygun değilse None.
+
+        Dönen handle kullanımda sayılır; istek bitince `release` çağrılmalıdır.
+        """
+        context_tokens = RateLimiter.estimate_tokens(context_text)
+        if context_tokens < self.min_tokens or model_name in self._failed_models:
+            return None
+
+        key = self.make_key(model_name, context_text)
+        to_release: List[CachedContextHandle] = []
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle and not handle.is_expired():
+                self._acquire(handle, context_tokens)
+                return handle
+            if handle:
+                self.stats["expired"] += 1
+                self._retire(handle, to_release)
+            pending = self._creating.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._creating[key] = Future()
+        self._release_handles(to_release)
+
+        if not owner:
+            # Aynı bağlam başka bir istek tarafından yükleniyor; onun sonucu kullanılır
+            handle = pending.result()
+            if handle is None:
+                return None
+            with self._lock:
+                if not handle.retired:
+                    self._acquire(handle, context_tokens)
+                    return handle
+            # Beklerken önbellekten çıkarıldı; yeniden alınır
+            return self.get_or_create(model_name, context_text, base_model)
+
+        try:
+            handle = self._create_handle(key, model_name, context_text, context_tokens, base_model)
+        except Exception as e:
+            print(f"⚠️ Bağlam önbelleği oluşturulamadı ({model_name}), bağlam isteğe gömülecek: {e}")
+            with self._lock:
+                self._failed_models.add(model_name)
+                self._creating.pop(key, None)
+            pending.set_result(None)
+            return None
+
+        with self._lock:
+            handle.ref_count = 1
+            self._handles[key] = handle
+            self._creating.pop(key, None)
+            self.stats["uploads"] += 1
+            self.stats["tokens_uploaded"] += context_tokens
+            self._evict(to_release)
+        pending.set_result(handle)
+        print(f"📦 Bağlam önbelleğe alındı: {model_name}, ~{context_tokens} token, "
+              f"{self.ttl_seconds // 60} dk geçerli")
+        self._release_handles(to_release)
+        return handle
+
+    def release(self, handle: CachedContextHandle):
+        """`get_or_create` ile alınan handle'ı bırakır; önbellekten çıkarılmışsa kaydı siler."""
+        with self._lock:
+            handle.ref_count = max(0, handle.ref_count - 1)
+            handle.last_used = time.time()
+            release_now = handle.retired and handle.ref_count == 0
+        if release_now:
+            self._release_handle(handle)
+
+    def clear(self):
+        to_release: List[CachedContextHandle] = []
+        with self._lock:
+            for handle in list(self._handles.values()):
+                self._retire(handle, to_release)
+            self._failed_models = set()
+        self._release_handles(to_release)
+
+    def _acquire(self, handle: CachedContextHandle, context_tokens: int):
+        """Önbellekteki handle'ı kullanımda say (kilit altında çağrılır)."""
+        self.stats["hits"] += 1
+        self.stats["tokens_reused"] += context_tokens
+        handle.ref_count += 1
+        handle.last_used = time.time()
+
+    def _retire(self, handle: CachedContextHandle, to_release: List[CachedContextHandle]):
+        """Handle'ı önbellekten çıkarır; kullanan istek yoksa `to_release` listesine eklenir, varsa
+        son istek bitince bırakılır. Kilit altında çağrılır; liste kilit dışında bırakılmalıdır."""
+        self._handles.pop(handle.key, None)
+        handle.retired = True
+        if handle.ref_count == 0:
+            to_release.append(handle)
+
+    def _evict(self, to_release: List[CachedContextHandle]):
+        """Süresi dolan ve `max_contexts` sınırını aşan (en uzun süredir kullanılmayan) kayıtları çıkarır."""
+        now = time.time()
+        for handle in list(self._handles.values()):
+            if handle.is_expired(now):
+                self.stats["expired"] += 1
+                self._retire(handle, to_release)
+        overflow = len(self._handles) - self.max_contexts
+        if overflow > 0:
+            for handle in sorted(self._handles.values(), key=lambda h: h.last_used)[:overflow]:
+                self.stats["evicted"] += 1
+                self._retire(handle, to_release)
+
+    def _release_handles(self, handles: List[CachedContextHandle]):
+        for handle in handles:
+            self._release_handle(handle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            return dict(
+                self.stats,
+                active_contexts=[
+                    {
+                        "model_name": handle.model_name,
+                        "context_tokens": handle.context_tokens,
+                        "remaining_seconds": max(0, int(handle.expires_at - now)),
+                        "in_use": handle.ref_count,
+                    }
+                    for handle in self._handles.values()
+                ],
+            )
+
+    def _create_handle(self, key: str, model_name: str, context_text: str, context_tokens: int, base_model: Any) -> CachedContextHandle:
+        raise NotImplementedError
+
+    def _release_handle(self, handle: CachedContextHandle):
+        pass
+
+
+class LocalCachedModel:
+    """Yerel önbellek için model sarmalayıcı: bağlamı her istekte prompt'un önüne ekler."""
+
+    def __init__(self, base_model: Any, context_text: str):
+        self.base_model = base_model
+        self.context_text = context_text
+
+    def generate_content(self, prompt, **kwargs):
+        return self.base_model.generate_content(f"{self.context_text}{prompt}", **kwargs)
+
+
+class LocalContextCache(ContextCache):
+    """Ağ gerektirmeyen yerel karşılık (testler için; yalnızca "local" modunda seçilir).
+
+    Gemini önbelleğiyle aynı defter tutmayı yapar; model çağrısında bağlamı prompt'a geri ekler.
+    """
+
+    def _create_handle(self, key, model_name, context_text, context_tokens, base_model):
+        return CachedContextHandle(key, model_name, LocalCachedModel(base_model, context_text),
+                                   context_tokens, time.time() + self.ttl_seconds, prompt_prefix=context_text)
+
+
+class GeminiContextCache(ContextCache):
+    """Gemini `CachedContent` ile sunucu tarafında bağlam önbelleği."""
+
+    # Gemini önbelleği belirli bir token sayısının altındaki içerikleri kabul etmez
+    DEFAULT_MIN_TOKENS = 32768
+
+    def __init__(self, ttl_minutes: int = 60, min_tokens: int = DEFAULT_MIN_TOKENS, safety_settings: Optional[Dict] = None,
+                 max_contexts: int = ContextCache.DEFAULT_MAX_CONTEXTS):
+        super().__init__(ttl_minutes, min_tokens, max_contexts)
+        self.safety_settings = safety_settings
+
+    def _create_handle(self, key, model_name, context_text, context_tokens, base_model):
+        import google.generativeai as genai
+        from google.generativeai import caching
+
+        full_model_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+        cached_content = caching.CachedContent.create(
+            model=full_model_name,
+            display_name=f"aieditor-{key[:16]}",
+            contents=[context_text],
+            ttl=datetime.timedelta(seconds=self.ttl_seconds),
+        )
+        model = genai.GenerativeModel.from_cached_content(
+            cached_content=cached_content,
+            safety_settings=self.safety_settings,
+        )
+        usage = getattr(cached_content, "usage_metadata", None)
+        if usage and getattr(usage, "total_token_count", None):
+            context_tokens = usage.total_token_count
+        return CachedContextHandle(key, model_name, model, context_tokens,
+                                   time.time() + self.ttl_seconds, remote=cached_content)
+
+    def _release_handle(self, handle):
+        # Önbellekten çıkarılan bağlam için depolama ücreti ödememek adına sunucudaki kaydı sil
+        if handle.remote is not None:
+            try:
+                handle.remote.delete()
+            except Exception as e:
+                print(f"Eski bağlam önbelleği silinemedi: {e}")
@@ -0,0 +1,220 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .rate_limiter import RateLimiter
+
+# Bilgi taşımayan sık Türkçe kelimeler (kök kısaltmasından önce elenir)
+_STOPWORDS = {
+    "ama", "ancak", "bana", "bazı", "belki", "ben", "beni", "benim", "bile", "bir", "biri", "birkaç",
+    "birşey", "biz", "bize", "bizi", "bizim", "böyle", "bu", "buna", "bunu", "bunun", "burada", "çok",
+    "çünkü", "da", "daha", "de", "değil", "diye", "en", "gibi", "hem", "hep", "her", "hiç", "için",
+    "ile", "ise", "kadar", "ki", "kim", "mi", "mı", "mu", "mü", "ne", "neden", "nasıl", "o", "ona",
+    "onu", "onun", "orada", "öyle", "sen", "seni", "senin", "siz", "sonra", "şey", "şu", "şimdi",
+    "tüm", "ve", "veya", "ya", "yani", "yine", "dedi", "diye", "olan", "olarak", "oldu", "olduğu",
+    "kendi", "artık", "bütün", "zaman", "önce", "sadece", "onlar", "onları", "onların",
+}
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Cümle başı olmayan, büyük harfle başlayan kelimeler (karakter ve yer adı adayları)
+_NAME_RE = re.compile(r"(?<![.!?…:\"'“”—-]\s)(?<!^)\b([A-ZÇĞİÖŞÜ][a-zçğıöşü]{2,})\b", re.MULTILINE)
+_STEM_LENGTH = 5
+_TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+
+
+def turkish_lower(text: str) -> str:
+    return text.translate(_TURKISH_LOWER).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Küçük harfe çevirip kelimeleri ilk beş harfine kısaltır (Türkçe için basit ve etkili kök alma)."""
+    tokens = []
+    for word in _WORD_RE.findall(turkish_lower(text)):
+        if len(word) < 3 or word in _STOPWORDS or word.isdigit():
+            continue
+        tokens.append(word[:_STEM_LENGTH])
+    return tokens
+
+
+class Passage:
+    """Dizinlenen en küçük birim: bir bölümün ardışık paragraflarından oluşan parça."""
+
+    def __init__(self, chapter_index: int, chapter_title: str, position: int, text: str):
+        self.chapter_index = chapter_index
+        self.chapter_title = chapter_title
+        self.position = position
+        self.text = text
+        self.term_counts = Counter(tokenize(text))
+        self.length = sum(self.term_counts.values())
+        self.tokens = RateLimiter.estimate_tokens(text)
+
+
+class ContextRetriever:
+    """Bölüm ve paragraflar üzerinde BM25 dizini; analiz edilen bölümle ilgili pasajları seçer.
+
+    Romanın tam metni yerine yalnızca komşu bölümler ve bölümle en ilgili k pasaj, verilen
+    token bütçesi içinde bağlam olarak gönderilir. Karakter adları (cümle ortasında büyük
+    harfle geçen ve birden çok bölümde görülen kelimeler) sorguda ek ağırlık alır. Dizin,
+    bölüm içerikleri değişmedikçe yeniden kurulmaz.
+    """
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, passage_tokens: int = 250, name_boost: float = 2.0, query_terms: int = 60):
+        self.passage_tokens = passage_tokens
+        self.name_boost = name_boost
+        self.query_terms = query_terms
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple] = None
+        self._passages: List[Passage] = []
+        self._chapter_passages: Dict[int, List[Passage]] = {}
+        self._document_frequency: Counter = Counter()
+        self._average_length = 0.0
+        self._names: set = set()
+
+    def ensure_index(self, chapters: Sequence) -> None:
+        """Bölümler değiştiyse dizini yeniden kur."""
+        signature = tuple((id(chapter), chapter.content_hash()) for chapter in chapters)
+        with self._lock:
+            if signature == self._signature:
+                return
+            self._build(chapters)
+            self._signature = signature
+
+    def _build(self, chapters: Sequence):
+        passages = []
+        chapter_passages = {}
+        name_chapters: Dict[str, set] = {}
+        for chapter_index, chapter in enumerate(chapters):
+            chapter_list = []
+            for position, text in enumerate(self._split_passages(chapter.content or "")):
+                passage = Passage(chapter_index, chapter.title, position, text)
+                passages.append(passage)
+                chapter_list.append(passage)
+            chapter_passages[chapter_index] = chapter_list
+            for name in _NAME_RE.findall(chapter.content or ""):
+                name_chapters.setdefault(turkish_lower(name)[:_STEM_LENGTH], set()).add(chapter_index)
+
+        document_frequency = Counter()
+        for passage in passages:
+            document_frequency.update(passage.term_counts.keys())
+
+        self._passages = passages
+        self._chapter_passages = chapter_passages
+        self._document_frequency = document_frequency
+        self._average_length = (sum(p.length for p in passages) / len(passages)) if passages else 0.0
+        self._names = {name for name, seen in name_chapters.items() if len(seen) >= 2}
+        print(f"🔎 Bağlam dizini kuruldu: {len(chapters)} bölüm, {len(passages)} pasaj, {len(self._names)} ad")
+
+    def _split_passages(self, content: str) -> List[str]:
+        """Paragrafları, `passage_tokens` bütçesini aşmayacak şekilde birleştirir."""
+        passages = []
+        current: List[str] = []
+        current_tokens = 0
+        for paragraph in content.split("\n"):
+            if not paragraph.strip():
+                continue
+            paragraph_tokens = RateLimiter.estimate_tokens(paragraph)
+            if current and current_tokens + paragraph_tokens > self.passage_tokens:
+                passages.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(paragraph)
+            current_tokens += paragraph_tokens
+        if current:
+            passages.append("\n".join(current))
+        return passages
+
+    def _idf(self, term: str) -> float:
+        n = len(self._passages)
+        df = self._document_frequency.get(term, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _build_query(self, text: str) -> Dict[str, float]:
+        """Sorgu metninin en ayırt edici terimlerini (tf-idf) ağırlıklarıyla seçer."""
+        counts = Counter(tokenize(text))
+        scored = []
+        for term, count in counts.items():
+            if term not in self._document_frequency:
+                continue
+            weight = (1 + math.log(count)) * self._idf(term)
+            if term in self._names:
+                weight *= self.name_boost
+            scored.append((weight, term))
+        scored.sort(reverse=True)
+        return {term: weight for weight, term in scored[:self.query_terms]}
+
+    def _score(self, passage: Passage, query: Dict[str, float]) -> float:
+        score = 0.0
+        length_norm = self.K1 * (1 - self.B + self.B * passage.length / (self._average_length or 1))
+        for term, weight in query.items():
+            tf = passage.term_counts.get(term)
+            if tf:
+                score += weight * self._idf(term) * tf * (self.K1 + 1) / (tf + length_norm)
+        return score
+
+    def search(self, query_text: str, top_k: int = 8, exclude_chapters: Sequence[int] = ()) -> List[Tuple[float, Passage]]:
+        with self._lock:
+            query = self._build_query(query_text)
+            if not query:
+                return []
+            excluded = set(exclude_chapters)
+            results = [
+                (self._score(passage, query), passage)
+                for passage in self._passages
+                if passage.chapter_index not in excluded
+            ]
+        results = [item for item in results if item[0] > 0]
+        results.sort(key=lambda item: item[0], reverse=True)
+        return results[:top_k]
+
+    def select_context(self, chapters: Sequence, chapter_index: int, query_text: Optional[str] = None,
+                       token_budget: int = 8000, top_k: int = 8, neighbour_chapters: int = 1) -> str:
+        """Komşu bölümler ve ilgili pasajlardan, token bütçesini aşmayan bir bağlam metni oluşturur.
+
+        Bütçenin en fazla yarısı komşu bölümlere (önceki bölümün sonu, sonraki bölümün başı)
+        ayrılır; kalan kısım romanın geri kalanından seçilen pasajlarla doldurulur. Pasajlar
+        romandaki sıralarıyla yazılır.
+        """
+        self.ensure_index(chapters)
+        if query_text is None:
+            query_text = chapters[chapter_index].content or ""
+
+        sections = []
+        remaining = token_budget
+        neighbour_indices = [
+            index for index in range(chapter_index - neighbour_chapters, chapter_index + neighbour_chapters + 1)
+            if index != chapter_index and 0 <= index < len(chapters)
+        ]
+        neighbour_budget = token_budget // 2 // max(1, len(neighbour_indices))
+        for index in neighbour_indices:
+            # Önceki bölümün sonu ve sonraki bölümün başı bu bölüme en yakın kısımlardır
+            passages = self._chapter_passages.get(index, [])
+            ordered = list(reversed(passages)) if index < chapter_index else passages
+            picked, used = [], 0
+            for passage in ordered:
+                if used + passage.tokens > neighbour_budget:
+                    break
+                picked.append(passage)
+                used += passage.tokens
+            if picked:
+                picked.sort(key=lambda p: p.position)
+                label = "ÖNCEKİ BÖLÜM" if index < chapter_index else "SONRAKİ BÖLÜM"
+                truncated = "" if len(picked) == len(passages) else " (kısaltılmış)"
+                sections.append((index, -1, f"[{label}: {chapters[index].title}{truncated}]\n" +
+                                 "\n".join(p.text for p in picked)))
+                remaining -= used
+
+        excluded = [chapter_index] + neighbour_indices
+        for score, passage in self.search(query_text, top_k, excluded):
+            if passage.tokens > remaining:
+                continue
+            sections.append((passage.chapter_index, passage.position,
+                             f"[{passage.chapter_title} — pasaj {passage.position + 1}]\n{passage.text}"))
+            remaining -= passage.tokens
+
+        sections.sort(key=lambda item: (item[0], item[1]))
+        used_tokens = token_budget - remaining
+        print(f"🔎 Seçilmiş bağlam: {len(sections)} parça, ~{used_tokens}/{token_budget} token")
+        return "\n\n".join(text for _, _, text in sections)
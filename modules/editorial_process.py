@@ -1,8 +1,14 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import json
 import datetime
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from .file_manager import Chapter
 from .ai_integration import AIAnalysisError
+from .rate_limiter import RateLimiter
+from .request_worker import CancelToken
 
 class EditorialSuggestion:
     def __init__(self, suggestion_id: str, suggestion_type: str, title: str, 
@@ -24,6 +30,8 @@ class EditorialSuggestion:
         self.explanation = ""
         self.editor_type = ""
         self.model_name = ""
+        # Paragraf kimlikli protokolde değişikliğin yeri: paragraf (satır) indeksi ve paragraf içi aralık
+        self.paragraph_edit: Optional[Dict] = None
     
     def to_dict(self):
         return {
@@ -41,7 +49,8 @@ class EditorialSuggestion:
             'suggested_sentence': getattr(self, 'suggested_sentence', ''),
             'explanation': getattr(self, 'explanation', ''),
             'editor_type': getattr(self, 'editor_type', ''),
-            'model_name': getattr(self, 'model_name', '')
+            'model_name': getattr(self, 'model_name', ''),
+            'paragraph_edit': getattr(self, 'paragraph_edit', None)
         }
     
     @classmethod
@@ -64,9 +73,13 @@ class EditorialSuggestion:
         suggestion.explanation = data.get('explanation', '')
         suggestion.editor_type = data.get('editor_type', '')
         suggestion.model_name = data.get('model_name', '')
+        suggestion.paragraph_edit = data.get('paragraph_edit')
         return suggestion
 
 class EditorialProcess:
+    # tag_paragraphs tarafından eklenen paragraf kimliği
+    PARAGRAPH_TAG_PATTERN = re.compile(r'^\[P\d+\] ')
+    
     def __init__(self):
         self.current_chapter = 1
         self.processed_chapters = set()
@@ -82,6 +95,66 @@ class EditorialProcess:
             'sequential_editing': False    # Sıralı editiryal analiz - hepsini birden yap
         }
         self.novel_context = "" # Romanın genel bağlamını tutmak için
+        # Roman kimliği bölüm özetlerinden üretilir; özetler bölüm içeriğinin özetine göre saklanır
+        self.chapter_summaries: Dict[str, str] = {}  # content_hash -> bölüm özeti
+        self.novel_context_hashes: List[str] = []    # Roman kimliğinin üretildiği bölüm sürümleri
+        self._novel_context_lock = threading.Lock()
+        self.summary_settings = {
+            'max_workers': 3,         # Aynı anda özetlenen bölüm sayısı
+            'reduce_token_budget': 30000  # Tek birleştirme isteğine sığacak en fazla özet (tahmini token)
+        }
+        # Uzun bölümlerin pencerelere bölünerek analiz edilmesi için ayarlar
+        self.chunk_settings = {
+            'token_budget': 6000,   # Bir penceredeki en fazla (tahmini) token
+            'overlap_tokens': 200,  # Ardışık pencereler arasında tekrarlanan bağlam
+            'max_workers': 3        # Aynı anda analiz edilen pencere sayısı
+        }
+        # Bölüm paragraflarını [P<n>] kimlikleriyle gönderip önerileri paragraf + aralık olarak al
+        self.paragraph_id_protocol = False
+        # Tam analizde kısa bölümlerin tek istekte paketlenmesi için ayarlar
+        self.batch_settings = {
+            'enabled': False,
+            'token_budget': 6000,         # Bir paketteki bölüm metinlerinin en fazla (tahmini) token'ı
+            'short_chapter_chars': 3000,  # Bu uzunluğu aşan bölümler paketlenmez
+            'max_chapters': 8             # Bir paketteki en fazla bölüm sayısı
+        }
+        # Güvenlik filtresine takılan bölümde engellenen pasajı ikiye bölerek bulma ayarları
+        self.block_isolation_settings = {
+            'enabled': True,
+            'token_budget': 20000  # Bir bölümün kurtarma istekleri için harcanabilecek (tahmini) token
+        }
+    
+    def configure_chunking(self, token_budget: Optional[int] = None, overlap_tokens: Optional[int] = None, max_workers: Optional[int] = None):
+        """Uzun bölüm pencereleme ayarlarını güncelle."""
+        if token_budget is not None:
+            self.chunk_settings['token_budget'] = max(500, int(token_budget))
+        if overlap_tokens is not None:
+            self.chunk_settings['overlap_tokens'] = max(0, int(overlap_tokens))
+        if max_workers is not None:
+            self.chunk_settings['max_workers'] = max(1, int(max_workers))
+    
+    def configure_batching(self, enabled: Optional[bool] = None, token_budget: Optional[int] = None,
+                           short_chapter_chars: Optional[int] = None, max_chapters: Optional[int] = None):
+        """Kısa bölüm paketleme ayarlarını güncelle."""
+        if enabled is not None:
+            self.batch_settings['enabled'] = bool(enabled)
+        if token_budget is not None:
+            self.batch_settings['token_budget'] = max(500, int(token_budget))
+        if short_chapter_chars is not None:
+            self.batch_settings['short_chapter_chars'] = max(100, int(short_chapter_chars))
+        if max_chapters is not None:
+            self.batch_settings['max_chapters'] = max(1, int(max_chapters))
+    
+    def configure_block_isolation(self, enabled: Optional[bool] = None, token_budget: Optional[int] = None):
+        """Engellenen pasaj ayıklama ayarlarını güncelle."""
+        if enabled is not None:
+            self.block_isolation_settings['enabled'] = bool(enabled)
+        if token_budget is not None:
+            self.block_isolation_settings['token_budget'] = max(0, int(token_budget))
+    
+    def configure_paragraph_protocol(self, enabled: bool):
+        """Paragraf kimlikli istem protokolünü aç/kapat."""
+        self.paragraph_id_protocol = bool(enabled)
     
     def reset_state(self):
         """Resets the editorial process to its initial state."""
@@ -90,9 +163,12 @@ class EditorialProcess:
         self.all_suggestions = {}
         self.editorial_log = []
         self.novel_context = ""
+        self.chapter_summaries = {}
+        self.novel_context_hashes = []
         print("EditorialProcess state has been reset.")
 
-    def analyze_text_snippet(self, text_snippet: str, ai_integration, analysis_type: str, novel_context: Optional[str] = None, full_novel_content: Optional[str] = None) -> List[EditorialSuggestion]:
+    def analyze_text_snippet(self, text_snippet: str, ai_integration, analysis_type: str, novel_context: Optional[str] = None, full_novel_content: Optional[str] = None,
+                             retrieved_context: Optional[str] = None, interactive: bool = False) -> List[EditorialSuggestion]:
         """Mevcut analiz yapısını kullanarak küçük bir metin parçasını analiz eder."""
         if not text_snippet or not text_snippet.strip():
             print("HATA: Analiz edilecek metin parçası boş.")
@@ -113,7 +189,9 @@ class EditorialProcess:
                 content=text_snippet, 
                 analysis_type=analysis_type,
                 novel_context=novel_context,
-                full_novel_content=full_novel_content
+                full_novel_content=full_novel_content,
+                retrieved_context=retrieved_context,
+                interactive=interactive
             )
             
             print(f"{phase_name} analizi tamamlandı: {len(ai_suggestions) if ai_suggestions else 0} öneri")
@@ -135,8 +213,18 @@ class EditorialProcess:
             print(f"Hata detayı: {traceback.format_exc()}")
             raise AIAnalysisError(f"Metin parçası analizi sırasında beklenmedik bir hata oluştu: {e}", error_type="system_error")
 
-    def analyze_chapter_single_phase(self, chapter: Chapter, ai_integration, analysis_type: str, novel_context: Optional[str] = None, full_novel_content: Optional[str] = None) -> List[EditorialSuggestion]:
-        """Tek faz analizi yap - sıralı editöryal süreç için (genel bağlam ile)"""
+    def analyze_chapter_single_phase(self, chapter: Chapter, ai_integration, analysis_type: str, novel_context: Optional[str] = None, full_novel_content: Optional[str] = None,
+                                     on_suggestion: Optional[Callable[[EditorialSuggestion], None]] = None,
+                                     cancel_token: Optional[CancelToken] = None,
+                                     retrieved_context: Optional[str] = None, interactive: bool = False) -> List[EditorialSuggestion]:
+        """Tek faz analizi yap - sıralı editöryal süreç için (genel bağlam ile)
+
+        `on_suggestion` verilirse akış sırasında tamamlanan her öneri EditorialSuggestion
+        nesnesine çevrilip hemen bu fonksiyona iletilir. `cancel_token` iptal edilirse
+        bölümün (ve tüm pencerelerinin) istekleri bırakılır. `retrieved_context` verilirse
+        tam metin yerine romandan seçilmiş pasajlar bağlam olarak gönderilir. `interactive`,
+        kullanıcının sonucu beklediği analizlerde yavaş isteklerin kopyalanmasına izin verir.
+        """
         if not chapter:
             print("HATA: Chapter objesi None")
             return []
@@ -164,13 +252,58 @@ class EditorialProcess:
             
             print(f"\n📝 === {phase_name.upper()} ANALİZİ BAŞLIYOR ===")
             
+            # Paragraf kimlikli protokolde bölüm [P<n>] etiketleriyle gönderilir; pencereler paragraf
+            # sınırlarında bölündüğü için etiketler pencerelerde de bölümdeki konumu gösterir.
+            paragraph_ids = self.paragraph_id_protocol
+            analysis_content = self.tag_paragraphs(chapter.content) if paragraph_ids else chapter.content
+            cleaned_paragraphs = ai_integration._clean_content_for_ai(chapter.content).split('\n') if paragraph_ids else None
+            source_paragraphs = chapter.content.split('\n') if paragraph_ids else None
+            
+            stream_callback = None
+            if on_suggestion:
+                def stream_callback(ai_suggestion: Dict):
+                    if paragraph_ids:
+                        resolved = self.resolve_paragraph_edits([dict(ai_suggestion)], cleaned_paragraphs, source_paragraphs)
+                    else:
+                        resolved = [ai_suggestion]
+                    for suggestion_obj in self.convert_to_editorial_suggestions(resolved):
+                        on_suggestion(suggestion_obj)
+            
+            context_content = full_novel_content if analysis_type in ["style_analysis", "content_review", "grammar_check"] else None
+            windows = self.split_into_windows(analysis_content)
+            # Engellenen pasajlar bölüme yazılır; kurtarma bütçesi bölümün tüm pencereleri için ortaktır
+            chapter.blocked_passages = []
+            isolation = {
+                'budget': self.block_isolation_settings['token_budget'],
+                'blocked': chapter.blocked_passages,
+                'lock': threading.Lock()
+            }
+            
             # AI analizi yap
-            ai_suggestions = ai_integration.analyze_chapter(
-                chapter.content, 
-                analysis_type, 
-                novel_context, 
-                full_novel_content if analysis_type in ["style_analysis", "content_review", "grammar_check"] else None
-            )
+            if len(windows) > 1:
+                print(f"📑 Bölüm uzun: {len(windows)} pencereye bölünerek analiz edilecek")
+                ai_suggestions = self._analyze_in_windows(
+                    windows, ai_integration, analysis_type, novel_context, context_content, stream_callback, cancel_token,
+                    retrieved_context, interactive, paragraph_ids, isolation
+                )
+            else:
+                ai_suggestions = self._analyze_isolating_blocks(
+                    analysis_content, 
+                    ai_integration,
+                    analysis_type, 
+                    novel_context, 
+                    context_content,
+                    on_suggestion=stream_callback,
+                    cancel_token=cancel_token,
+                    retrieved_context=retrieved_context,
+                    interactive=interactive,
+                    paragraph_ids=paragraph_ids,
+                    isolation=isolation
+                )
+            for passage in chapter.blocked_passages:
+                passage['paragraph'] = self._locate_paragraph(chapter.content, passage['text'])
+            if paragraph_ids and ai_suggestions:
+                ai_suggestions = self.resolve_paragraph_edits(ai_suggestions, cleaned_paragraphs, source_paragraphs)
             
             print(f"{phase_name} analizi tamamlandı: {len(ai_suggestions) if ai_suggestions else 0} öneri")
             
@@ -211,34 +344,460 @@ class EditorialProcess:
         
         return suggestions
     
-    def generate_novel_context(self, project, ai_integration) -> str:
+    def plan_chapter_batches(self, chapters: List[Chapter]) -> List[List[Chapter]]:
+        """Bölümleri sırası bozulmadan analiz birimlerine ayırır.
+
+        Paketleme kapalıysa her bölüm tek başına bir birimdir. Açıksa ardışık kısa bölümler
+        token bütçesi ve bölüm sayısı sınırına kadar aynı pakete konur; uzun bölümler (ve
+        pencerelere bölünecek olanlar) tek başına kalır.
         """
-        Tüm projeden genel bir bağlam (roman kimliği) oluşturur.
-        Bu, ana temaları, karakterleri, anlatıcı sesini vb. içerir.
+        if not self.batch_settings['enabled']:
+            return [[chapter] for chapter in chapters]
+        units: List[List[Chapter]] = []
+        current: List[Chapter] = []
+        current_tokens = 0
+        for chapter in chapters:
+            content = chapter.content or ""
+            tokens = RateLimiter.estimate_tokens(content)
+            if len(content) > self.batch_settings['short_chapter_chars']:
+                if current:
+                    units.append(current)
+                    current, current_tokens = [], 0
+                units.append([chapter])
+                continue
+            if current and (current_tokens + tokens > self.batch_settings['token_budget']
+                            or len(current) >= self.batch_settings['max_chapters']):
+                units.append(current)
+                current, current_tokens = [], 0
+            current.append(chapter)
+            current_tokens += tokens
+        if current:
+            units.append(current)
+        return units
+    
+    def analyze_chapter_batch(self, chapters: List[Chapter], ai_integration, analysis_type: str, novel_context: Optional[str] = None,
+                              full_novel_content: Optional[str] = None, cancel_token: Optional[CancelToken] = None,
+                              retrieved_context: Optional[str] = None) -> List[List[EditorialSuggestion]]:
+        """Kısa bölümleri tek istekte analiz eder; öneri listelerini bölüm sırasıyla döndürür."""
+        if len(chapters) == 1:
+            return [self.analyze_chapter_single_phase(chapters[0], ai_integration, analysis_type, novel_context, full_novel_content,
+                                                      cancel_token=cancel_token, retrieved_context=retrieved_context)]
+        
+        chapter_ids = [f"B{index + 1}" for index in range(len(chapters))]
+        print(f"PAKET ANALİZ BAŞLATILDI: Bölümler {', '.join(str(c.chapter_number) for c in chapters)}, Tür: {analysis_type}")
+        context_content = full_novel_content if analysis_type in ["style_analysis", "content_review", "grammar_check"] else None
+        try:
+            routed = ai_integration.analyze_chapter_batch(
+                [(chapter_id, chapter.content) for chapter_id, chapter in zip(chapter_ids, chapters)],
+                analysis_type, novel_context, context_content,
+                cancel_token=cancel_token, retrieved_context=retrieved_context
+            )
+        except AIAnalysisError:
+            raise
+        except Exception as e:
+            print(f"PAKET ANALİZ HATASI (Genel): {str(e)}")
+            raise AIAnalysisError(f"Analiz sırasında beklenmedik bir sistem hatası oluştu: {e}", error_type="system_error")
+        
+        results = []
+        for chapter_id, chapter in zip(chapter_ids, chapters):
+            suggestions = self.convert_to_editorial_suggestions(routed.get(chapter_id, []))
+            # Paket yanıt verdiyse hiçbir bölüm engellenmemiştir
+            chapter.blocked_passages = []
+            self.log_action(f"Bölüm {chapter.chapter_number} - {analysis_type} analizi (paket)",
+                            f"{len(suggestions)} öneri oluşturuldu")
+            results.append(suggestions)
+        return results
+    
+    def split_into_windows(self, content: str) -> List[str]:
+        """Bölümü paragraf sınırlarında, token bütçesine göre örtüşen pencerelere böler.
+
+        Bütçeyi aşmayan bölümler tek pencere olarak döner. Tek başına bütçeyi aşan bir
+        paragraf bölünmez, kendi penceresinde kalır.
         """
-        print("📚 Roman kimliği oluşturuluyor...")
-        
-        # Projedeki tüm bölümlerin içeriğini birleştir
-        full_text = ""
-        if hasattr(project, 'chapters') and project.chapters:
-            sorted_chapters = sorted(project.chapters, key=lambda c: c.chapter_number)
-            for chapter in sorted_chapters:
-                full_text += f"### Bölüm {chapter.chapter_number}\n\n{chapter.content}\n\n---\n\n"
-        
-        if not full_text.strip():
-            print("⚠️ Roman kimliği oluşturulamadı: Proje içeriği boş.")
-            self.novel_context = ""
-            return ""
-            
-        # AI'dan özet oluşturmasını iste
-        # Bu fonksiyonun ai_integration modülünde tanımlanması gerekecek
-        context = ai_integration.generate_summary(full_text, "novel_context")
+        token_budget = self.chunk_settings['token_budget']
+        if RateLimiter.estimate_tokens(content) <= token_budget:
+            return [content]
+        
+        overlap_tokens = self.chunk_settings['overlap_tokens']
+        paragraphs = content.split('\n')
+        windows = []
+        current = []
+        current_tokens = 0
+        
+        for paragraph in paragraphs:
+            paragraph_tokens = RateLimiter.estimate_tokens(paragraph)
+            if current and current_tokens + paragraph_tokens > token_budget:
+                windows.append('\n'.join(current))
+                # Önceki pencerenin son paragraflarını örtüşme olarak taşı
+                overlap = []
+                overlap_size = 0
+                for previous in reversed(current):
+                    previous_tokens = RateLimiter.estimate_tokens(previous)
+                    if overlap_size + previous_tokens > overlap_tokens:
+                        break
+                    overlap.insert(0, previous)
+                    overlap_size += previous_tokens
+                current = overlap
+                current_tokens = overlap_size
+            current.append(paragraph)
+            current_tokens += paragraph_tokens
+        
+        if current:
+            windows.append('\n'.join(current))
+        return [window for window in windows if window.strip()]
+    
+    def _analyze_in_windows(self, windows: List[str], ai_integration, analysis_type: str, novel_context: Optional[str],
+                            full_novel_content: Optional[str], on_suggestion: Optional[Callable[[Dict], None]] = None,
+                            cancel_token: Optional[CancelToken] = None, retrieved_context: Optional[str] = None,
+                            interactive: bool = False, paragraph_ids: bool = False,
+                            isolation: Optional[Dict] = None) -> List[Dict]:
+        """Pencereleri eşzamanlı analiz eder ve sonuçları pencere sırasıyla birleştirir."""
+        # Bir pencere başarısız olursa diğer pencerelerin istekleri de bırakılır
+        windows_token = CancelToken(parent=cancel_token)
+        streamed_sentences = set()
+        stream_lock = threading.Lock()
+        
+        def make_window_callback(window_index: int):
+            if not on_suggestion:
+                return None
+            def window_callback(ai_suggestion: Dict):
+                # Örtüşen bölgelerden gelen aynı öneriyi ikinci kez gösterme
+                key = self._suggestion_key(ai_suggestion)
+                with stream_lock:
+                    if key in streamed_sentences:
+                        return
+                    streamed_sentences.add(key)
+                ai_suggestion = dict(ai_suggestion)
+                ai_suggestion['id'] = f"{analysis_type}_w{window_index + 1}_{ai_suggestion.get('id', '')}"
+                on_suggestion(ai_suggestion)
+            return window_callback
+        
+        max_workers = min(self.chunk_settings['max_workers'], len(windows))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chapter-window") as executor:
+            futures = [
+                executor.submit(self._analyze_isolating_blocks, window, ai_integration, analysis_type, novel_context,
+                                full_novel_content, on_suggestion=make_window_callback(i), cancel_token=windows_token,
+                                retrieved_context=retrieved_context, interactive=interactive, paragraph_ids=paragraph_ids,
+                                isolation=isolation)
+                for i, window in enumerate(windows)
+            ]
+            # Bir pencere başarısız olursa tüm faz başarısız sayılır; başarılı pencereler
+            # yanıt önbelleğinde kaldığı için yeniden denemede tekrar ücretlendirilmez.
+            try:
+                window_results = [future.result() for future in futures]
+            except Exception:
+                windows_token.cancel("başka bir pencere başarısız oldu")
+                raise
+            finally:
+                windows_token.detach()
+        
+        return self._merge_window_suggestions(window_results, analysis_type)
+    
+    def _analyze_isolating_blocks(self, content: str, ai_integration, analysis_type: str, novel_context: Optional[str],
+                                  full_novel_content: Optional[str], on_suggestion: Optional[Callable[[Dict], None]] = None,
+                                  cancel_token: Optional[CancelToken] = None, retrieved_context: Optional[str] = None,
+                                  interactive: bool = False, paragraph_ids: bool = False,
+                                  isolation: Optional[Dict] = None) -> List[Dict]:
+        """`ai_integration.analyze_chapter` gibi çalışır; güvenlik engelinde engellenen pasajı ayıklar.
+
+        İstek `prompt_blocked` ile dönerse içerik paragraf sınırlarından ikiye bölünür ve her
+        yarı ayrı analiz edilir; engellenen yarı tek paragraf kalana kadar bölünmeye devam eder.
+        Böylece bölümün geri kalanı normal şekilde analiz edilir, engellenen en küçük paragraf
+        aralıkları `isolation['blocked']` listesine yazılır. Kurtarma istekleri bağlam olarak
+        yalnızca roman özetini taşır (tam metin ve seçilmiş pasajlar engellenen metni içerebilir)
+        ve `isolation['budget']` token bütçesinden düşülür; bütçe biterse denenemeyen aralık
+        doğrulanmamış olarak bildirilir.
+        """
+        try:
+            return ai_integration.analyze_chapter(
+                content, analysis_type, novel_context, full_novel_content,
+                on_suggestion=on_suggestion, cancel_token=cancel_token, retrieved_context=retrieved_context,
+                interactive=interactive, paragraph_ids=paragraph_ids
+            )
+        except AIAnalysisError as e:
+            if e.error_type != "prompt_blocked" or isolation is None or not self.block_isolation_settings['enabled']:
+                raise
+        print(f"🛡️ İçerik güvenlik filtresine takıldı; engellenen pasaj ikiye bölünerek aranacak "
+              f"(bütçe ~{isolation['budget']} token)")
+        context_tokens = RateLimiter.estimate_tokens(novel_context or "")
+        
+        def analyze_range(lines: List[str]) -> List[Dict]:
+            paragraphs = [index for index, line in enumerate(lines) if line.strip()]
+            if len(paragraphs) <= 1:
+                self._record_blocked_passage(isolation, lines, verified=True)
+                return []
+            middle = paragraphs[len(paragraphs) // 2]
+            results = []
+            for part in (lines[:middle], lines[middle:]):
+                text = '\n'.join(part)
+                if not text.strip():
+                    continue
+                cost = RateLimiter.estimate_tokens(text) + context_tokens
+                with isolation['lock']:
+                    affordable = isolation['budget'] >= cost
+                    if affordable:
+                        isolation['budget'] -= cost
+                if not affordable:
+                    print("⚠️ Kurtarma bütçesi doldu, kalan aralık denenmeden engellendi sayıldı")
+                    self._record_blocked_passage(isolation, part, verified=False)
+                    continue
+                try:
+                    results.extend(ai_integration.analyze_chapter(
+                        text, analysis_type, novel_context, None,
+                        on_suggestion=on_suggestion, cancel_token=cancel_token,
+                        interactive=interactive, paragraph_ids=paragraph_ids
+                    ))
+                except AIAnalysisError as e:
+                    if e.error_type != "prompt_blocked":
+                        raise
+                    results.extend(analyze_range(part))
+            return results
         
-        self.novel_context = context
-        print(f"✅ Roman kimliği oluşturuldu ve kaydedildi. Uzunluk: {len(context)} karakter.")
-        self.log_action("Roman kimliği oluşturuldu", f"Uzunluk: {len(context)}")
-        return context
+        return analyze_range(content.split('\n'))
     
+    @classmethod
+    def _record_blocked_passage(cls, isolation: Dict, lines: List[str], verified: bool):
+        text = '\n'.join(cls.PARAGRAPH_TAG_PATTERN.sub('', line) for line in lines).strip()
+        if not text:
+            return
+        with isolation['lock']:
+            # Örtüşen pencereler aynı pasajı iki kez bulabilir
+            if any(passage['text'] == text for passage in isolation['blocked']):
+                return
+            isolation['blocked'].append({'text': text, 'verified': verified})
+        state = "engellendi" if verified else "denenemedi"
+        print(f"🛡️ Pasaj {state} ({len(text)} karakter): '{text[:60]}...'")
+    
+    @staticmethod
+    def _locate_paragraph(content: str, passage: str) -> Optional[int]:
+        """Pasajın ilk satırının bölümdeki paragraf (satır) numarası."""
+        first_line = passage.split('\n', 1)[0].strip()
+        for index, line in enumerate(content.split('\n'), 1):
+            if first_line and first_line in line:
+                return index
+        return None
+    
+    @staticmethod
+    def _normalize_sentence(text: str) -> str:
+        return ' '.join((text or '').split()).casefold()
+    
+    @classmethod
+    def _suggestion_key(cls, suggestion: Dict):
+        """Tekrar kontrolü anahtarı; paragraf kimlikli önerilerde kısa parça paragrafla birlikte ayırt edilir."""
+        return (suggestion.get('paragraph_id', ''), cls._normalize_sentence(suggestion.get('original_sentence', '')))
+    
+    @staticmethod
+    def tag_paragraphs(content: str) -> str:
+        """Boş olmayan her satırın başına bölümdeki sırasına göre [P<n>] kimliği ekler."""
+        return '\n'.join(
+            f"[P{index}] {line}" if line.strip() else line
+            for index, line in enumerate(content.split('\n'), 1)
+        )
+    
+    @staticmethod
+    def _paragraph_fingerprint(paragraph: str) -> str:
+        """Paragrafın analiz anındaki metnini tanımlayan kısa özet (uygulamada paragraf değişmiş mi?)."""
+        return hashlib.sha1(paragraph.strip().encode('utf-8')).hexdigest()[:16]
+    
+    @staticmethod
+    def _sentence_bounds(text: str, start: int, end: int):
+        """`text[start:end]` parçasını içeren cümlenin sınırları."""
+        sentence_start = max(text.rfind(mark, 0, start) for mark in ('. ', '! ', '? ', '… '))
+        sentence_start = 0 if sentence_start == -1 else sentence_start + 2
+        ends = [position for position in (text.find(mark, end) for mark in '.!?…') if position != -1]
+        sentence_end = min(ends) + 1 if ends else len(text)
+        return sentence_start, sentence_end
+    
+    def resolve_paragraph_edits(self, ai_suggestions: List[Dict], cleaned_paragraphs: List[str],
+                                source_paragraphs: List[str]) -> List[Dict]:
+        """Paragraf kimlikli önerileri bölüm metnine bağlar.
+
+        Parça, paragrafın YZ'ye gönderilen (etiketleri temizlenmiş) metninde önce bildirilen
+        aralıkta, tutmazsa aralığa en yakın geçtiği yerde aranır. Parçayı içeren cümle
+        `original_sentence`, parçası değiştirilmiş hali `suggested_sentence` olur; böylece kartlar
+        ve geçmiş kayıtları tam cümleyi gösterir. Konum, bölümdeki paragrafın (`source_paragraphs`)
+        parmak iziyle birlikte `paragraph_edit` alanına yazılır ve uygulama sırasında paragraf
+        değişmemişse metin yeniden aranmadan kullanılır. Paragrafta bulunamayan öneri atlanır.
+        """
+        resolved = []
+        for suggestion in ai_suggestions:
+            paragraph_id = str(suggestion.get('paragraph_id') or '')
+            if not paragraph_id:
+                resolved.append(suggestion)
+                continue
+            try:
+                index = int(paragraph_id.strip('[]').lstrip('Pp')) - 1
+                paragraph = cleaned_paragraphs[index]
+            except (ValueError, IndexError):
+                print(f"⚠️ Geçersiz paragraf kimliği, öneri atlandı: {paragraph_id}")
+                continue
+            span = suggestion['original_sentence']
+            replacement = suggestion['suggested_sentence']
+            start = suggestion.get('span_start')
+            if not (isinstance(start, int) and paragraph[start:start + len(span)] == span):
+                positions = [i for i in range(len(paragraph)) if paragraph.startswith(span, i)]
+                if not positions:
+                    print(f"⚠️ Öneri parçası {paragraph_id} paragrafında bulunamadı, atlandı: '{span[:40]}'")
+                    continue
+                start = min(positions, key=lambda i: abs(i - (start if isinstance(start, int) else 0)))
+            end = start + len(span)
+            sentence_start, sentence_end = self._sentence_bounds(paragraph, start, end)
+            original_sentence = paragraph[sentence_start:sentence_end].strip()
+            suggested_sentence = (paragraph[sentence_start:start] + replacement + paragraph[end:sentence_end]).strip()
+            suggestion.update(
+                original_sentence=original_sentence,
+                suggested_sentence=suggested_sentence,
+                suggested_fix=suggested_sentence,
+                location=f"{paragraph_id}: {original_sentence[:30]}...",
+                description=f"Orijinal: {original_sentence}\n\nÖnerilen: {suggested_sentence}\n\nAçıklama: {suggestion.get('explanation', '')}",
+                paragraph_edit={"index": index, "start": start, "end": end, "original": span, "replacement": replacement,
+                                "fingerprint": self._paragraph_fingerprint(source_paragraphs[index])},
+            )
+            for key in ('paragraph_id', 'span_start', 'span_end'):
+                suggestion.pop(key, None)
+            resolved.append(suggestion)
+        return resolved
+    
+    def _merge_window_suggestions(self, window_results: List[List[Dict]], analysis_type: str) -> List[Dict]:
+        """Pencere sonuçlarını birleştirir, örtüşmeden gelen tekrarları atar ve numaraları yeniler."""
+        merged = []
+        seen_sentences = set()
+        duplicates = 0
+        for suggestions in window_results:
+            for suggestion in suggestions or []:
+                key = self._suggestion_key(suggestion)
+                if key in seen_sentences:
+                    duplicates += 1
+                    continue
+                seen_sentences.add(key)
+                merged.append(suggestion)
+        
+        for number, suggestion in enumerate(merged, 1):
+            suggestion['id'] = f"{analysis_type}_{number}"
+            suggestion['title'] = f"{number}. Öneri"
+        
+        print(f"📑 Pencere sonuçları birleştirildi: {len(merged)} öneri ({duplicates} tekrar atıldı)")
+        return merged
+    
+    def generate_novel_context(self, project, ai_integration, cancel_token=None) -> str:
+        """
+        Tüm projeden genel bir bağlam (roman kimliği) oluşturur.
+        Bu, ana temaları, karakterleri, anlatıcı sesini vb. içerir.
+
+        Önce her bölüm ayrı ayrı (eşzamanlı) özetlenir, ardından özetler tek bir roman
+        kimliğinde birleştirilir. Bölüm özetleri içerik özetine göre saklandığından yalnızca
+        değişen bölümler yeniden özetlenir; hiçbir bölüm değişmediyse mevcut kimlik döner.
+        Aynı anda tek bir oluşturma çalışır, diğer çağıranlar onun bitmesini bekler.
+        `cancel_token` iptal edilirse bekleyen özet istekleri bırakılır ve mevcut kimlik döner.
+        """
+        with self._novel_context_lock:
+            chapters = []
+            if hasattr(project, 'chapters') and project.chapters:
+                chapters = [c for c in sorted(project.chapters, key=lambda c: c.chapter_number)
+                            if c.content and c.content.strip()]
+
+            if not chapters:
+                print("⚠️ Roman kimliği oluşturulamadı: Proje içeriği boş.")
+                self.novel_context = ""
+                return ""
+
+            hashes = [chapter.content_hash() for chapter in chapters]
+            if self.novel_context and hashes == self.novel_context_hashes:
+                print("📚 Roman kimliği güncel, yeniden oluşturulmadı.")
+                return self.novel_context
+
+            print("📚 Roman kimliği oluşturuluyor...")
+            summaries = self._summarize_chapters(chapters, hashes, ai_integration, cancel_token)
+            if not summaries:
+                print("⚠️ Roman kimliği oluşturulamadı: Bölüm özetleri alınamadı.")
+                return self.novel_context
+
+            context = self._reduce_summaries(summaries, ai_integration, cancel_token)
+            if not context:
+                print("⚠️ Roman kimliği oluşturulamadı: Özetler birleştirilemedi.")
+                return self.novel_context
+
+            self.novel_context = context
+            # Özeti alınamayan bölüm varsa bir sonraki çağrıda yeniden denenir
+            self.novel_context_hashes = hashes if len(summaries) == len(chapters) else []
+            print(f"✅ Roman kimliği oluşturuldu ve kaydedildi. Uzunluk: {len(context)} karakter.")
+            self.log_action("Roman kimliği oluşturuldu", f"Uzunluk: {len(context)}, {len(summaries)}/{len(chapters)} bölüm özeti")
+            return context
+
+    def is_novel_context_stale(self, project) -> bool:
+        """Roman kimliği yoksa ya da üretildiğinden beri bölümler değiştiyse True döndürür."""
+        chapters = sorted(getattr(project, 'chapters', None) or [], key=lambda c: c.chapter_number)
+        hashes = [c.content_hash() for c in chapters if c.content and c.content.strip()]
+        return bool(hashes) and (not self.novel_context or hashes != self.novel_context_hashes)
+
+    def _summarize_chapters(self, chapters: List[Chapter], hashes: List[str], ai_integration, cancel_token=None) -> List[str]:
+        """Bölüm özetlerini (önbellekte olmayanları eşzamanlı üreterek) roman sırasıyla döndürür."""
+        missing = [(chapter, content_hash) for chapter, content_hash in zip(chapters, hashes)
+                   if content_hash not in self.chapter_summaries]
+        if missing:
+            print(f"📝 {len(missing)}/{len(chapters)} bölüm özetlenecek ({len(chapters) - len(missing)} bölüm önbellekte)")
+
+            def summarize(chapter: Chapter) -> str:
+                text = f"### Bölüm {chapter.chapter_number}: {chapter.title}\n\n{chapter.content}"
+                return ai_integration.generate_summary(text, "chapter_summary", model_type="novel_context",
+                                                       cancel_token=cancel_token)
+
+            max_workers = min(self.summary_settings['max_workers'], len(missing))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chapter-summary") as executor:
+                results = list(executor.map(lambda item: summarize(item[0]), missing))
+            for (chapter, content_hash), summary in zip(missing, results):
+                if summary:
+                    self.chapter_summaries[content_hash] = summary
+                else:
+                    print(f"⚠️ Bölüm {chapter.chapter_number} özetlenemedi")
+
+        # Artık hiçbir bölüme ait olmayan eski özetleri at
+        current = set(hashes)
+        self.chapter_summaries = {h: text for h, text in self.chapter_summaries.items() if h in current}
+
+        return [
+            f"### Bölüm {chapter.chapter_number}: {chapter.title}\n{self.chapter_summaries[content_hash]}"
+            for chapter, content_hash in zip(chapters, hashes)
+            if content_hash in self.chapter_summaries
+        ]
+
+    def _reduce_summaries(self, summaries: List[str], ai_integration, cancel_token=None) -> str:
+        """Bölüm özetlerini roman kimliğine indirger.
+
+        Özetler tek isteğe sığmıyorsa önce ardışık gruplar halinde ara özetlere indirgenir.
+        """
+        budget = self.summary_settings['reduce_token_budget']
+        level = 1
+        while len(summaries) > 1 and RateLimiter.estimate_tokens("\n\n".join(summaries)) > budget:
+            groups = []
+            current: List[str] = []
+            current_tokens = 0
+            for summary in summaries:
+                summary_tokens = RateLimiter.estimate_tokens(summary)
+                if current and current_tokens + summary_tokens > budget:
+                    groups.append(current)
+                    current, current_tokens = [], 0
+                current.append(summary)
+                current_tokens += summary_tokens
+            if current:
+                groups.append(current)
+            if len(groups) == len(summaries):
+                break  # Her özet tek başına bütçeyi aşıyor; daha fazla indirgenemez
+            print(f"🧩 Özetler {len(summaries)} parçadan {len(groups)} ara özete indirgeniyor (seviye {level})")
+            max_workers = min(self.summary_settings['max_workers'], len(groups))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chapter-summary") as executor:
+                reduced = list(executor.map(
+                    lambda group: ai_integration.generate_summary("\n\n".join(group), "chapter_summary", model_type="novel_context",
+                                                                  cancel_token=cancel_token),
+                    groups
+                ))
+            if not all(reduced):
+                return ""
+            summaries = reduced
+            level += 1
+
+        return ai_integration.generate_summary("\n\n".join(summaries), "novel_context", cancel_token=cancel_token)
+
     def convert_to_editorial_suggestions(self, ai_suggestions: List[Dict]) -> List[EditorialSuggestion]:
         """AI önerilerini (dict listesi) EditorialSuggestion nesnelerine çevirir ve geçersiz olanları filtreler."""
         editorial_suggestions = []
@@ -321,8 +880,11 @@ class EditorialProcess:
                 hasattr(suggestion, 'suggested_sentence') and 
                 suggestion.original_sentence and suggestion.suggested_sentence):
                 
-                self.apply_text_change(chapter, suggestion.original_sentence, 
-                                      suggestion.suggested_sentence)
+                if getattr(suggestion, 'paragraph_edit', None):
+                    self.apply_paragraph_edit(chapter, suggestion)
+                else:
+                    self.apply_text_change(chapter, suggestion.original_sentence, 
+                                          suggestion.suggested_sentence)
         
         return suggestion.status
     
@@ -376,6 +938,50 @@ class EditorialProcess:
             print(f"Hata detayı: {traceback.format_exc()}")
             return False
     
+    def apply_paragraph_edit(self, chapter, suggestion: EditorialSuggestion) -> bool:
+        """Paragraf kimlikli öneriyi kaydedilen konumuna uygular; metin aranmaz.
+
+        Paragraf (satır) indeksle alınır ve analiz anındaki parmak iziyle karşılaştırılır; aynı
+        paragrafa daha önce uygulanan paragraf kimlikli öneriler `chapter.paragraph_revisions`
+        üzerinden tanınır. Bölüme satır eklenip silindiyse paragraf parmak iziyle yeniden bulunur.
+        Aralık hâlâ aynı parçayı gösteriyorsa doğrudan değiştirilir; paragraf biçimlendirme
+        etiketi içeriyorsa ya da aynı paragrafa önce başka bir öneri uygulandıysa parça yalnızca
+        o paragrafta, eski konuma en yakın yerde aranır. Paragraf analizden sonra başka türlü
+        değiştiyse ya da bulunamazsa cümle tabanlı yönteme dönülür; böylece kısa parça başka bir
+        paragrafta değiştirilmez.
+        """
+        import datetime
+        edit = suggestion.paragraph_edit
+        lines = chapter.content.split('\n')
+        index, start, end = edit.get('index', -1), edit.get('start', 0), edit.get('end', 0)
+        span, replacement = edit.get('original', ''), edit.get('replacement', '')
+        fingerprint = edit.get('fingerprint')
+        revisions = getattr(chapter, 'paragraph_revisions', {})
+        
+        def analysed_fingerprint(line: str) -> str:
+            current = self._paragraph_fingerprint(line)
+            return revisions.get(current, current)
+        
+        if not (0 <= index < len(lines) and fingerprint and analysed_fingerprint(lines[index]) == fingerprint):
+            matches = [i for i, line in enumerate(lines) if fingerprint and analysed_fingerprint(line) == fingerprint]
+            index = matches[0] if len(matches) == 1 else -1
+        if 0 <= index < len(lines) and span:
+            line = lines[index]
+            if line[start:end] != span:
+                positions = [i for i in range(len(line)) if line.startswith(span, i)]
+                start = min(positions, key=lambda i: abs(i - start)) if positions else -1
+                end = start + len(span)
+            if start >= 0:
+                lines[index] = line[:start] + replacement + line[end:]
+                chapter.content = '\n'.join(lines)
+                if hasattr(chapter, 'paragraph_revisions'):
+                    chapter.paragraph_revisions[self._paragraph_fingerprint(lines[index])] = fingerprint
+                chapter.last_modified = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                print(f"✅ PARAGRAF KONUMUYLA DEĞİŞTİRİLDİ (P{index + 1}, {start}-{end})")
+                return True
+        print(f"⚠️ Paragraf analizden sonra değişmiş ya da bulunamadı (P{edit.get('index', -1) + 1}), cümle eşleştirmesi deneniyor")
+        return self.apply_text_change(chapter, suggestion.original_sentence, suggestion.suggested_sentence)
+    
     def _strip_formatting_markers(self, text: str) -> str:
         """Metindeki biçimlendirme etiketlerini (*B*, *I*, *U*) temizler."""
         import re
@@ -505,7 +1111,9 @@ class EditorialProcess:
             },
             'editorial_log': self.editorial_log,
             'workflow_settings': self.workflow_settings,
-            'novel_context': self.novel_context
+            'novel_context': self.novel_context,
+            'chapter_summaries': self.chapter_summaries,
+            'novel_context_hashes': self.novel_context_hashes
         }
     
     def load_state(self, state: Dict):
@@ -515,6 +1123,8 @@ class EditorialProcess:
         self.editorial_log = state.get('editorial_log', [])
         self.workflow_settings = state.get('workflow_settings', self.workflow_settings)
         self.novel_context = state.get('novel_context', '') # Kayıtlı roman kimliğini yükle
+        self.chapter_summaries = state.get('chapter_summaries', {})
+        self.novel_context_hashes = state.get('novel_context_hashes', [])
         
         # Önerileri yükle
         suggestions_data = state.get('all_suggestions', {})
@@ -1,6 +1,7 @@
 import os
 import re
 import json
+import hashlib
 from typing import List, Dict, Optional, Callable
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -24,6 +25,12 @@ class Chapter:
         # YENİ: Beklemede olan öneriler için
         self.pending_suggestions = []  # Henüz işlem görmemiş öneriler
         
+        # Son analizde güvenlik filtresine takılan pasajlar (kaydedilmez)
+        self.blocked_passages = []
+        
+        # Paragraf kimlikli öneri uygulanan paragrafların yeni parmak izi -> analizdeki parmak izi (kaydedilmez)
+        self.paragraph_revisions = {}
+        
         # SIRALI ANALİZ DURUMU TAKİBİ - Her bölüm için hangi fazın tamamlandığını takip eder
         self.analysis_phases = {
             "grammar_completed": False,    # Dil Bilgisi fazı tamamlandı mı?
@@ -32,6 +39,10 @@ class Chapter:
             "current_phase": "none"        # Mevcut faz: none, grammar, style, content, completed
         }
     
+    def content_hash(self) -> str:
+        """Bölüm içeriğinin özeti; içerik değiştiğinde önceden hazırlanmış sonuçları geçersiz kılmak için."""
+        return hashlib.sha256((self.content or "").encode("utf-8")).hexdigest()
+    
     def to_dict(self):
         # Suggestions listesini dict olarak serialize et
         suggestions_dict = []
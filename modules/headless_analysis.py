@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+from .ai_integration import AIIntegration, AIAnalysisError
+from .context_retrieval import ContextRetriever
+from .editorial_process import EditorialProcess
+from .file_manager import Chapter, FileManager
+from .request_worker import CancelToken
+from .settings_manager import DEFAULT_INDIVIDUAL_MODELS, SettingsManager
+
+
+class HeadlessAnalyzer:
+    """Tk arayüzü olmadan bölüm × faz analizi.
+
+    Masaüstü uygulamasının `EditorialApp` ve `AnalysisManager` üzerinden yaptığı hazırlığı
+    (model kurulumu, pencereleme/paketleme ayarları, bağlam kaynağı) aynı ayarlarla yapar ve
+    her işi `EditorialProcess.analyze_chapter_single_phase` ile çalıştırır. Komut satırı
+    toplu analizi ve iş sunucusu bu sınıfı kullanır; Tk penceresi açılmaz.
+    """
+
+    PHASES = {
+        "grammar_check": "Dil Bilgisi",
+        "style_analysis": "Üslup",
+        "content_review": "İçerik",
+    }
+    def __init__(self, settings_manager: Optional[SettingsManager] = None):
+        self.settings_manager = settings_manager or SettingsManager()
+        self.ai_integration = AIIntegration(self.settings_manager)
+        self.editorial_process = EditorialProcess()
+        self.context_retriever = ContextRetriever()
+        # Roman başına hazırlanan bağlam: aynı romanın işleri bağlamı tekrar oluşturmaz
+        self._contexts = weakref.WeakKeyDictionary()
+        self._contexts_lock = threading.Lock()
+        self.apply_settings()
+
+    def initialize_ai(self) -> bool:
+        """Ayarlardaki API anahtarı ve modellerle AI entegrasyonunu başlatır."""
+        api_key = self.settings_manager.get_setting("api_key", "")
+        default_model = self.settings_manager.get_setting("model", "gemini-1.5-flash")
+        individual_models = {**DEFAULT_INDIVIDUAL_MODELS, **self.settings_manager.get_setting("individual_models", {})}
+        if not api_key and self.ai_integration.backend.requires_api_key:
+            print("HATA: API anahtarı ayarlanmamış (settings.json > api_key)")
+            return False
+        self.ai_integration.update_settings(api_key, default_model, individual_models)
+        return self.ai_integration.model is not None
+
+    def apply_settings(self):
+        """Pencereleme, paketleme, pasaj ayıklama ve paragraf protokolü ayarlarını uygular."""
+        get = self.settings_manager.get_setting
+        self.editorial_process.configure_chunking(
+            get("chunk_token_budget", 6000), get("chunk_overlap_tokens", 200), get("chunk_max_workers", 3))
+        self.editorial_process.configure_batching(
+            get("batch_packing_enabled", False), get("batch_token_budget", 6000), get("batch_short_chapter_chars", 3000))
+        self.editorial_process.configure_block_isolation(
+            get("block_isolation_enabled", True), get("block_isolation_token_budget", 20000))
+        self.editorial_process.configure_paragraph_protocol(get("paragraph_id_protocol", False))
+
+    @staticmethod
+    def load_chapters(file_path: str, split_method: str = "number_only",
+                      custom_word: Optional[str] = None) -> Tuple[FileManager, List[Chapter]]:
+        """`.txt`/`.docx` romanı yükler ve bölümlere ayırır."""
+        file_manager = FileManager()
+        if not file_manager.load_novel(file_path):
+            raise ValueError(f"Dosya yüklenemedi: {file_path}")
+        chapters = file_manager.split_into_chapters(file_manager.original_content, split_method, custom_word)
+        return file_manager, chapters
+
+    def load_project(self, project_id: str) -> Tuple[FileManager, List[Chapter]]:
+        """Kayıtlı projenin (projeler dizinindeki klasör adı) bölümlerini yükler.
+
+        `SettingsManager.load_project_state` son proje ayarını değiştirdiği için proje
+        dosyası doğrudan okunur; masaüstü uygulamasının ayarlarına dokunulmaz.
+        """
+        projects_dir = os.path.realpath(self.settings_manager.projects_dir)
+        project_file = os.path.realpath(os.path.join(projects_dir, project_id, "project.json"))
+        if os.path.dirname(os.path.dirname(project_file)) != projects_dir or not os.path.isfile(project_file):
+            raise ValueError(f"Proje bulunamadı: {project_id}")
+        with open(project_file, "r", encoding="utf-8") as file:
+            state = json.load(file)
+        file_manager = FileManager().load_state(state.get("file_manager_state", {}))
+        return file_manager, file_manager.chapters
+
+    def resolve_context(self, file_manager: FileManager, analysis_type: str) -> Tuple[Optional[str], Optional[str]]:
+        """Ayarlardaki bağlam kaynağına göre (roman kimliği, tam metin) çiftini döndürür.
+
+        Sonuç roman ve analiz türü başına saklanır. "İlgili Pasajlar" bölüme göre seçildiği
+        için `retrieved_context` ile ayrıca alınır.
+        """
+        with self._contexts_lock:
+            cached = self._contexts.get(file_manager, {}).get(analysis_type)
+        if cached is not None:
+            return cached
+        context = self._build_context(file_manager, analysis_type)
+        with self._contexts_lock:
+            self._contexts.setdefault(file_manager, {})[analysis_type] = context
+        return context
+
+    def _build_context(self, file_manager: FileManager, analysis_type: str) -> Tuple[Optional[str], Optional[str]]:
+        context_source = self.settings_manager.get_setting(f"{analysis_type}_context_source", "none")
+        if context_source == "novel_context":
+            # Aynı anda gelen işler tek oluşturmayı bekler; değişmeyen bölümler yeniden özetlenmez
+            novel_context = self.editorial_process.generate_novel_context(file_manager, self.ai_integration)
+            return novel_context or None, None
+        if context_source == "full_text":
+            full_text = "".join(
+                f"### Bölüm {chapter.chapter_number}\n\n{chapter.content}\n\n---\n\n"
+                for chapter in sorted(file_manager.chapters, key=lambda c: c.chapter_number)
+            )
+            return None, full_text
+        return None, None
+
+    def retrieved_context(self, file_manager: FileManager, chapter: Chapter, analysis_type: str) -> Optional[str]:
+        """Bağlam kaynağı "retrieval" ise bölüm için seçilmiş pasajlar, değilse None."""
+        if self.settings_manager.get_setting(f"{analysis_type}_context_source", "none") != "retrieval":
+            return None
+        try:
+            chapter_index = file_manager.chapters.index(chapter)
+        except ValueError:
+            return None
+        return self.context_retriever.select_context(
+            file_manager.chapters, chapter_index,
+            token_budget=self.settings_manager.get_setting("retrieval_token_budget", 8000),
+            top_k=self.settings_manager.get_setting("retrieval_top_k", 8)
+        ) or None
+
+    def analyze(self, file_manager: FileManager, chapter: Chapter, analysis_type: str,
+                cancel_token: Optional[CancelToken] = None) -> Dict[str, Any]:
+        """Tek bir bölüm × faz işini çalıştırır; öneri, engellenen pasaj ve süreleri içeren kayıt döndürür.
+
+        Hatalar fırlatılmaz, kayda `status: "error"` ile yazılır. Aynı bölümün fazları eşzamanlı
+        çalışabildiği için analiz bölümün bir kopyası üzerinde yapılır.
+        """
+        record: Dict[str, Any] = {
+            "chapter_number": chapter.chapter_number,
+            "chapter_title": chapter.title,
+            "analysis_type": analysis_type,
+            "phase": self.PHASES.get(analysis_type, analysis_type),
+            "status": "ok",
+            "suggestions": [],
+            "blocked_passages": [],
+        }
+        started = time.time()
+        work_chapter = Chapter(chapter.title, chapter.content, chapter.chapter_number)
+        try:
+            novel_context, full_novel_content = self.resolve_context(file_manager, analysis_type)
+            context_ready = time.time()
+            suggestions = self.editorial_process.analyze_chapter_single_phase(
+                work_chapter, self.ai_integration, analysis_type, novel_context, full_novel_content,
+                cancel_token=cancel_token,
+                retrieved_context=self.retrieved_context(file_manager, chapter, analysis_type)
+            )
+            record["suggestions"] = [suggestion.to_dict() for suggestion in suggestions]
+            record["blocked_passages"] = work_chapter.blocked_passages
+            record["timings"] = {"context_seconds": round(context_ready - started, 3),
+                                 "analysis_seconds": round(time.time() - context_ready, 3)}
+        except AIAnalysisError as e:
+            record.update(status="error", error_type=e.error_type, error=str(e))
+        except Exception as e:
+            record.update(status="error", error_type="system_error", error=str(e))
+        record.setdefault("timings", {})["total_seconds"] = round(time.time() - started, 3)
+        record["suggestion_count"] = len(record["suggestions"])
+        return record
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hız sınırlayıcı, istek havuzu ve arka uç sayaçları."""
+        stats: Dict[str, Any] = {
+            "request_worker": self.ai_integration.request_worker.get_stats(),
+            "rate_limit_wait_seconds": round(self.ai_integration.rate_limiter.get_wait_time(), 2),
+            "backend": self.ai_integration.backend.name,
+        }
+        backend_stats = getattr(self.ai_integration.backend, "get_stats", None)
+        if backend_stats:
+            stats["backend_stats"] = backend_stats()
+        return stats
@@ -0,0 +1,89 @@
+import json
+from typing import Dict, List
+
+
+class IncrementalJSONArrayParser:
+    """Parça parça gelen bir JSON dizisinden tamamlanan nesneleri anında çıkarır.
+
+    Akış (streaming) yanıtlarında model `[ {...}, {...} ]` biçiminde yanıt verir. Her
+    `feed` çağrısında yeni gelen metin taranır ve üst düzey dizide kapanan her nesne
+    `json.loads` ile çözülüp döndürülür. Dizinin öncesindeki açıklama metni ve kod bloğu
+    işaretleri (```json) yok sayılır. Çözülemeyen nesneler atlanır ve `failed_objects`
+    sayacına eklenir; bunlar yanıtın tamamı geldiğinde normal ayrıştırıcı ile kurtarılır.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0             # Taranmış son karakterin bir sonrası
+        self._depth = 0           # 0: dizi dışında, 1: üst düzey dizinin içinde
+        self._in_string = False
+        self._escape = False
+        self._object_start = -1
+        self.finished = False
+        self.emitted_objects = 0
+        self.failed_objects = 0
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Yeni metin parçasını işler ve bu parçayla tamamlanan nesneleri döndürür."""
+        if self.finished or not chunk:
+            return []
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        i = self._pos
+        length = len(buffer)
+
+        while i < length:
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if char == '[':
+                    self._depth = 1
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if self._depth == 1 and char == '{':
+                    self._object_start = i
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1 and char == '}' and self._object_start != -1:
+                    obj = self._decode(buffer[self._object_start:i + 1])
+                    if obj is not None:
+                        completed.append(obj)
+                    self._object_start = -1
+                elif self._depth == 0:
+                    if not self.emitted_objects and not self.failed_objects:
+                        # Açıklama metnindeki "[...]" gibi bir parantezdi; asıl diziyi beklemeye devam et
+                        i += 1
+                        continue
+                    # Üst düzey dizi kapandı; sonrasında gelenler önemsiz
+                    self.finished = True
+                    i += 1
+                    break
+            i += 1
+
+        # Tamamlanmış kısmı tampondan at; yarım nesne varsa başından itibaren tut
+        keep_from = self._object_start if self._object_start != -1 else i
+        self._buffer = buffer[keep_from:]
+        self._pos = i - keep_from
+        if self._object_start != -1:
+            self._object_start = 0
+        return completed
+
+    def _decode(self, text: str):
+        try:
+            obj = json.loads(text, strict=False)  # strict=False: metin içindeki kontrol karakterlerine izin ver
+        except json.JSONDecodeError:
+            self.failed_objects += 1
+            return None
+        if not isinstance(obj, dict):
+            return None
+        self.emitted_objects += 1
+        return obj
@@ -0,0 +1,235 @@
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+# Dizinin başlangıcı: "[" ve ardından bir nesne ya da dizinin kapanışı
+_ARRAY_START = re.compile(r'\[\s*[{\]]')
+# Nesneler arasında aranan karakterler
+_OBJECT_OR_END = re.compile(r'[{\]]')
+# Eski temizleyicinin attığı karakterler (kontrol karakterleri, sıfır genişlikli boşluklar, BOM, kart sembolleri)
+_JUNK_CHARS = '\u0000-\u0008\u000B\u000C\u000E-\u001F\u007F-\u009F\u00A0\u2000-\u200F\u2028-\u202F\u2060-\u206F\uFEFF\u2660\u2663\u2665\u2666'
+# String içinde ilgilenilen karakterler: tırnak, ters bölü ve kontrol/sorunlu karakterler
+_STRING_SPECIAL = re.compile('["\\\\\\n\\r\\t' + _JUNK_CHARS + ']')
+# Bir tırnağın string'i kapattığını gösteren devam: }, ], :, sonraki alan ya da metin sonu
+_CLOSING_LOOKAHEAD = r'\s*(?:[}\]:]|,\s*["{}\]]|\Z)'
+_CLOSING_QUOTE = re.compile(_CLOSING_LOOKAHEAD)
+# Sorunsuz kısım: yapı karakteri olmayan metin ve düzgün kaçışlı, düzgün kapanan string'ler.
+# Bu kısımlar tek bir regex eşleşmesiyle olduğu gibi kopyalanır; Python döngüsü yalnızca
+# parantezlerde ve onarım gereken string'lerde çalışır.
+_CLEAN_RUN = re.compile(
+    '(?:[^"{}\\[\\]' + _JUNK_CHARS + ']+'
+    '|"[^"\\\\\n\r\t' + _JUNK_CHARS + ']*'
+    '(?:\\\\(?:["\\\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\\\n\r\t' + _JUNK_CHARS + ']*)*'
+    '"(?=' + _CLOSING_LOOKAHEAD + '))+'
+)
+_HEX4 = re.compile(r'[0-9a-fA-F]{4}')
+# Hızlı yolda çözülmüş string değerlerden atılacak karakterler
+_JUNK_TRANSLATION = {
+    code: None
+    for start, end in re.findall(r'(.)(?:-(.))?', _JUNK_CHARS)
+    for code in range(ord(start), ord(end or start) + 1)
+}
+_JUNK_TRANSLATION[0x00A0] = ' '
+_JUNK_RE = re.compile('[' + _JUNK_CHARS + ']')
+_FAST_DECODER = json.JSONDecoder(strict=False)
+
+_VALID_ESCAPES = '"\\/bfnrt'
+_STRING_REPLACEMENTS = {
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+    '\u00A0': ' ',  # Bölünemez boşluk
+}
+
+
+class TolerantJSONExtractor:
+    """YZ yanıtındaki JSON öneri dizisini tek geçişte çıkaran hoşgörülü ayrıştırıcı.
+
+    Eski zincirin (`find('[')`/`rfind(']')` kesme, `_clean_json_control_chars`,
+    `_remove_extra_json_data`, tam `json.loads`) yaptığı işleri metin üzerinde tek bir
+    doğrusal taramada yapar:
+
+    - Dizinin öncesindeki açıklamayı ve sonrasındaki fazladan veriyi atlar.
+    - Kontrol karakterlerini ve sorunlu Unicode karakterlerini atar; string içindeki
+      satır sonu ve sekmeleri kaçış dizisine çevirir.
+    - String içindeki kaçışsız tırnakları, ardından gelen karaktere bakarak kaçışlar.
+    - Sondaki virgülleri siler.
+    - Yarıda kesilmiş yanıtlarda, değerleri tam gelmiş son nesnenin eksik kapanışlarını
+      tamamlar; bir string'in ortasında kesilmiş nesneyi atar.
+    - Her nesneyi ayrı ayrı `json.loads` ile çözer; bozuk bir nesne diğerlerini etkilemez.
+
+    Dizi zaten geçerli JSON ise (en sık durum) önce C ayrıştırıcısı denenir ve onarımlı
+    taramaya hiç girilmez.
+    """
+
+    def __init__(self):
+        self.array_found = False
+        self.truncated = False
+        self.failed_objects = 0
+
+    def extract(self, text: str) -> List[Any]:
+        """Metindeki üst düzey dizinin nesnelerini döndürür."""
+        self.array_found = False
+        self.truncated = False
+        self.failed_objects = 0
+        objects = []
+        if not text:
+            return objects
+
+        match = _ARRAY_START.search(text)
+        if match:
+            self.array_found = True
+            # Hızlı yol: dizi zaten geçerli JSON ise C ayrıştırıcısı dizinin sonunda durur,
+            # sonrasındaki fazladan metin önemsizdir. Yalnızca başarısız olursa onarımlı taramaya geçilir.
+            try:
+                value, end = _FAST_DECODER.raw_decode(text, match.start())
+            except json.JSONDecodeError:
+                value = None
+            if isinstance(value, list):
+                if _JUNK_RE.search(text, match.start(), end):
+                    value = self._clean_value(value)
+                return value
+            pos = match.start() + 1
+        else:
+            pos = 0  # Dizi yoksa metindeki çıplak nesneleri dene
+
+        length = len(text)
+        while pos < length:
+            match = _OBJECT_OR_END.search(text, pos)
+            if not match:
+                break
+            if match.group() == ']':
+                if self.array_found:
+                    break  # Dizinin sonu; sonrasındaki her şey fazladan veri
+                pos = match.end()
+                continue
+
+            object_text, pos, complete = self._scan_object(text, match.start())
+            try:
+                objects.append(json.loads(object_text))
+            except json.JSONDecodeError:
+                if complete:
+                    self.failed_objects += 1
+                else:
+                    self.truncated = True  # Yarıda kalan son nesne kurtarılamadı
+        return objects
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "array_found": self.array_found,
+            "truncated": self.truncated,
+            "failed_objects": self.failed_objects,
+        }
+
+    def _clean_value(self, value):
+        """Hızlı yoldan gelen değerlerdeki sorunlu karakterleri atar."""
+        if isinstance(value, str):
+            return value.translate(_JUNK_TRANSLATION)
+        if isinstance(value, dict):
+            return {key: self._clean_value(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._clean_value(item) for item in value]
+        return value
+
+    def _scan_object(self, text: str, start: int) -> Tuple[str, int, bool]:
+        """`start` konumundaki nesneyi temizleyerek kopyalar.
+
+        (temizlenmiş nesne metni, taramanın kaldığı konum, nesne tamamlandı mı) döndürür.
+        """
+        parts: List[str] = []
+        stack: List[str] = []
+        length = len(text)
+        i = start
+        in_string = False
+
+        while i < length:
+            clean = _CLEAN_RUN.match(text, i)
+            if clean:
+                parts.append(clean.group())
+                i = clean.end()
+                if i >= length:
+                    break
+            char = text[i]
+            i += 1
+
+            if char == '"':
+                parts.append('"')
+                i, closed = self._scan_string(text, i, parts)
+                if not closed:
+                    in_string = True
+                    break
+            elif char == '{' or char == '[':
+                stack.append(char)
+                parts.append(char)
+            elif char == '}' or char == ']':
+                self._strip_trailing_comma(parts)
+                if stack:
+                    opener = stack.pop()
+                    parts.append('}' if opener == '{' else ']')
+                else:
+                    parts.append(char)
+                if not stack:
+                    return ''.join(parts), i, True
+            # Diğer karakterler (kontrol karakterleri vb.) string dışında atılır
+
+        # Metin nesne kapanmadan bitti: yanıt yarıda kesilmiş
+        self.truncated = True
+        if in_string:
+            # Yarım kalan bir cümle uygulanırsa metni bozar; bu nesne kurtarılmaz
+            return "", length, False
+        self._strip_trailing_comma(parts)
+        tail = ''.join(parts).rstrip()
+        if tail.endswith(':'):
+            tail += ' null'
+        closers = ''.join('}' if opener == '{' else ']' for opener in reversed(stack))
+        return tail + closers, length, False
+
+    @staticmethod
+    def _scan_string(text: str, i: int, parts: List[str]) -> Tuple[int, bool]:
+        """Açılış tırnağından sonraki string içeriğini kopyalar.
+
+        (kapanış tırnağından sonraki konum, string kapandı mı) döndürür.
+        """
+        length = len(text)
+        while True:
+            match = _STRING_SPECIAL.search(text, i)
+            if not match:
+                parts.append(text[i:])
+                return length, False
+            j = match.start()
+            if j > i:
+                parts.append(text[i:j])
+            char = text[j]
+
+            if char == '"':
+                if _CLOSING_QUOTE.match(text, j + 1):
+                    parts.append('"')
+                    return j + 1, True
+                parts.append('\\"')  # Metin içindeki kaçışsız tırnak
+                i = j + 1
+            elif char == '\\':
+                next_char = text[j + 1:j + 2]
+                if next_char and next_char in _VALID_ESCAPES:
+                    parts.append(text[j:j + 2])
+                    i = j + 2
+                elif next_char == 'u' and _HEX4.match(text, j + 2):
+                    parts.append(text[j:j + 6])
+                    i = j + 6
+                elif not next_char:
+                    return length, False
+                else:
+                    parts.append('\\\\')  # Geçersiz kaçış: ters bölüyü harfiyen koru
+                    i = j + 1
+            else:
+                parts.append(_STRING_REPLACEMENTS.get(char, ''))
+                i = j + 1
+
+    @staticmethod
+    def _strip_trailing_comma(parts: List[str]):
+        k = len(parts) - 1
+        while k >= 0 and not parts[k].strip():
+            k -= 1
+        if k >= 0:
+            stripped = parts[k].rstrip()
+            if stripped.endswith(','):
+                parts[k] = stripped[:-1]
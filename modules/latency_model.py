@@ -0,0 +1,138 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class LatencyModel:
+    """Model ve analiz türü başına gözlenen istek sürelerinden öğrenilen gecikme modeli.
+
+    Her (model, analiz türü) için son `window` isteğin prompt boyutu (tahmini token) ve
+    süresi saklanır. Süre, prompt boyutuna karşı doğrusal olarak uydurulur (en küçük kareler);
+    gözlenen sürelerin bu tahmine oranlarının yüzdelikleri ise belirsizliği verir. Zaman
+    aşımı p99 tahminine göre, bölüm süresi (kalan süre hesabı için) medyana göre belirlenir.
+    Zaman aşımına uğrayan istekler süresi "en az bu kadar" olan örnekler olarak eklenir;
+    böylece çok kısa seçilmiş bir zaman aşımı kendiliğinden büyür. Yeterli örnek yoksa
+    None döndürülür ve çağıran sabit katsayılara (soğuk başlangıç) döner.
+    """
+
+    MIN_SAMPLES = 8
+    SAVE_INTERVAL = 30.0  # saniye
+
+    def __init__(self, path: Optional[str] = None, window: int = 300, timeout_margin: float = 1.2,
+                 min_timeout: int = 30, max_timeout: int = 600):
+        self.path = path
+        self.window = window
+        self.timeout_margin = timeout_margin
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._lock = threading.Lock()
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[int, float, bool]]] = {}
+        self._fits: Dict[Tuple[str, str], Optional[Dict[str, float]]] = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, samples in data.items():
+                model_name, _, analysis_type = key.partition("|")
+                self._samples[(model_name, analysis_type)] = deque(
+                    ((int(t), float(s), bool(c)) for t, s, c in samples), maxlen=self.window
+                )
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Gecikme modeli okunamadı, sıfırdan başlanıyor: {e}")
+            self._samples = {}
+
+    def save(self, force: bool = False):
+        """Örnekleri diske yazar (zorlanmadıkça en fazla `SAVE_INTERVAL` saniyede bir)."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty or (not force and time.time() - self._last_save < self.SAVE_INTERVAL):
+                return
+            data = {f"{model}|{analysis_type}": list(samples) for (model, analysis_type), samples in self._samples.items()}
+            self._dirty = False
+            self._last_save = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Gecikme modeli kaydedilemedi: {e}")
+
+    def record(self, model_name: str, analysis_type: str, prompt_tokens: int, seconds: float, timed_out: bool = False):
+        """Tamamlanan (ya da `timed_out` ile zaman aşımına uğrayan) bir isteğin süresini ekler."""
+        key = (model_name, analysis_type)
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self.window))
+            samples.append((int(prompt_tokens), round(float(seconds), 3), bool(timed_out)))
+            self._fits.pop(key, None)
+            self._dirty = True
+        self.save()
+
+    def _fit(self, key: Tuple[str, str]) -> Optional[Dict[str, float]]:
+        """Doğrusal uyum ve oran yüzdeliklerini hesaplar (kilit altında çağrılmalı)."""
+        if key in self._fits:
+            return self._fits[key]
+        samples = list(self._samples.get(key, ()))
+        completed = [(t, s) for t, s, censored in samples if not censored]
+        fit = None
+        if len(samples) >= self.MIN_SAMPLES and len(completed) >= self.MIN_SAMPLES // 2:
+            n = len(completed)
+            mean_t = sum(t for t, _ in completed) / n
+            mean_s = sum(s for _, s in completed) / n
+            var_t = sum((t - mean_t) ** 2 for t, _ in completed)
+            slope = 0.0
+            if var_t > 0:
+                slope = max(0.0, sum((t - mean_t) * (s - mean_s) for t, s in completed) / var_t)
+            intercept = max(0.1 * mean_s, mean_s - slope * mean_t)
+            ratios = sorted(s / (intercept + slope * t) for t, s, _ in samples)
+            fit = {
+                "intercept": intercept,
+                "slope": slope,
+                "p50": self._quantile(ratios, 0.50),
+                "p90": self._quantile(ratios, 0.90),
+                "p95": self._quantile(ratios, 0.95),
+                "p99": self._quantile(ratios, 0.99),
+                "samples": len(samples),
+            }
+        self._fits[key] = fit
+        return fit
+
+    @staticmethod
+    def _quantile(sorted_values: List[float], q: float) -> float:
+        index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+        return sorted_values[index]
+
+    def predict(self, model_name: str, analysis_type: str, prompt_tokens: int, quantile: str = "p50") -> Optional[float]:
+        """Verilen yüzdelik ("p50", "p90", "p95", "p99") için tahmini süre (saniye); yeterli örnek yoksa None."""
+        with self._lock:
+            fit = self._fit((model_name, analysis_type))
+        if not fit:
+            return None
+        return (fit["intercept"] + fit["slope"] * prompt_tokens) * fit[quantile]
+
+    def timeout_for(self, model_name: str, analysis_type: str, prompt_tokens: int) -> Optional[int]:
+        """Gözlenen p99 süresine göre zaman aşımı; yeterli örnek yoksa None."""
+        p99 = self.predict(model_name, analysis_type, prompt_tokens, "p99")
+        if p99 is None:
+            return None
+        return int(max(self.min_timeout, min(self.max_timeout, math.ceil(p99 * self.timeout_margin))))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {}
+            for key in self._samples:
+                fit = self._fit(key)
+                stats[f"{key[0]}|{key[1]}"] = dict(fit) if fit else {"samples": len(self._samples[key])}
+            return stats
@@ -0,0 +1,534 @@
+# pyright: reportMissingImports=false
+import glob
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .prompt_archive import PromptArchive, text_hash
+
+
+class LLMBackend:
+    """YZ servis sağlayıcısı için ortak arayüz.
+
+    `AIIntegration` model nesnelerini doğrudan `google.generativeai` yerine bu arayüz
+    üzerinden oluşturur. Döndürülen model nesneleri Gemini ile aynı biçimde kullanılır:
+    `generate_content(prompt, generation_config=None, stream=False)` çağrısı `text`,
+    `candidates`, `prompt_feedback` ve `usage_metadata` alanları olan bir yanıt döndürür;
+    `stream=True` ise `text` alanı olan parçalar üreten, tamamı okunduktan sonra birleşik
+    metni `text` alanında tutan bir yanıt döndürür.
+    """
+
+    name = "base"
+    requires_api_key = True
+    supports_context_cache = False
+    # generation_config'te response_mime_type/response_schema (şemalı JSON çıktı) desteği
+    supports_structured_output = False
+
+    def configure(self, api_key: str):
+        pass
+
+    def default_safety_settings(self) -> Optional[Dict]:
+        return None
+
+    def create_model(self, model_name: str, safety_settings: Optional[Dict] = None) -> Any:
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini (google-generativeai) arka ucu."""
+
+    name = "gemini"
+    supports_context_cache = True
+    supports_structured_output = True
+
+    def configure(self, api_key: str):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+
+    def default_safety_settings(self) -> Optional[Dict]:
+        # En az kısıtlayıcı güvenlik ayarları: roman metinleri sık sık hassas içerik filtresine takılır
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+        return {
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        }
+
+    def create_model(self, model_name: str, safety_settings: Optional[Dict] = None) -> Any:
+        import google.generativeai as genai
+        return genai.GenerativeModel(model_name=model_name, safety_settings=safety_settings)
+
+
+class FakeBackendError(Exception):
+    """Sahte arka ucun enjekte ettiği sunucu hatası."""
+
+
+class FakeQuotaError(FakeBackendError):
+    """Sahte arka ucun enjekte ettiği 429 kota hatası."""
+
+
+class FakeUsageMetadata:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+        self.cached_content_token_count = 0
+        self.total_token_count = prompt_token_count + candidates_token_count
+
+
+class FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeResponse:
+    """Gemini yanıtını taklit eder."""
+
+    def __init__(self, text: str, prompt_tokens: int, blocked: bool = False):
+        self._text = text
+        self.candidates = [] if blocked else [FakeChunk(text)]
+        self.prompt_feedback = "block_reason: SAFETY (sahte)" if blocked else None
+        self.usage_metadata = FakeUsageMetadata(prompt_tokens, len(text) // 4 + 1)
+
+    @property
+    def text(self) -> str:
+        if not self.candidates:
+            raise ValueError("Yanıtta candidate yok (prompt engellendi)")
+        return self._text
+
+
+class FakeStreamResponse(FakeResponse):
+    """Akış yanıtı: parçalar aralarında gecikmeyle üretilir, sonunda birleşik metin okunur."""
+
+    def __init__(self, text: str, prompt_tokens: int, chunk_size: int, first_delay: float, chunk_delay: float):
+        super().__init__(text, prompt_tokens)
+        self._chunk_size = max(1, chunk_size)
+        self._first_delay = first_delay
+        self._chunk_delay = chunk_delay
+
+    def __iter__(self):
+        time.sleep(self._first_delay)
+        for start in range(0, len(self._text), self._chunk_size):
+            if start:
+                time.sleep(self._chunk_delay)
+            yield FakeChunk(self._text[start:start + self._chunk_size])
+
+
+class FakeModel:
+    """Sahte arka ucun model nesnesi; tüm işi `FakeBackend`'e devreder."""
+
+    def __init__(self, backend: "FakeBackend", model_name: str):
+        self.backend = backend
+        self.model_name = model_name
+
+    def generate_content(self, prompt, generation_config=None, stream: bool = False, request_options=None, **kwargs):
+        timeout = (request_options or {}).get("timeout")
+        json_mode = (generation_config or {}).get("response_mime_type") == "application/json"
+        return self.backend.generate(self.model_name, prompt, stream=stream, timeout=timeout, json_mode=json_mode)
+
+
+class FakeBackend(LLMBackend):
+    """Ağ gerektirmeyen, belirlenimci (deterministic) sahte arka uç.
+
+    Aynı tohum (seed) ve aynı istek sırasıyla her çalıştırmada aynı gecikmeleri, hataları ve
+    yanıtları üretir. Yük ve verim testleri için:
+
+    - `latency`: gecikme dağılımı, örn. `{"distribution": "lognormal", "median": 2.0, "sigma": 0.5}`.
+      Desteklenen dağılımlar: constant (value), uniform (low, high), normal (mean, stddev),
+      lognormal (median, sigma), exponential (mean). Model bazında `model_latency` ile ezilebilir.
+    - `error_rate`, `quota_error_rate`, `blocked_rate`: her istekte sunucu hatası, 429 kota hatası
+      ve güvenlik engeli enjekte edilme olasılıkları. `retry_after` kota hatası mesajına yazılır.
+    - `blocked_terms`: bu ifadelerden birini içeren her prompt güvenlik filtresine takılır.
+    - `payloads`: hazır yanıt metinleri (döngüsel kullanılır). Verilmezse prompt'taki bölüm
+      metninden cümleler seçilerek geçerli JSON öneri listesi üretilir.
+    - `suggestions_per_request`, `stream_chunk_size`, `stream_chunk_delay`: yanıt boyutu ve akış hızı.
+    - `time_scale`: tüm gecikmeleri ölçekler (0: beklemeden çalış).
+
+    Şemalı JSON modunda (`response_mime_type` application/json) üretilen yanıtlar, gerçek
+    servis gibi kod bloğu işaretleri olmadan saf JSON olarak döner.
+    """
+
+    name = "fake"
+    requires_api_key = False
+    supports_structured_output = True
+
+    DEFAULT_OPTIONS = {
+        "seed": 42,
+        "latency": {"distribution": "lognormal", "median": 1.5, "sigma": 0.4},
+        "model_latency": {},
+        "error_rate": 0.0,
+        "quota_error_rate": 0.0,
+        "blocked_rate": 0.0,
+        "blocked_terms": [],
+        "retry_after": 2,
+        "payloads": [],
+        "suggestions_per_request": 3,
+        "stream_chunk_size": 80,
+        "stream_chunk_delay": 0.02,
+        "time_scale": 1.0,
+    }
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        self.options = dict(self.DEFAULT_OPTIONS)
+        self.options.update(options or {})
+        self._lock = threading.Lock()
+        self._prompt_counts: Dict[str, int] = {}
+        self.stats = {"requests": 0, "errors": 0, "quota_errors": 0, "blocked": 0}
+
+    def create_model(self, model_name: str, safety_settings: Optional[Dict] = None) -> FakeModel:
+        return FakeModel(self, model_name)
+
+    def generate(self, model_name: str, prompt: str, stream: bool = False, timeout: Optional[float] = None,
+                 json_mode: bool = False) -> FakeResponse:
+        rng = self._request_rng(model_name, prompt)
+        scale = float(self.options["time_scale"])
+        latency = self.sample_latency(rng, self.options["model_latency"].get(model_name, self.options["latency"])) * scale
+
+        roll = rng.random()
+        error_rate = float(self.options["error_rate"])
+        quota_rate = float(self.options["quota_error_rate"])
+        blocked_rate = float(self.options["blocked_rate"])
+        with self._lock:
+            self.stats["requests"] += 1
+
+        if roll < quota_rate:
+            # Gerçek servis kota hatasını hemen döndürür
+            time.sleep(min(latency, 0.05 * scale))
+            with self._lock:
+                self.stats["quota_errors"] += 1
+            raise FakeQuotaError(
+                f"429 Resource has been exhausted (e.g. check quota). retry_delay {{ seconds: {self.options['retry_after']} }}"
+            )
+        if roll < quota_rate + error_rate:
+            time.sleep(latency)
+            with self._lock:
+                self.stats["errors"] += 1
+            raise FakeBackendError("500 Internal error encountered. (sahte arka uç)")
+
+        if timeout is not None and latency > timeout:
+            # Gerçek istemci gibi ağ zaman aşımında bağlantıyı bırakıp hata ver
+            time.sleep(timeout)
+            with self._lock:
+                self.stats["errors"] += 1
+            raise FakeBackendError("504 Deadline Exceeded (sahte arka uç)")
+
+        prompt_tokens = len(prompt) // 4 + 1
+        if roll < quota_rate + error_rate + blocked_rate or any(term in prompt for term in self.options["blocked_terms"]):
+            time.sleep(latency)
+            with self._lock:
+                self.stats["blocked"] += 1
+            return FakeResponse("", prompt_tokens, blocked=True)
+
+        text = self._make_payload(rng, prompt, json_mode)
+        if stream:
+            chunk_size = int(self.options["stream_chunk_size"])
+            chunk_delay = float(self.options["stream_chunk_delay"]) * scale
+            chunk_count = max(1, math.ceil(len(text) / max(1, chunk_size)))
+            # Toplam süre örneklenen gecikmeye yakın kalsın: ilk parça kalan süreyi bekler
+            first_delay = max(0.0, latency - chunk_delay * (chunk_count - 1))
+            return FakeStreamResponse(text, prompt_tokens, chunk_size, first_delay, chunk_delay)
+        time.sleep(latency)
+        return FakeResponse(text, prompt_tokens)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def _request_rng(self, model_name: str, prompt: str) -> random.Random:
+        """İstek için tohum: (seed, model, prompt, bu prompt'un kaçıncı tekrarı).
+
+        Eşzamanlı isteklerde sonuçlar thread sıralamasına değil isteğin kendisine bağlı kalır;
+        aynı prompt'un tekrarı (ör. yeniden deneme) farklı bir örnek alır.
+        """
+        digest = hashlib.sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()
+        with self._lock:
+            count = self._prompt_counts.get(digest, 0)
+            self._prompt_counts[digest] = count + 1
+        return random.Random(f"{self.options['seed']}:{digest}:{count}")
+
+    @staticmethod
+    def sample_latency(rng: random.Random, spec: Dict[str, Any]) -> float:
+        distribution = spec.get("distribution", "constant")
+        if distribution == "uniform":
+            value = rng.uniform(float(spec.get("low", 0.5)), float(spec.get("high", 2.0)))
+        elif distribution == "normal":
+            value = rng.gauss(float(spec.get("mean", 1.0)), float(spec.get("stddev", 0.2)))
+        elif distribution == "lognormal":
+            value = rng.lognormvariate(math.log(float(spec.get("median", 1.0))), float(spec.get("sigma", 0.5)))
+        elif distribution == "exponential":
+            value = rng.expovariate(1.0 / max(1e-6, float(spec.get("mean", 1.0))))
+        else:
+            value = float(spec.get("value", 1.0))
+        return max(0.0, value)
+
+    def _make_payload(self, rng: random.Random, prompt: str, json_mode: bool = False) -> str:
+        payloads = self.options["payloads"]
+        if payloads:
+            return payloads[rng.randrange(len(payloads))]
+        if "original_sentence" not in prompt:
+            # JSON beklemeyen istekler (roman kimliği özeti, bağlantı testi)
+            return "Bağlantı başarılı. (Sahte arka uç yanıtı)\n\n1. **Ana Tema:** Sahte özet metni."
+        if "PARAGRAF KİMLİKLİ" in prompt:
+            return self._make_paragraph_payload(rng, prompt, json_mode)
+        sentences = self._extract_sentences(prompt)
+        count = min(int(self.options["suggestions_per_request"]), len(sentences))
+        suggestions = []
+        for sentence, chapter_id in rng.sample(sentences, count) if count else []:
+            suggestion = {
+                "original_sentence": sentence,
+                "suggested_sentence": sentence.rstrip(".!?…") + " (düzeltildi).",
+                "explanation": "Sahte arka ucun ürettiği örnek öneri.",
+                "severity": rng.choice(["low", "medium", "high"]),
+            }
+            if chapter_id:
+                suggestion["chapter_id"] = chapter_id
+            suggestions.append(suggestion)
+        payload = json.dumps(suggestions, ensure_ascii=False, indent=2)
+        return payload if json_mode else "```json\n" + payload + "\n```"
+
+    PARAGRAPH_TAG_PATTERN = re.compile(r'^\[P(\d+)\] (.+)$', re.M)
+
+    def _make_paragraph_payload(self, rng: random.Random, prompt: str, json_mode: bool) -> str:
+        """Paragraf kimlikli protokolde rastgele kelimeler için paragraf + aralık biçiminde öneriler."""
+        words = [
+            (paragraph_id, match.start(), match.group(0))
+            for paragraph_id, text in self.PARAGRAPH_TAG_PATTERN.findall(prompt)
+            for match in re.finditer(r'\w{5,}', text)
+        ]
+        count = min(int(self.options["suggestions_per_request"]), len(words))
+        suggestions = [
+            {
+                "paragraph_id": f"P{paragraph_id}",
+                "start": start,
+                "end": start + len(word),
+                "original": word,
+                "replacement": word + "(düzeltildi)",
+                "explanation": "Sahte arka ucun ürettiği örnek öneri.",
+                "severity": rng.choice(["low", "medium", "high"]),
+            }
+            for paragraph_id, start, word in (rng.sample(words, count) if count else [])
+        ]
+        payload = json.dumps(suggestions, ensure_ascii=False, indent=2)
+        return payload if json_mode else "```json\n" + payload + "\n```"
+
+    BATCH_BLOCK_PATTERN = re.compile(r'^=== BÖLÜM (\S+) BAŞLANGICI ===$(.*?)^=== BÖLÜM \1 SONU ===$', re.M | re.S)
+
+    @classmethod
+    def _extract_sentences(cls, prompt: str) -> List[Tuple[str, Optional[str]]]:
+        """Prompt'taki bölüm cümleleri ve (paketlenmiş istekte) ait oldukları bölüm kimliği."""
+        # Prompt şablonlarında bölüm metni her zaman sondaki "...bölümü:" başlığından sonra gelir
+        marker = prompt.rfind("bölümü:\n")
+        text = prompt[marker + len("bölümü:\n"):] if marker != -1 else prompt
+        blocks = [(match.group(2), match.group(1)) for match in cls.BATCH_BLOCK_PATTERN.finditer(text)] or [(text, None)]
+        return [
+            (s.strip(), chapter_id)
+            for block, chapter_id in blocks
+            for s in re.split(r'(?<=[.!?…])\s+', block) if len(s.strip()) > 15
+        ]
+
+
+class ReplayMissError(Exception):
+    """Tekrar oynatılan arşivde prompt'a ait yanıt bulunamadı."""
+
+
+class ReplayModel:
+    """Tekrar oynatma arka ucunun model nesnesi; tüm işi `ReplayBackend`'e devreder."""
+
+    def __init__(self, backend: "ReplayBackend", model_name: str):
+        self.backend = backend
+        self.model_name = model_name
+
+    def generate_content(self, prompt, generation_config=None, stream: bool = False, request_options=None, **kwargs):
+        timeout = (request_options or {}).get("timeout")
+        json_mode = (generation_config or {}).get("response_mime_type") == "application/json"
+        return self.backend.generate(self.model_name, prompt, stream=stream, timeout=timeout, json_mode=json_mode)
+
+
+class ReplayBackend(LLMBackend):
+    """Projelerde biriken gerçek prompt/yanıt çiftlerini ağa çıkmadan tekrar oynatan arka uç.
+
+    Gönderilen prompt'un özeti (sha256) arşivdeki prompt özetleriyle eşleştirilir; prompt
+    şablonu analiz türüne özgü olduğundan özet, analiz türünü de belirler. Aynı prompt
+    birden çok kez kaydedildiyse yanıtlar kaydedildikleri sırayla döndürülür. Kaynaklar:
+
+    - `Archive/` klasörleri (`PromptArchive`): yanıtın gözlenen ağ gecikmesi de kayıtlıdır.
+    - Eski `Prompts/` ve `Responses/` klasörleri: dosya adındaki analiz türüne göre her yanıt,
+      kendinden önce yazılmış son prompt'la eşleştirilir; gecikme dosya zamanlarından tahmin edilir.
+
+    Seçenekler:
+    - `archive_dirs`: taranacak proje klasörleri; verilmezse `projects_dir` altındaki tüm projeler.
+    - `simulate_latency`, `time_scale`: kayıtlı gecikmeyi (ölçekleyerek) bekle.
+    - `on_miss`: "error" (eşleşme yoksa hata) ya da "fake" (`FakeBackend`'e devret).
+    - `analysis_types`: yalnızca bu analiz türlerinin kayıtlarını yükle.
+
+    Arka uç bağlam önbelleğini desteklemez, her istekte tam prompt gönderilir; bu nedenle
+    Gemini bağlam önbelleği açıkken kaydedilmiş (roman bağlamı prompt'ta olmayan) istekler eşleşmez.
+    """
+
+    name = "replay"
+    requires_api_key = False
+    # Kayıtlı yanıt hangi modda alındıysa o biçimde döner; ayrıştırıcı gerekirse onarıma düşer
+    supports_structured_output = True
+
+    DEFAULT_OPTIONS = {
+        "archive_dirs": [],
+        "projects_dir": None,
+        "simulate_latency": True,
+        "time_scale": 1.0,
+        "on_miss": "error",
+        "analysis_types": [],
+        "stream_chunk_size": 80,
+    }
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        self.options = dict(self.DEFAULT_OPTIONS)
+        self.options.update(options or {})
+        self._lock = threading.Lock()
+        # prompt özeti -> [(analiz türü, yanıt metni ya da arşiv kaydı, gecikme), ...]
+        self._index: Optional[Dict[str, List[Tuple[str, Any, Optional[float]]]]] = None
+        self._archives: Dict[str, PromptArchive] = {}
+        self._served: Dict[str, int] = {}
+        self._fallback: Optional[FakeBackend] = None
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "pairs": 0}
+
+    def create_model(self, model_name: str, safety_settings: Optional[Dict] = None) -> ReplayModel:
+        return ReplayModel(self, model_name)
+
+    def _project_dirs(self) -> List[str]:
+        if self.options["archive_dirs"]:
+            return list(self.options["archive_dirs"])
+        projects_dir = self.options["projects_dir"]
+        if not projects_dir or not os.path.isdir(projects_dir):
+            return []
+        return sorted(path for path in glob.glob(os.path.join(projects_dir, "*")) if os.path.isdir(path))
+
+    def _ensure_index(self):
+        with self._lock:
+            if self._index is not None:
+                return
+            self._index = {}
+            for project_dir in self._project_dirs():
+                archive_dir = os.path.join(project_dir, "Archive")
+                if os.path.exists(os.path.join(archive_dir, "index.jsonl")):
+                    self._load_archive(archive_dir)
+                if os.path.isdir(os.path.join(project_dir, "Responses")):
+                    self._load_legacy(project_dir)
+            self.stats["pairs"] = sum(len(entries) for entries in self._index.values())
+            print(f"⏯️ Tekrar oynatma arşivi: {len(self._index)} farklı prompt, {self.stats['pairs']} yanıt")
+
+    def _accepts(self, analysis_type: str) -> bool:
+        allowed = self.options["analysis_types"]
+        return not allowed or analysis_type in allowed
+
+    def _load_archive(self, archive_dir: str):
+        archive = PromptArchive(archive_dir)
+        self._archives[archive_dir] = archive
+        for prompt_record, response_record in archive.find_pairs():
+            if not self._accepts(prompt_record["analysis_type"]):
+                continue
+            # Yanıt metni ilk kullanımda arşivden okunur
+            self._index.setdefault(prompt_record["hash"], []).append(
+                (prompt_record["analysis_type"], (archive_dir, response_record), response_record.get("latency"))
+            )
+
+    def _load_legacy(self, project_dir: str):
+        """Eski klasörlerdeki dosyaları analiz türü ve yazılma zamanına göre eşleştirir."""
+        prompts: Dict[str, List[Tuple[float, str]]] = {}
+        for path in glob.glob(os.path.join(project_dir, "Prompts", "*.txt")):
+            match = re.match(r"^(.+)_\d{8}_\d{6}\.txt$", os.path.basename(path))
+            if match:
+                prompts.setdefault(match.group(1), []).append((os.path.getmtime(path), path))
+        for analysis_type in prompts:
+            prompts[analysis_type].sort()
+
+        for path in sorted(glob.glob(os.path.join(project_dir, "Responses", "*_response_*.txt"))):
+            match = re.match(r"^(.+)_response_\d{8}_\d{6}\.txt$", os.path.basename(path))
+            if not match or not self._accepts(match.group(1)):
+                continue
+            response_time = os.path.getmtime(path)
+            candidates = [item for item in prompts.get(match.group(1), []) if item[0] <= response_time]
+            if not candidates:
+                continue
+            prompt_time, prompt_path = candidates[-1]
+            with open(prompt_path, "r", encoding="utf-8", errors="replace") as f:
+                prompt_hash = text_hash(f.read())
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                response_text = f.read()
+            self._index.setdefault(prompt_hash, []).append((match.group(1), response_text, response_time - prompt_time))
+
+    def iter_entries(self):
+        """Tüm kayıtlı yanıtlar: (prompt özeti, analiz türü, yanıt metni, gecikme)."""
+        self._ensure_index()
+        with self._lock:
+            items = [(prompt_hash, entry) for prompt_hash, entries in self._index.items() for entry in entries]
+        for prompt_hash, (analysis_type, response, latency) in items:
+            if isinstance(response, tuple):
+                archive_dir, record = response
+                response = self._archives[archive_dir].load_text(record)
+            yield prompt_hash, analysis_type, response, latency
+
+    def lookup(self, prompt: str) -> Optional[Tuple[str, str, Optional[float]]]:
+        """Prompt için sıradaki kayıtlı (analiz türü, yanıt, gecikme); yoksa None."""
+        self._ensure_index()
+        prompt_hash = text_hash(prompt)
+        with self._lock:
+            entries = self._index.get(prompt_hash)
+            if not entries:
+                return None
+            served = self._served.get(prompt_hash, 0)
+            self._served[prompt_hash] = served + 1
+            analysis_type, response, latency = entries[served % len(entries)]
+        if isinstance(response, tuple):
+            archive_dir, record = response
+            response = self._archives[archive_dir].load_text(record)
+        return analysis_type, response, latency
+
+    def generate(self, model_name: str, prompt: str, stream: bool = False, timeout: Optional[float] = None,
+                 json_mode: bool = False) -> FakeResponse:
+        with self._lock:
+            self.stats["requests"] += 1
+        entry = self.lookup(prompt)
+        if entry is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            if self.options["on_miss"] == "fake":
+                with self._lock:
+                    if self._fallback is None:
+                        self._fallback = FakeBackend({"time_scale": self.options["time_scale"]})
+                return self._fallback.generate(model_name, prompt, stream=stream, timeout=timeout, json_mode=json_mode)
+            raise ReplayMissError(f"404 Arşivde bu prompt için kayıtlı yanıt yok ({text_hash(prompt)[:12]})")
+
+        with self._lock:
+            self.stats["hits"] += 1
+        _, text, latency = entry
+        delay = 0.0
+        if self.options["simulate_latency"] and latency:
+            delay = max(0.0, float(latency)) * float(self.options["time_scale"])
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise FakeBackendError("504 Deadline Exceeded (tekrar oynatma)")
+
+        prompt_tokens = len(prompt) // 4 + 1
+        if stream:
+            return FakeStreamResponse(text, prompt_tokens, int(self.options["stream_chunk_size"]), delay, 0.0)
+        time.sleep(delay)
+        return FakeResponse(text, prompt_tokens)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+def create_backend(name: str, options: Optional[Dict[str, Any]] = None) -> LLMBackend:
+    """Ayardaki arka uç adına göre arka uç nesnesi oluştur."""
+    if name == "fake":
+        return FakeBackend(options)
+    if name == "replay":
+        return ReplayBackend(options)
+    return GeminiBackend()
@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .request_worker import CancelToken
+
+
+class PrefetchEntry:
+    """Önceden başlatılmış bir bölüm analizinin durumu."""
+
+    def __init__(self, chapter: Any, analysis_type: str, content_hash: str, future: Future, cancel_token: CancelToken):
+        self.chapter = chapter
+        self.analysis_type = analysis_type
+        self.content_hash = content_hash
+        self.future = future
+        self.cancel_token = cancel_token
+        self.created_at = time.time()
+
+
+class AnalysisPrefetcher:
+    """Editör önerileri incelerken sıradaki bölümün analizini arka planda yapıp bekletir.
+
+    Sonuç, bölüm içeriğinin özetiyle (`Chapter.content_hash`) birlikte saklanır. Sonuç
+    kullanılmak istendiğinde içerik değişmişse sonuç atılır ve analiz normal yoldan yapılır.
+    Aynı anda tek bir önceden analiz çalışır; kullanıcının kendi isteklerinin önüne geçmez.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._entries: Dict[Tuple[int, str], PrefetchEntry] = {}
+        self.stats = {"scheduled": 0, "hits": 0, "stale": 0, "failed": 0, "discarded": 0}
+
+    def schedule(self, chapter: Any, analysis_type: str, run: Callable[[CancelToken], List]) -> bool:
+        """`run(cancel_token)` fonksiyonunu arka planda çalıştırır; aynı iş zaten varsa False döndürür."""
+        key = (id(chapter), analysis_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.chapter is chapter and entry.content_hash == chapter.content_hash():
+                return False
+            if entry:
+                entry.cancel_token.cancel("bölüm değişti")
+            cancel_token = CancelToken()
+            future = self._executor.submit(run, cancel_token)
+            self._entries[key] = PrefetchEntry(chapter, analysis_type, chapter.content_hash(), future, cancel_token)
+            self.stats["scheduled"] += 1
+        print(f"🔮 Önceden analiz başlatıldı: {getattr(chapter, 'title', '?')} ({analysis_type})")
+        return True
+
+    def take(self, chapter: Any, analysis_type: str) -> Optional[List]:
+        """Bekletilen sonucu alır (analiz sürüyorsa bitmesini bekler).
+
+        İçerik değişmişse, analiz başarısız olduysa ya da hiç başlatılmadıysa None döndürür.
+        Bu metot işçi thread'inden çağrılmalıdır; ana thread'i bekletebilir.
+        """
+        with self._lock:
+            entry = self._entries.pop((id(chapter), analysis_type), None)
+        if not entry or entry.chapter is not chapter:
+            return None
+        if entry.content_hash != chapter.content_hash():
+            entry.cancel_token.cancel("bölüm içeriği değişti")
+            with self._lock:
+                self.stats["stale"] += 1
+            print(f"♻️ Önceden hazırlanan sonuç atıldı: {chapter.title} içeriği değişmiş")
+            return None
+        try:
+            result = entry.future.result()
+        except Exception as e:
+            with self._lock:
+                self.stats["failed"] += 1
+            print(f"Önceden analiz kullanılamadı ({chapter.title}): {e}")
+            return None
+        # Beklerken içerik değişmiş olabilir
+        if entry.content_hash != chapter.content_hash():
+            with self._lock:
+                self.stats["stale"] += 1
+            return None
+        with self._lock:
+            self.stats["hits"] += 1
+        return result
+
+    def is_pending(self, chapter: Any, analysis_type: str) -> bool:
+        with self._lock:
+            entry = self._entries.get((id(chapter), analysis_type))
+            return bool(entry and entry.chapter is chapter)
+
+    def discard(self, chapter: Any = None):
+        """Bir bölümün (ya da tüm bölümlerin) bekleyen sonuçlarını atar ve sürenleri iptal eder."""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if chapter is None or entry.chapter is chapter]
+            entries = [self._entries.pop(key) for key in keys]
+            self.stats["discarded"] += len(entries)
+        for entry in entries:
+            entry.cancel_token.cancel("önceden analiz iptal edildi")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, parked=len(self._entries))
@@ -0,0 +1,201 @@
+import atexit
+import hashlib
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PromptArchive:
+    """Prompt ve yanıtlar için yalnızca sona eklenen, sıkıştırılmış ve tekilleştirilmiş arşiv.
+
+    Metinler içerik tanımlı parçalara bölünür (parça sınırı satır içeriğine göre seçildiği
+    için bir bölümdeki değişiklik yalnızca yakın parçaları etkiler). Her parça özetine göre
+    `blobs.dat` dosyasına bir kez, zlib ile sıkıştırılarak yazılır; böylece her istekte tekrar
+    gönderilen roman metni arşivde yalnızca bir kez yer kaplar. `index.jsonl` her kayıt için
+    istek kimliği, tür (prompt/response), analiz türü, model, metin özeti ve parça listesini
+    tutar. Yazma işlemleri arka plandaki tek bir thread'de yapılır; istek thread'i beklemez.
+    """
+
+    MIN_CHUNK = 2048
+    MAX_CHUNK = 16384
+    BOUNDARY_MASK = 0x0F  # Ortalama ~16 satırda bir parça sınırı
+
+    _id_counter = itertools.count()
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        self.blobs_path = os.path.join(archive_dir, "blobs.dat")
+        self.index_path = os.path.join(archive_dir, "index.jsonl")
+        self._lock = threading.Lock()
+        self._blob_offsets: Optional[Dict[str, Tuple[int, int]]] = None  # özet -> (konum, uzunluk)
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self.stats = {"records": 0, "chunks_written": 0, "chunks_deduplicated": 0, "bytes_in": 0, "bytes_written": 0}
+
+    @classmethod
+    def new_request_id(cls) -> str:
+        """Eşzamanlı isteklerde bile çakışmayan, zamana göre sıralanabilir kimlik."""
+        return f"{time.strftime('%Y%m%d_%H%M%S')}_{time.time_ns() % 1_000_000_000:09d}_{next(cls._id_counter)}"
+
+    @classmethod
+    def split_chunks(cls, text: str) -> List[str]:
+        """Metni satır içeriğine bağlı sınırlarla parçalara böler."""
+        chunks = []
+        current: List[str] = []
+        size = 0
+        for line in text.splitlines(keepends=True):
+            current.append(line)
+            size += len(line)
+            boundary = size >= cls.MIN_CHUNK and (zlib.crc32(line.encode("utf-8")) & cls.BOUNDARY_MASK) == 0
+            if boundary or size >= cls.MAX_CHUNK:
+                chunks.append("".join(current))
+                current, size = [], 0
+        if current:
+            chunks.append("".join(current))
+        return chunks
+
+    # ---- Yazma (arka plan) ----
+
+    def submit(self, request_id: str, kind: str, text: str, analysis_type: str, model_name: str = "",
+               extra: Optional[Dict[str, Any]] = None):
+        """Kaydı yazma kuyruğuna ekler ve hemen döner."""
+        record = {
+            "id": request_id,
+            "kind": kind,
+            "analysis_type": analysis_type,
+            "model": model_name,
+            "ts": time.time(),
+            "text": text,
+        }
+        if extra:
+            record.update(extra)
+        self._ensure_writer()
+        self._queue.put(record)
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                first_start = self._writer is None
+                self._writer = threading.Thread(target=self._write_loop, name="prompt-archive", daemon=True)
+                self._writer.start()
+                if first_start:
+                    # Uygulama kapanırken kuyrukta kalan kayıtlar kaybolmasın
+                    atexit.register(self.flush)
+
+    def _write_loop(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is not None:
+                    self._write_record(record)
+            except Exception as e:
+                print(f"Arşive yazılamadı ({record.get('id') if record else '?'}): {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler."""
+        self._queue.join()
+
+    def _load_offsets(self):
+        """Parça konumlarını blob dosyasını tarayarak yükler (kilit altında çağrılmalı)."""
+        if self._blob_offsets is not None:
+            return
+        self._blob_offsets = {}
+        if not os.path.exists(self.blobs_path):
+            return
+        with open(self.blobs_path, "rb") as f:
+            while True:
+                header = f.read(68)  # 64 karakter özet + 4 bayt uzunluk
+                if len(header) < 68:
+                    break
+                digest = header[:64].decode("ascii")
+                length = int.from_bytes(header[64:], "big")
+                self._blob_offsets[digest] = (f.tell(), length)
+                f.seek(length, os.SEEK_CUR)
+
+    def _write_record(self, record: Dict[str, Any]):
+        text = record.pop("text")
+        chunks = self.split_chunks(text)
+        digests = []
+        with self._lock:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            self._load_offsets()
+            with open(self.blobs_path, "ab") as blobs:
+                for chunk in chunks:
+                    data = chunk.encode("utf-8")
+                    digest = hashlib.sha256(data).hexdigest()
+                    digests.append(digest)
+                    self.stats["bytes_in"] += len(data)
+                    if digest in self._blob_offsets:
+                        self.stats["chunks_deduplicated"] += 1
+                        continue
+                    compressed = zlib.compress(data, 6)
+                    blobs.write(digest.encode("ascii") + len(compressed).to_bytes(4, "big"))
+                    self._blob_offsets[digest] = (blobs.tell(), len(compressed))
+                    blobs.write(compressed)
+                    self.stats["chunks_written"] += 1
+                    self.stats["bytes_written"] += len(compressed) + 68
+            record["hash"] = text_hash(text)
+            record["chars"] = len(text)
+            record["chunks"] = digests
+            with open(self.index_path, "a", encoding="utf-8") as index:
+                index.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stats["records"] += 1
+
+    # ---- Okuma ----
+
+    def iter_records(self, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Dizindeki kayıtları yazılma sırasıyla döndürür."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r", encoding="utf-8") as index:
+            for line in index:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Yarım kalmış son satır
+                if kind is None or record.get("kind") == kind:
+                    yield record
+
+    def load_text(self, record: Dict[str, Any]) -> str:
+        """Kaydın metnini parçalarından yeniden oluşturur."""
+        parts = []
+        with self._lock:
+            self._load_offsets()
+            with open(self.blobs_path, "rb") as blobs:
+                for digest in record["chunks"]:
+                    offset, length = self._blob_offsets[digest]
+                    blobs.seek(offset)
+                    parts.append(zlib.decompress(blobs.read(length)).decode("utf-8"))
+        return "".join(parts)
+
+    def find_pairs(self, analysis_type: Optional[str] = None) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Yanıtı da arşivlenmiş (prompt, yanıt) kayıt çiftleri."""
+        prompts = {}
+        pairs = []
+        for record in self.iter_records():
+            if analysis_type and record.get("analysis_type") != analysis_type:
+                continue
+            if record["kind"] == "prompt":
+                prompts[record["id"]] = record
+            elif record["kind"] == "response" and record["id"] in prompts:
+                pairs.append((prompts[record["id"]], record))
+        return pairs
+
+    def find_response(self, prompt_hash: str, analysis_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Verilen prompt özetine ait en son yanıt kaydı."""
+        match = None
+        for prompt_record, response_record in self.find_pairs(analysis_type):
+            if prompt_record["hash"] == prompt_hash:
+                match = response_record
+        return match
@@ -0,0 +1,189 @@
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Belirli bir hızda dolan, sınırlı kapasiteli jeton kovası."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.last_refill = now
+
+    def time_until(self, amount: float) -> float:
+        """`amount` kadar jetonun birikmesi için gereken süre (saniye)."""
+        amount = min(amount, self.capacity)  # Kapasiteden büyük istekler kovayı tamamen boşaltır
+        if self.tokens >= amount:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float('inf')
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def drain(self):
+        self.tokens = 0.0
+
+
+class RateLimiter:
+    """Model başına dakikalık istek (RPM) ve token (TPM) bütçesini uygulayan paylaşımlı sınırlayıcı.
+
+    Tüm Gemini çağrıları istek göndermeden önce `acquire` ile izin alır. API kota hatası
+    (429 / RESOURCE_EXHAUSTED) döndürdüğünde `report_quota_error` ile modelin kovası
+    boşaltılır ve hatadaki bekleme süresi kadar soğuma uygulanır.
+    """
+
+    DEFAULT_QUOTA_COOLDOWN = 30.0
+    QUOTA_ERROR_MARKERS = ("429", "resourceexhausted", "resource_exhausted", "quota_exceeded",
+                           "quota exceeded", "rate limit", "too many requests")
+
+    def __init__(self, requests_per_minute: int = 15, tokens_per_minute: int = 1000000,
+                 model_limits: Optional[Dict[str, Dict[str, int]]] = None):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Dict] = {}
+        self._waits: Dict[str, float] = {}
+        self.on_wait: Optional[Callable[[str, float], None]] = None
+        self.configure(requests_per_minute, tokens_per_minute, model_limits)
+
+    def configure(self, requests_per_minute: int, tokens_per_minute: int,
+                  model_limits: Optional[Dict[str, Dict[str, int]]] = None):
+        """Bütçeleri günceller. `model_limits` ile model bazında farklı değerler verilebilir."""
+        with self._lock:
+            self.requests_per_minute = max(1, int(requests_per_minute))
+            self.tokens_per_minute = max(1, int(tokens_per_minute))
+            self.model_limits = dict(model_limits or {})
+            # Kovalar yeni limitlerle yeniden oluşturulsun; soğuma süreleri korunur
+            for model_name, state in self._buckets.items():
+                rpm, tpm = self._limits_for(model_name)
+                state["requests"] = TokenBucket(rpm, rpm / 60.0)
+                state["tokens"] = TokenBucket(tpm, tpm / 60.0)
+
+    def _limits_for(self, model_name: str):
+        limits = self.model_limits.get(model_name, {})
+        rpm = max(1, int(limits.get("rpm", self.requests_per_minute)))
+        tpm = max(1, int(limits.get("tpm", self.tokens_per_minute)))
+        return rpm, tpm
+
+    def _state_for(self, model_name: str) -> Dict:
+        state = self._buckets.get(model_name)
+        if state is None:
+            rpm, tpm = self._limits_for(model_name)
+            state = {
+                "requests": TokenBucket(rpm, rpm / 60.0),
+                "tokens": TokenBucket(tpm, tpm / 60.0),
+                "cooldown_until": 0.0,
+            }
+            self._buckets[model_name] = state
+        return state
+
+    def _wait_time_locked(self, model_name: str, tokens: int, now: float) -> float:
+        state = self._state_for(model_name)
+        state["requests"].refill(now)
+        state["tokens"].refill(now)
+        return max(
+            state["cooldown_until"] - now,
+            state["requests"].time_until(1),
+            state["tokens"].time_until(tokens),
+            0.0,
+        )
+
+    def acquire(self, model_name: str, tokens: int = 0, cancel_check: Optional[Callable[[], bool]] = None) -> float:
+        """Model için bütçe uygun olana kadar bekler ve isteği kaydeder.
+
+        Toplam bekleme süresini (saniye) döndürür. `cancel_check` True döndürürse
+        bekleme yarıda kesilir ve `InterruptedError` fırlatılır.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._wait_time_locked(model_name, tokens, now)
+                if wait <= 0:
+                    state = self._buckets[model_name]
+                    state["requests"].consume(1)
+                    state["tokens"].consume(tokens)
+                    self._waits.pop(model_name, None)
+                    break
+                self._waits[model_name] = wait
+
+            self._notify_wait(model_name, wait)
+            if cancel_check and cancel_check():
+                with self._lock:
+                    self._waits.pop(model_name, None)
+                self._notify_wait(model_name, 0.0)
+                raise InterruptedError("Hız sınırı beklemesi iptal edildi")
+            # Geri sayımın arayüzde görünebilmesi için en fazla 1 saniyelik adımlarla uyu
+            step = min(wait, 1.0)
+            time.sleep(step)
+            waited += step
+
+        if waited > 0:
+            print(f"⏳ Hız sınırı: {model_name} için {waited:.1f} sn beklendi")
+            self._notify_wait(model_name, 0.0)
+        return waited
+
+    def _notify_wait(self, model_name: str, wait: float):
+        if self.on_wait:
+            try:
+                self.on_wait(model_name, wait)
+            except Exception as e:
+                print(f"Hız sınırı bildirim hatası: {e}")
+
+    def report_quota_error(self, model_name: str, error) -> float:
+        """Kota hatası sonrası modeli soğumaya alır; uygulanan bekleme süresini döndürür."""
+        cooldown = self.parse_retry_after(str(error))
+        if cooldown is None:
+            cooldown = self.DEFAULT_QUOTA_COOLDOWN
+        with self._lock:
+            state = self._state_for(model_name)
+            state["requests"].drain()
+            state["cooldown_until"] = max(state["cooldown_until"], time.monotonic() + cooldown)
+        print(f"⚠️ {model_name} için kota aşıldı, {cooldown:.0f} sn soğuma uygulanıyor")
+        return cooldown
+
+    def get_wait_time(self, model_name: Optional[str] = None) -> float:
+        """Bir sonraki isteğin gönderilebilmesi için kalan süre (saniye).
+
+        Model verilmezse, şu anda bekleyen istekler arasındaki en uzun süre döndürülür.
+        """
+        with self._lock:
+            if model_name is not None:
+                return self._wait_time_locked(model_name, 0, time.monotonic())
+            return max(self._waits.values(), default=0.0)
+
+    @classmethod
+    def is_quota_error(cls, error) -> bool:
+        if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+            return True
+        message = str(error).lower()
+        return any(marker in message for marker in cls.QUOTA_ERROR_MARKERS)
+
+    @staticmethod
+    def parse_retry_after(message: str) -> Optional[float]:
+        """Hata metnindeki `Retry-After` / `retry_delay` değerini saniye olarak okur."""
+        patterns = [
+            r'retry_delay\s*\{\s*seconds:\s*(\d+(?:\.\d+)?)',
+            r'retry-after["\']?\s*[:=]\s*["\']?(\d+(?:\.\d+)?)',
+            r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"',
+            r'retry in\s+(\d+(?:\.\d+)?)\s*s',
+        ]
+        for pattern in patterns:
+            match = re.search(pattern, message, re.IGNORECASE)
+            if match:
+                return float(match.group(1))
+        return None
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Kaba token tahmini (yaklaşık 4 karakter = 1 token)."""
+        return len(text or "") // 4 + 1
@@ -0,0 +1,267 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class RequestCancelled(Exception):
+    """İstek iptal edildiğinde (kullanıcı ya da zaman aşımı) fırlatılır."""
+
+
+class CancelToken:
+    """İş parçacıkları arasında paylaşılan iptal işareti.
+
+    Bir üst token'a bağlanan token, üst token iptal edildiğinde kendiliğinden iptal olur;
+    böylece "Analizi İptal Et" tek bir token üzerinden tüm bölüm ve pencere isteklerine ulaşır.
+    """
+
+    def __init__(self, parent: Optional["CancelToken"] = None):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self._parent = parent
+        self.reason = ""
+        if parent is not None:
+            parent.add_callback(self._cancel_from_parent)
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "iptal edildi"):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"İptal geri çağrısı hatası: {e}")
+
+    def _cancel_from_parent(self):
+        self.cancel(self._parent.reason if self._parent else "iptal edildi")
+
+    def add_callback(self, callback: Callable[[], None]):
+        """İptal anında çağrılacak fonksiyonu kaydet (zaten iptal edildiyse hemen çağrılır)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def detach(self):
+        """Üst token'daki kaydı kaldır (uzun süren üst token'larda birikmeyi önler)."""
+        if self._parent is not None:
+            self._parent.remove_callback(self._cancel_from_parent)
+
+    def wait(self, timeout: float) -> bool:
+        """En fazla `timeout` saniye bekler; iptal edildiyse True döndürür."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise RequestCancelled(self.reason)
+
+
+class RequestWorker:
+    """YZ isteklerini sınırlı sayıda, yeniden kullanılan thread'de çalıştırır.
+
+    Her istek için ayrı daemon thread açmak yerine tüm istekler aynı havuza gider; havuz
+    boyutu aynı anda uçuşta olabilecek en fazla istek sayısıdır. Zaman aşımında ya da iptalde
+    çağıran hemen döner ve isteğin token'ı iptal edilir; istek fonksiyonu token'ı kontrol
+    ederek (akış parçaları arasında) bırakır, ağ çağrısı da kendi zaman aşımıyla sonlanır.
+    Bırakılan ama henüz bitmemiş istekler havuzda yer tutmaya devam ettiği için yeniden
+    denemeler sınırsız sayıda thread biriktiremez.
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, max_in_flight: int = 8):
+        self._lock = threading.Lock()
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="ai-request")
+        self.stats = {
+            "in_flight": 0,    # Şu anda çalışan istekler
+            "abandoned": 0,    # Çağıranın vazgeçtiği ama hâlâ çalışan istekler
+            "completed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "hedged": 0,       # Kopyası gönderilen istekler
+            "hedge_wins": 0,   # Kopyanın ilk istekten önce tamamlandığı istekler
+        }
+
+    def configure(self, max_in_flight: int):
+        """Eşzamanlı istek sınırını değiştir. Çalışan istekler eski havuzda tamamlanır."""
+        max_in_flight = max(1, int(max_in_flight))
+        if max_in_flight == self.max_in_flight:
+            return
+        with self._lock:
+            old_executor = self._executor
+            self.max_in_flight = max_in_flight
+            self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="ai-request")
+        old_executor.shutdown(wait=False)
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self.stats["in_flight"]
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats, max_in_flight=self.max_in_flight)
+
+    def _submit(self, func: Callable[[CancelToken], Any], request_token: CancelToken) -> Dict[str, Any]:
+        """İsteği havuza gönderir; izleme için future, başlama işareti ve token'ı döndürür."""
+        attempt = {"token": request_token, "started": threading.Event(), "abandoned": False, "future": None}
+
+        def execute():
+            with self._lock:
+                self.stats["in_flight"] += 1
+            attempt["started"].set()
+            try:
+                request_token.raise_if_cancelled()
+                return func(request_token)
+            finally:
+                with self._lock:
+                    self.stats["in_flight"] -= 1
+                    if attempt["abandoned"]:
+                        self.stats["abandoned"] -= 1
+
+        with self._lock:
+            attempt["future"] = self._executor.submit(execute)
+        return attempt
+
+    def _abandon(self, attempt: Dict[str, Any], stat_key: Optional[str], reason: str):
+        """Çağıranın vazgeçtiği isteğin token'ını iptal eder (çalışıyorsa bırakılmış sayılır)."""
+        with self._lock:
+            if stat_key:
+                self.stats[stat_key] += 1
+            if attempt["started"].is_set() and not attempt["future"].done() and not attempt["abandoned"]:
+                attempt["abandoned"] = True
+                self.stats["abandoned"] += 1
+        attempt["token"].cancel(reason)
+        attempt["future"].cancel()
+
+    def run(self, func: Callable[[CancelToken], Any], timeout: float, cancel_token: Optional[CancelToken] = None) -> Any:
+        """`func(request_token)` fonksiyonunu havuzda çalıştırıp sonucunu döndürür.
+
+        Zaman aşımı, isteğin havuzda çalışmaya başladığı andan itibaren sayılır (sıra beklemesi
+        hariç). Süre dolarsa TimeoutError, `cancel_token` iptal edilirse RequestCancelled
+        fırlatılır; her iki durumda da istek token'ı iptal edilir.
+        """
+        request_token = CancelToken(parent=cancel_token)
+        attempt = self._submit(func, request_token)
+        try:
+            # Havuzda sıra bekleme (iptal edilebilir)
+            while not attempt["started"].wait(self.POLL_INTERVAL):
+                if request_token.is_cancelled:
+                    self._abandon(attempt, "cancelled", request_token.reason)
+                    raise RequestCancelled(request_token.reason)
+
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._abandon(attempt, "timed_out", "zaman aşımı")
+                    raise TimeoutError(f"İstek {timeout:.0f} saniye içinde tamamlanmadı")
+                # Bekleme süresinin dolmasını `func` içinden fırlatılan TimeoutError'dan ayırmak için
+                # sonuç yalnızca future tamamlandıktan sonra alınır
+                done, _ = wait([attempt["future"]], timeout=min(self.POLL_INTERVAL, remaining))
+                if not done:
+                    if request_token.is_cancelled:
+                        self._abandon(attempt, "cancelled", request_token.reason)
+                        raise RequestCancelled(request_token.reason)
+                    continue
+                result = attempt["future"].result()
+                with self._lock:
+                    self.stats["completed"] += 1
+                return result
+        finally:
+            request_token.detach()
+
+    def run_hedged(self, func: Callable[[CancelToken, int], Any], timeout: float, hedge_after: float,
+                   cancel_token: Optional[CancelToken] = None,
+                   may_hedge: Optional[Callable[[], bool]] = None) -> Tuple[Any, int]:
+        """`run` gibi çalışır; ilk istek `hedge_after` saniyede bitmezse aynı isteğin bir kopyasını gönderir.
+
+        `func(request_token, attempt_index)` ilk istek için 0, kopya için 1 ile çağrılır. İlk
+        başarılı sonuç kazanır ve diğer isteğin token'ı iptal edilir; `(sonuç, kazanan index)`
+        döndürülür. Bir istek hata verirse diğerinin sonucu beklenir, ikisi de başarısızsa son
+        hata fırlatılır. İlk istek kopya zamanı gelmeden hata verirse kopya gönderilmez.
+        `may_hedge()` False döndürürse (ek harcama sınırı) kopya gönderilmez. Zaman aşımı ilk
+        isteğin başladığı andan itibaren sayılır.
+        """
+        attempts: List[Dict[str, Any]] = []
+
+        def launch(index: int):
+            token = CancelToken(parent=cancel_token)
+            attempt = self._submit(lambda request_token: func(request_token, index), token)
+            attempt.update(index=index, handled=False)
+            attempts.append(attempt)
+
+        def abandon_all(stat_key: Optional[str], reason: str):
+            for position, attempt in enumerate(attempts):
+                if not attempt["handled"]:
+                    self._abandon(attempt, stat_key if position == 0 else None, reason)
+
+        def cancelled() -> bool:
+            return cancel_token is not None and cancel_token.is_cancelled
+
+        launch(0)
+        try:
+            while not attempts[0]["started"].wait(self.POLL_INTERVAL):
+                if cancelled():
+                    abandon_all("cancelled", cancel_token.reason)
+                    raise RequestCancelled(cancel_token.reason)
+
+            now = time.monotonic()
+            deadline = now + timeout
+            hedge_at: Optional[float] = now + hedge_after
+            last_error: Optional[BaseException] = None
+            while True:
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    abandon_all("timed_out", "zaman aşımı")
+                    raise TimeoutError(f"İstek {timeout:.0f} saniye içinde tamamlanmadı")
+                if cancelled():
+                    abandon_all("cancelled", cancel_token.reason)
+                    raise RequestCancelled(cancel_token.reason)
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    if not attempts[0]["handled"] and (may_hedge is None or may_hedge()):
+                        with self._lock:
+                            self.stats["hedged"] += 1
+                        launch(1)
+
+                pending = [attempt for attempt in attempts if not attempt["handled"]]
+                done, _ = wait([attempt["future"] for attempt in pending],
+                               timeout=min(self.POLL_INTERVAL, remaining), return_when=FIRST_COMPLETED)
+                for attempt in pending:
+                    if attempt["future"] not in done:
+                        continue
+                    attempt["handled"] = True
+                    try:
+                        result = attempt["future"].result()
+                    except BaseException as e:
+                        last_error = e
+                        continue
+                    abandon_all(None, "diğer istek önce tamamlandı")
+                    with self._lock:
+                        self.stats["completed"] += 1
+                        if attempt["index"] > 0:
+                            self.stats["hedge_wins"] += 1
+                    return result, attempt["index"]
+                if all(attempt["handled"] for attempt in attempts):
+                    raise last_error
+        finally:
+            for attempt in attempts:
+                attempt["token"].detach()
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """AI yanıtları için diskte tutulan, içerik adresli ve boyut sınırlı LRU önbellek.
+
+    Anahtar; model adı, tamamen biçimlendirilmiş prompt ve generation config'in SHA-256
+    özetidir. Her kayıt `<anahtar>.json` dosyasında saklanır; dosyanın değiştirilme zamanı
+    son kullanım zamanı olarak kullanılır ve boyut aşıldığında en eski kayıtlar silinir.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 100, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, float]]] = None  # anahtar -> {size, last_used}
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "generation_config": generation_config or {}},
+            ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_index(self):
+        """Önbellek dizinini ilk kullanımda tarar (kilit altında çağrılmalı)."""
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not os.path.isdir(self.cache_dir):
+            return
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, filename))
+            except OSError:
+                continue
+            self._entries[filename[:-5]] = {"size": stat.st_size, "last_used": stat.st_mtime}
+
+    def get(self, model_name: str, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Önbellekteki yanıt metnini döndürür; yoksa None."""
+        if not self.enabled:
+            return None
+        key = self.make_key(model_name, prompt, generation_config)
+        with self._lock:
+            self._load_index()
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path_for(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+                now = time.time()
+                os.utime(path, (now, now))  # LRU sırası için son kullanım zamanını güncelle
+                self._entries[key]["last_used"] = now
+            except (OSError, ValueError) as e:
+                print(f"Önbellek kaydı okunamadı, siliniyor: {e}")
+                self._remove_entry(key)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return record.get("response")
+
+    def put(self, model_name: str, prompt: str, response_text: str,
+            generation_config: Optional[Dict[str, Any]] = None):
+        """Yanıtı önbelleğe yazar ve gerekirse eski kayıtları çıkarır."""
+        if not self.enabled or not response_text:
+            return
+        key = self.make_key(model_name, prompt, generation_config)
+        record = {
+            "model": model_name,
+            "created": time.time(),
+            "response": response_text,
+        }
+        with self._lock:
+            self._load_index()
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                path = self._path_for(key)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(record, f, ensure_ascii=False)
+                os.replace(tmp_path, path)  # Yarım yazılmış kayıt bırakma
+                self._entries[key] = {"size": os.path.getsize(path), "last_used": time.time()}
+            except OSError as e:
+                print(f"Önbelleğe yazma hatası: {e}")
+                return
+            self._evict()
+
+    def _evict(self):
+        """Toplam boyut sınırı aşılırsa en uzun süredir kullanılmayan kayıtları siler."""
+        total = sum(entry["size"] for entry in self._entries.values())
+        if total <= self.max_size_bytes:
+            return
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_size_bytes:
+                break
+            total -= entry["size"]
+            self._remove_entry(key)
+
+    def _remove_entry(self, key: str):
+        self._entries.pop(key, None)
+        try:
+            os.remove(self._path_for(key))
+        except OSError:
+            pass
+
+    def clear(self) -> int:
+        """Tüm kayıtları siler; silinen kayıt sayısını döndürür."""
+        with self._lock:
+            self._load_index()
+            count = len(self._entries)
+            for key in list(self._entries):
+                self._remove_entry(key)
+            self.hits = 0
+            self.misses = 0
+            return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load_index()
+            total_requests = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "size_bytes": sum(entry["size"] for entry in self._entries.values()),
+                "max_size_bytes": self.max_size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total_requests) if total_requests else 0.0,
+            }
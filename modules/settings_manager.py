@@ -4,6 +4,15 @@ import sys
 from typing import Dict, Any, Optional
 import datetime
 
+# Analiz türü başına varsayılan modeller; kayıtlı `individual_models` ayarı bunların üzerine yazılır.
+# Masaüstü uygulaması ve arayüzsüz analiz (komut satırı, iş sunucusu) aynı varsayılanları kullanır.
+DEFAULT_INDIVIDUAL_MODELS = {
+    "style_analysis": "gemini-1.5-flash",
+    "grammar_check": "gemini-1.5-flash",
+    "content_review": "gemini-1.5-flash",
+    "novel_context": "gemini-1.5-pro"
+}
+
 def get_base_path():
     """Uygulamanın ana dizinini alır (.exe veya .py için çalışır)."""
     if getattr(sys, 'frozen', False):
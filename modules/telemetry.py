@@ -0,0 +1,189 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class TelemetryStore:
+    """YZ çağrılarının yapılandırılmış kayıtlarını tutan yerel SQLite deposu.
+
+    Her `analyze_chapter` ve `generate_summary` çağrısı tek satır olarak yazılır: model,
+    analiz türü, prompt/yanıt boyutları, sıra bekleme, ağ gecikmesi, ayrıştırma süresi,
+    yeniden deneme sayısı, hata türü ve öneri sayısı. Özet istatistikler (p50/p95 gecikme,
+    verim, hata oranı) bu tablodan hesaplanır.
+    """
+
+    COLUMNS = (
+        "ts", "kind", "model", "analysis_type", "prompt_chars", "prompt_tokens", "response_chars",
+        "queue_wait", "network_latency", "parse_time", "total_time", "retries", "error_type",
+        "suggestion_count", "cached", "streamed", "parse_path", "hedge",
+    )
+    # Şemaya sonradan eklenen sütunlar (eski veritabanlarına ALTER TABLE ile eklenir)
+    ADDED_COLUMNS = {"parse_path": "TEXT", "hedge": "INTEGER"}
+    # `hedge` sütunu: 0 kopya yok, 1 kopya gönderildi ama ilk istek kazandı, 2 kopya kazandı
+    HEDGE_SENT, HEDGE_WON = 1, 2
+    # Onarım gerektiren ayrıştırma yolları (şemalı hızlı yol ve hoşgörülü tek geçiş dışında)
+    REPAIR_PATHS = ("repair", "text")
+
+    def __init__(self, db_path: str, max_rows: int = 50000):
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._inserted = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Bağlantıyı ilk kullanımda açar (kilit altında çağrılmalı)."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_requests (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts REAL NOT NULL,
+                    kind TEXT,
+                    model TEXT,
+                    analysis_type TEXT,
+                    prompt_chars INTEGER,
+                    prompt_tokens INTEGER,
+                    response_chars INTEGER,
+                    queue_wait REAL,
+                    network_latency REAL,
+                    parse_time REAL,
+                    total_time REAL,
+                    retries INTEGER,
+                    error_type TEXT,
+                    suggestion_count INTEGER,
+                    cached INTEGER,
+                    streamed INTEGER,
+                    parse_path TEXT,
+                    hedge INTEGER
+                )
+            """)
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(ai_requests)")}
+            for column, column_type in self.ADDED_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE ai_requests ADD COLUMN {column} {column_type}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ai_requests_ts ON ai_requests (ts)")
+            self._conn.commit()
+        return self._conn
+
+    def record(self, row: Dict[str, Any]):
+        """Bir çağrı kaydı ekler. Telemetri hatası analizi asla bozmaz."""
+        if not self.enabled:
+            return
+        values = dict(row)
+        values.setdefault("ts", time.time())
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    f"INSERT INTO ai_requests ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' for _ in self.COLUMNS)})",
+                    [values.get(column) for column in self.COLUMNS]
+                )
+                self._inserted += 1
+                # Tablo sınırsız büyümesin; arada bir en eski kayıtları at
+                if self._inserted % 500 == 0:
+                    conn.execute(
+                        "DELETE FROM ai_requests WHERE id <= (SELECT MAX(id) FROM ai_requests) - ?", (self.max_rows,)
+                    )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Telemetri kaydı yazılamadı: {e}")
+
+    def fetch(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """`since` zamanından (epoch saniye) sonraki kayıtları zaman sırasıyla döndürür."""
+        query = f"SELECT {', '.join(self.COLUMNS)} FROM ai_requests"
+        params: tuple = ()
+        if since is not None:
+            query += " WHERE ts >= ?"
+            params = (since,)
+        query += " ORDER BY ts"
+        try:
+            with self._lock:
+                rows = self._connect().execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"Telemetri okunamadı: {e}")
+            return []
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    def clear(self) -> int:
+        with self._lock:
+            cursor = self._connect().execute("DELETE FROM ai_requests")
+            self._conn.commit()
+            return cursor.rowcount
+
+    @staticmethod
+    def _percentile(values: List[float], q: float) -> Optional[float]:
+        if not values:
+            return None
+        values = sorted(values)
+        return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+    @classmethod
+    def summarize(cls, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Kayıt grubunun gecikme yüzdelikleri, verim, hata ve onarım oranı.
+
+        Gecikme yüzdelikleri yalnızca ağa giden (önbellekten dönmeyen) başarılı isteklerden
+        hesaplanır; verim, grubun ilk ve son kaydı arasındaki dakika başına çağrıdır. Onarım
+        oranı, ayrıştırılan yanıtlardan onarım zincirine ya da metin ayrıştırmaya düşenlerin payıdır.
+        `hedged` kopyası gönderilen, `hedge_wins` kopyası ilk istekten önce dönen çağrı sayısıdır.
+        """
+        latencies = [r["network_latency"] for r in rows
+                     if not r["error_type"] and not r["cached"] and r["network_latency"] is not None]
+        errors = [r for r in rows if r["error_type"]]
+        parsed = [r for r in rows if r["parse_path"]]
+        parse_times = [r["parse_time"] for r in parsed if r["parse_time"] is not None]
+        span = (rows[-1]["ts"] - rows[0]["ts"]) if len(rows) > 1 else 0
+        return {
+            "count": len(rows),
+            "errors": len(errors),
+            "error_rate": len(errors) / len(rows) if rows else 0.0,
+            "cached": sum(1 for r in rows if r["cached"]),
+            "p50": cls._percentile(latencies, 0.50),
+            "p95": cls._percentile(latencies, 0.95),
+            "per_minute": (len(rows) / (span / 60)) if span > 0 else None,
+            "prompt_tokens": sum(r["prompt_tokens"] or 0 for r in rows),
+            "suggestions": sum(r["suggestion_count"] or 0 for r in rows),
+            "parse_p50": cls._percentile(parse_times, 0.50),
+            "repair_rate": (sum(1 for r in parsed if r["parse_path"] in cls.REPAIR_PATHS) / len(parsed)) if parsed else None,
+            "schema_rate": (sum(1 for r in parsed if r["parse_path"] == "schema") / len(parsed)) if parsed else None,
+            "hedged": sum(1 for r in rows if (r["hedge"] or 0) >= cls.HEDGE_SENT),
+            "hedge_wins": sum(1 for r in rows if r["hedge"] == cls.HEDGE_WON),
+        }
+
+    def get_dashboard_data(self, since: Optional[float] = None, buckets: int = 12) -> Dict[str, Any]:
+        """Pano için genel özet, model/tür kırılımı ve zaman dilimlerine göre seri."""
+        rows = self.fetch(since)
+        by_key: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_key.setdefault(f"{row['model']} • {row['analysis_type']}", []).append(row)
+
+        series = []
+        if rows:
+            start = rows[0]["ts"]
+            width = max(1.0, (rows[-1]["ts"] - start) / buckets)
+            grouped: List[List[Dict[str, Any]]] = [[] for _ in range(buckets)]
+            for row in rows:
+                grouped[min(buckets - 1, int((row["ts"] - start) / width))].append(row)
+            for index, group in enumerate(grouped):
+                summary = self.summarize(group)
+                summary["start"] = start + index * width
+                # Dilimdeki verim, dilim genişliğine göre hesaplanır
+                summary["per_minute"] = len(group) / (width / 60)
+                series.append(summary)
+
+        error_types: Dict[str, int] = {}
+        for row in rows:
+            if row["error_type"]:
+                error_types[row["error_type"]] = error_types.get(row["error_type"], 0) + 1
+
+        return {
+            "overall": self.summarize(rows),
+            "by_key": {key: self.summarize(group) for key, group in sorted(by_key.items())},
+            "series": series,
+            "error_types": error_types,
+        }
@@ -0,0 +1,426 @@
+"""Yerel HTTP analiz iş sunucusu.
+
+Kullanım:
+    python server.py [--host 127.0.0.1] [--port 8765] [--workers 3] [--input-dir romanlar/]
+                     [--set anahtar=değer ...]
+
+Birden fazla editör ya da veri hattı romanlarını tek makineye gönderir. Her gönderim bölüm ×
+faz işlerine ayrılır ve tüm gönderimler aynı işçi havuzunda, aynı `AIIntegration` nesnesiyle
+(dolayısıyla aynı hız sınırlayıcı ve istek havuzuyla) çalışır. Tk katmanı kullanılmaz;
+yalnızca standart kütüphane gerekir.
+
+Uç noktalar:
+    POST   /jobs                 İş gönder. JSON gövde:
+                                   {"novel_path": "...",            --input-dir altındaki .txt/.docx dosyası
+                                    "file_name": "roman.docx",      veya yüklenen dosya adı ve
+                                    "file_base64": "...",             base64 içeriği
+                                    "text": "...",                  veya düz metin
+                                    "project_id": "...",            veya kayıtlı proje klasörü
+                                    "phases": ["grammar_check"],    varsayılan: üç faz
+                                    "split": "number_only", "custom_word": null, "chapters": [1, 2]}
+    GET    /jobs                 İşlerin durumu
+    GET    /jobs/<id>            Tek işin durumu
+    GET    /jobs/<id>/results    Tamamlanan bölüm × faz kayıtları (?format=jsonl ile JSON Lines)
+    DELETE /jobs/<id>            İşi iptal et
+    GET    /projects             Kayıtlı projeler
+    GET    /metrics              Kuyruk, havuz, hız sınırı ve telemetri özetleri
+    GET    /health               Sağlık kontrolü
+
+Sunucu kimlik doğrulaması yapmaz; varsayılan olarak yalnızca yerel adresi dinler. Sunucudaki
+dosyalar (`novel_path`) yalnızca `--input-dir` verildiyse ve o dizin altındaysa okunur.
+"""
+import argparse
+import base64
+import binascii
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from cli import SPLIT_METHODS, parse_setting
+from modules.context_cache import ContextCache
+from modules.headless_analysis import HeadlessAnalyzer
+from modules.request_worker import CancelToken
+from modules.settings_manager import SettingsManager
+from modules.telemetry import TelemetryStore
+
+
+class JobRequestError(ValueError):
+    """Gönderilen iş isteği geçersiz olduğunda fırlatılır (HTTP 400)."""
+
+
+class AnalysisJob:
+    """Bir roman gönderimi: bölüm × faz işleri ve tamamlanan kayıtları."""
+
+    def __init__(self, source: str, phases: List[str], task_count: int):
+        self.id = uuid.uuid4().hex[:12]
+        self.source = source
+        self.phases = phases
+        self.cancel_token = CancelToken()
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.tasks_total = task_count
+        self.tasks_done = 0
+        self.tasks_failed = 0
+        self.results: List[Dict[str, Any]] = []
+
+    @property
+    def status(self) -> str:
+        if self.cancel_token.is_cancelled:
+            return "cancelled"
+        if self.finished is not None:
+            return "done"
+        return "running" if self.started is not None else "queued"
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished or time.time()
+        return {
+            "id": self.id,
+            "source": self.source,
+            "phases": self.phases,
+            "status": self.status,
+            "tasks_total": self.tasks_total,
+            "tasks_done": self.tasks_done,
+            "tasks_failed": self.tasks_failed,
+            "suggestions": sum(record["suggestion_count"] for record in self.results),
+            "created": self.created,
+            "queue_seconds": round((self.started or end) - self.created, 3),
+            "run_seconds": round(end - self.started, 3) if self.started else None,
+        }
+
+
+class JobServer:
+    """İşleri kuyruğa alır ve ortak işçi havuzunda çalıştırır."""
+
+    # Bellekte tutulan en fazla bitmiş iş; daha eskileri silinir
+    MAX_FINISHED_JOBS = 200
+    SUPPORTED_EXTENSIONS = (".txt", ".docx")
+
+    def __init__(self, analyzer: HeadlessAnalyzer, workers: int = 3, input_dir: Optional[str] = None):
+        self.analyzer = analyzer
+        self.workers = max(1, int(workers))
+        # `novel_path` yalnızca bu dizin altındaki dosyaları gösterebilir; None ise kapalıdır
+        self.input_dir = os.path.realpath(input_dir) if input_dir else None
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job-worker")
+        self._lock = threading.Lock()
+        self.jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self.started = time.time()
+        self.stats = {"queued_tasks": 0, "running_tasks": 0, "completed_tasks": 0, "failed_tasks": 0}
+
+    def submit(self, request: Dict[str, Any]) -> AnalysisJob:
+        """İsteği bölüm × faz işlerine ayırıp kuyruğa alır."""
+        phases = request.get("phases") or list(HeadlessAnalyzer.PHASES)
+        if not isinstance(phases, list) or any(not isinstance(phase, str) or phase not in HeadlessAnalyzer.PHASES
+                                               for phase in phases):
+            raise JobRequestError(f"Geçersiz faz listesi; kullanılabilir: {', '.join(HeadlessAnalyzer.PHASES)}")
+        selected = request.get("chapters")
+        if selected is not None and (not isinstance(selected, list) or any(
+                not isinstance(number, int) or isinstance(number, bool) for number in selected)):
+            raise JobRequestError("chapters bölüm numaralarından (tam sayı) oluşan bir liste olmalı")
+        file_manager, chapters, source = self._load(request)
+        if selected:
+            selected = set(selected)
+            chapters = [chapter for chapter in chapters if chapter.chapter_number in selected]
+        tasks = [(chapter, phase) for phase in phases for chapter in chapters if chapter.content.strip()]
+        if not tasks:
+            raise JobRequestError("Analiz edilecek bölüm bulunamadı")
+
+        job = AnalysisJob(source, phases, len(tasks))
+        with self._lock:
+            self.jobs[job.id] = job
+            self.stats["queued_tasks"] += len(tasks)
+            self._prune_locked()
+        for chapter, phase in tasks:
+            self._executor.submit(self._run_task, job, file_manager, chapter, phase)
+        print(f"📥 İş {job.id}: {source}, {len(chapters)} bölüm × {len(phases)} faz = {len(tasks)} iş")
+        return job
+
+    def _load(self, request: Dict[str, Any]):
+        split = request.get("split", "number_only")
+        if split not in SPLIT_METHODS:
+            raise JobRequestError(f"Geçersiz bölme yöntemi: {split}")
+        custom_word = request.get("custom_word")
+        if custom_word is not None and not isinstance(custom_word, str):
+            raise JobRequestError("custom_word metin olmalı")
+        try:
+            if request.get("project_id"):
+                file_manager, chapters = self.analyzer.load_project(str(request["project_id"]))
+                return file_manager, chapters, f"proje:{request['project_id']}"
+            if request.get("novel_path"):
+                path = self._resolve_input_path(str(request["novel_path"]))
+                file_manager, chapters = self.analyzer.load_chapters(path, split, custom_word)
+                return file_manager, chapters, os.path.basename(path)
+            if request.get("file_base64") or request.get("text") is not None:
+                return self._load_upload(request, split, custom_word)
+        except (OSError, ValueError) as e:
+            raise JobRequestError(str(e))
+        raise JobRequestError("novel_path, file_base64, text veya project_id gerekli")
+
+    def _check_extension(self, path: str):
+        if os.path.splitext(path)[1].lower() not in self.SUPPORTED_EXTENSIONS:
+            raise JobRequestError(f"Yalnızca {', '.join(self.SUPPORTED_EXTENSIONS)} dosyaları kabul edilir")
+
+    def _resolve_input_path(self, novel_path: str) -> str:
+        """`novel_path`'i girdi dizini içinde çözer; dizin dışını ve desteklenmeyen türleri reddeder.
+
+        Sunucu kimlik doğrulaması yapmadığı için keyfi dosyalar (ör. /etc/passwd) okunup YZ'ye
+        gönderilmesin diye `HeadlessAnalyzer.load_project` ile aynı realpath kontrolü yapılır.
+        """
+        if self.input_dir is None:
+            raise JobRequestError("Sunucu --input-dir olmadan başlatıldı; novel_path kapalı, dosyayı file_base64 ile gönderin")
+        path = os.path.realpath(os.path.join(self.input_dir, novel_path))
+        if os.path.commonpath([path, self.input_dir]) != self.input_dir or not os.path.isfile(path):
+            raise JobRequestError(f"Dosya girdi dizininde bulunamadı: {novel_path}")
+        self._check_extension(path)
+        return path
+
+    def _load_upload(self, request: Dict[str, Any], split: str, custom_word: Optional[str]):
+        """Yüklenen içeriği geçici dosyaya yazıp `load_novel` ile okur (.docx biçimlendirmesi korunur)."""
+        file_name = os.path.basename(str(request.get("file_name") or "roman.txt"))
+        self._check_extension(file_name)
+        if request.get("file_base64"):
+            try:
+                data = base64.b64decode(request["file_base64"], validate=True)
+            except (binascii.Error, ValueError):
+                raise JobRequestError("file_base64 çözülemedi")
+        else:
+            data = str(request["text"]).encode("utf-8")
+        temp_dir = tempfile.mkdtemp(prefix="aieditor-job-")
+        try:
+            path = os.path.join(temp_dir, file_name)
+            with open(path, "wb") as file:
+                file.write(data)
+            file_manager, chapters = self.analyzer.load_chapters(path, split, custom_word)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        return file_manager, chapters, file_name
+
+    def _run_task(self, job: AnalysisJob, file_manager, chapter, phase: str):
+        with self._lock:
+            self.stats["queued_tasks"] -= 1
+            if job.cancel_token.is_cancelled:
+                return
+            self.stats["running_tasks"] += 1
+            if job.started is None:
+                job.started = time.time()
+        try:
+            record = self.analyzer.analyze(file_manager, chapter, phase, job.cancel_token)
+        except Exception as e:
+            record = {"chapter_number": chapter.chapter_number, "chapter_title": chapter.title, "analysis_type": phase,
+                      "status": "error", "error_type": "system_error", "error": str(e), "suggestion_count": 0}
+        with self._lock:
+            self.stats["running_tasks"] -= 1
+            if record.get("error_type") == "cancelled":
+                return
+            failed = record["status"] != "ok"
+            self.stats["failed_tasks" if failed else "completed_tasks"] += 1
+            job.tasks_failed += failed
+            job.tasks_done += 1
+            job.results.append(record)
+            if job.tasks_done == job.tasks_total:
+                job.finished = time.time()
+                print(f"✅ İş {job.id} tamamlandı: {job.tasks_done} iş, {job.tasks_failed} başarısız")
+
+    def cancel(self, job_id: str) -> Optional[AnalysisJob]:
+        """İşi iptal eder: kuyruktaki işler başlamaz, çalışan istekler bırakılır."""
+        job = self.get(job_id)
+        if job is not None and job.finished is None:
+            job.cancel_token.cancel("iş iptal edildi")
+            with self._lock:
+                job.finished = time.time()
+            print(f"⏹️ İş {job.id} iptal edildi")
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def results(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return list(job.results) if job is not None else None
+
+    def _prune_locked(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished is not None]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            job_states: Dict[str, int] = {}
+            for job in self.jobs.values():
+                job_states[job.status] = job_states.get(job.status, 0) + 1
+        ai_integration = self.analyzer.ai_integration
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "workers": self.workers,
+            "tasks": stats,
+            "jobs": job_states,
+            "analyzer": self.analyzer.get_stats(),
+            "hedging": ai_integration.get_hedge_stats(),
+            "circuit_breakers": ai_integration.get_circuit_breaker_stats(),
+            "telemetry": TelemetryStore.summarize(ai_integration.telemetry.fetch(since=self.started)),
+        }
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            job.cancel_token.cancel("sunucu kapatılıyor")
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """JSON uç noktaları; iş mantığı `JobServer`'dadır."""
+
+    server_version = "AIEditorJobServer/1.0"
+    job_server: JobServer = None  # make_server tarafından atanır
+    MAX_BODY_BYTES = 64 * 1024 * 1024
+
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error_json(self, status: int, message: str):
+        self._send_json(status, {"error": message})
+
+    def _path_parts(self) -> List[str]:
+        return [part for part in urlparse(self.path).path.split("/") if part]
+
+    def do_GET(self):
+        parts = self._path_parts()
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", "model_ready": self.job_server.analyzer.ai_integration.model is not None})
+        elif parts == ["metrics"]:
+            self._send_json(200, self.job_server.metrics())
+        elif parts == ["projects"]:
+            projects = self.job_server.analyzer.settings_manager.get_project_list()
+            self._send_json(200, [dict(project, id=os.path.basename(os.path.dirname(project["file_path"])))
+                                  for project in projects])
+        elif parts == ["jobs"]:
+            self._send_json(200, self.job_server.list_jobs())
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.job_server.get(parts[1])
+            if job is None:
+                self._send_error_json(404, "İş bulunamadı")
+            else:
+                self._send_json(200, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "results":
+            results = self.job_server.results(parts[1])
+            if results is None:
+                self._send_error_json(404, "İş bulunamadı")
+            elif parse_qs(urlparse(self.path).query).get("format") == ["jsonl"]:
+                body = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in results).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self._send_json(200, results)
+        else:
+            self._send_error_json(404, "Bilinmeyen uç nokta")
+
+    def do_POST(self):
+        if self._path_parts() != ["jobs"]:
+            self._send_error_json(404, "Bilinmeyen uç nokta")
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > self.MAX_BODY_BYTES:
+            self._send_error_json(400, "Gövde boş ya da çok büyük")
+            return
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+            if not isinstance(request, dict):
+                raise JobRequestError("Gövde bir JSON nesnesi olmalı")
+            job = self.job_server.submit(request)
+        except (JobRequestError, ValueError) as e:
+            self._send_error_json(400, str(e))
+            return
+        self._send_json(202, job.to_dict())
+
+    def do_DELETE(self):
+        parts = self._path_parts()
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send_error_json(404, "Bilinmeyen uç nokta")
+            return
+        job = self.job_server.cancel(parts[1])
+        if job is None:
+            self._send_error_json(404, "İş bulunamadı")
+        else:
+            self._send_json(200, job.to_dict())
+
+
+def make_server(job_server: JobServer, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """`job_server`'a bağlı HTTP sunucusunu oluşturur (henüz dinlemeye başlamaz)."""
+    handler = type("BoundJobRequestHandler", (JobRequestHandler,), {"job_server": job_server})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    return httpd
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="Aynı anda çalışan bölüm × faz işi "
+                                                    "(varsayılan: full_analysis_max_workers ayarı)")
+    parser.add_argument("--input-dir", help="novel_path ile okunabilecek romanların dizini "
+                                            "(verilmezse yalnızca yüklenen dosyalar kabul edilir)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="ANAHTAR=DEĞER",
+                        help="Ayarı yalnızca bu çalıştırma için değiştir")
+    args = parser.parse_args(argv)
+
+    settings = SettingsManager()
+    for assignment in args.overrides:
+        key, value = parse_setting(assignment)
+        settings.settings[key] = value
+    settings.settings["last_project"] = None
+    workers = args.workers or int(settings.get_setting("full_analysis_max_workers", 3))
+    # Her işçi başka bir romanın bağlamını kullanabilir; bağlam önbelleği eşzamanlı işlerin
+    # kayıtlarını sırayla birbirine çıkarttırmasın diye en az işçi sayısı kadar kayıt tutar
+    settings.settings["context_cache_max_contexts"] = max(
+        workers, settings.get_setting("context_cache_max_contexts", ContextCache.DEFAULT_MAX_CONTEXTS))
+    analyzer = HeadlessAnalyzer(settings)
+    if not analyzer.initialize_ai():
+        print("YZ modeli yapılandırılamadı", file=sys.stderr)
+        return 2
+    # İstek havuzu en az işçi sayısı kadar olmalı; pencereler ek istek açabilir
+    analyzer.ai_integration.request_worker.configure(max(workers, settings.get_setting("ai_max_in_flight", 8)))
+
+    if args.input_dir and not os.path.isdir(args.input_dir):
+        parser.error(f"Girdi dizini bulunamadı: {args.input_dir}")
+    job_server = JobServer(analyzer, workers, args.input_dir)
+    httpd = make_server(job_server, args.host, args.port)
+    print(f"🌐 İş sunucusu http://{args.host}:{args.port} adresinde, {workers} işçiyle çalışıyor")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("Sunucu kapatılıyor...")
+    finally:
+        httpd.server_close()
+        job_server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
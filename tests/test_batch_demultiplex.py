@@ -0,0 +1,56 @@
+import unittest
+
+from modules.ai_integration import AIIntegration
+
+
+CHAPTERS = [
+    ("B1", "Ali *B*eve*B* geldi.\nKapı açıktı."),
+    ("B2", "Ayşe bekledi.   Kapı açıktı."),
+]
+
+
+def suggestion(original: str, chapter_id=None) -> dict:
+    item = {"original_sentence": original, "suggested_sentence": original + "!"}
+    if chapter_id is not None:
+        item["chapter_id"] = chapter_id
+    return item
+
+
+class BatchDemultiplexTest(unittest.TestCase):
+    def setUp(self):
+        # Yalnızca metin temizleme kullanılır; ayar ve model gerektirmez
+        self.ai = AIIntegration.__new__(AIIntegration)
+
+    def demultiplex(self, *suggestions):
+        return self.ai._demultiplex_batch_suggestions(list(suggestions), CHAPTERS, "grammar_check")
+
+    def test_routes_by_chapter_id(self):
+        routed = self.demultiplex(suggestion("Ali eve geldi.", "B1"), suggestion("Ayşe bekledi.", "B2"))
+        self.assertEqual([s["original_sentence"] for s in routed["B1"]], ["Ali eve geldi."])
+        self.assertEqual([s["original_sentence"] for s in routed["B2"]], ["Ayşe bekledi."])
+        self.assertNotIn("chapter_id", routed["B1"][0])
+
+    def test_wrong_or_missing_id_is_routed_by_sentence(self):
+        routed = self.demultiplex(suggestion("Ayşe bekledi.", "B1"), suggestion("Ali eve geldi."),
+                                  suggestion("Ali eve geldi.", "B7"))
+        self.assertEqual(len(routed["B1"]), 2)
+        self.assertEqual([s["original_sentence"] for s in routed["B2"]], ["Ayşe bekledi."])
+
+    def test_ambiguous_sentence_keeps_valid_id(self):
+        routed = self.demultiplex(suggestion("Kapı kapalıydı.", "B2"), suggestion("Kapı açıktı.", "B1"))
+        self.assertEqual(len(routed["B1"]), 1)
+        self.assertEqual(len(routed["B2"]), 1)
+
+    def test_unroutable_suggestion_is_dropped(self):
+        routed = self.demultiplex(suggestion("Kapı açıktı."), suggestion("Hiç geçmeyen cümle.", "B9"))
+        self.assertEqual(routed, {"B1": [], "B2": []})
+
+    def test_numbering_restarts_per_chapter(self):
+        routed = self.demultiplex(suggestion("Ali eve geldi.", "B1"), suggestion("Ayşe bekledi.", "B2"),
+                                  suggestion("Kapı açıktı.", "B1"))
+        self.assertEqual([s["id"] for s in routed["B1"]], ["grammar_check_1", "grammar_check_2"])
+        self.assertEqual([s["title"] for s in routed["B2"]], ["1. Öneri"])
+
+
+if __name__ == "__main__":
+    unittest.main()
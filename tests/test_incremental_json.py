@@ -0,0 +1,56 @@
+import json
+import unittest
+
+from modules.incremental_json import IncrementalJSONArrayParser
+
+
+SUGGESTIONS = [
+    {"original_sentence": "Ali geldi.", "suggested_sentence": "Ali eve geldi.", "explanation": "Yer eksik {}[]"},
+    {"original_sentence": "Ona \"gel\" dedi.", "suggested_sentence": "Ona \"gel\" dedi ve bekledi.", "explanation": ""},
+]
+
+
+class IncrementalJSONArrayParserTest(unittest.TestCase):
+    def feed_all(self, parser, chunks):
+        return [item for chunk in chunks for item in parser.feed(chunk)]
+
+    def test_objects_emitted_as_they_complete(self):
+        text = "```json\n" + json.dumps(SUGGESTIONS, ensure_ascii=False) + "\n```"
+        parser = IncrementalJSONArrayParser()
+        emitted_at = []
+        for i, char in enumerate(text):
+            if parser.feed(char):
+                emitted_at.append(i)
+        self.assertEqual(len(emitted_at), 2)
+        # İlk nesne dizinin sonu beklenmeden, kapanış parantezi gelir gelmez çıkarılır
+        self.assertLess(emitted_at[0], text.index(", {"))
+        self.assertTrue(parser.finished)
+
+    def test_chunked_feed_matches_full_parse(self):
+        text = json.dumps(SUGGESTIONS, ensure_ascii=False)
+        for size in (1, 3, 7, len(text)):
+            parser = IncrementalJSONArrayParser()
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            self.assertEqual(self.feed_all(parser, chunks), SUGGESTIONS)
+
+    def test_brackets_in_preamble_are_ignored(self):
+        parser = IncrementalJSONArrayParser()
+        items = self.feed_all(parser, ["Notlar [taslak]: ", json.dumps(SUGGESTIONS[:1], ensure_ascii=False)])
+        self.assertEqual(items, SUGGESTIONS[:1])
+
+    def test_text_after_array_is_ignored(self):
+        parser = IncrementalJSONArrayParser()
+        items = self.feed_all(parser, [json.dumps(SUGGESTIONS[:1]), ' [{"original_sentence": "x"}]'])
+        self.assertEqual(items, SUGGESTIONS[:1])
+        self.assertEqual(parser.feed('{"a": 1}'), [])
+
+    def test_broken_object_is_counted_and_skipped(self):
+        parser = IncrementalJSONArrayParser()
+        items = self.feed_all(parser, ['[{"original_sentence": "a",}, ', json.dumps(SUGGESTIONS[0]), "]"])
+        self.assertEqual(items, SUGGESTIONS[:1])
+        self.assertEqual(parser.failed_objects, 1)
+        self.assertEqual(parser.emitted_objects, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from modules.json_extractor import TolerantJSONExtractor
+
+
+class TolerantJSONExtractorTest(unittest.TestCase):
+    def setUp(self):
+        self.extractor = TolerantJSONExtractor()
+
+    def test_valid_array_with_surrounding_text(self):
+        text = 'İşte öneriler:\n```json\n[{"original_sentence": "a", "suggested_sentence": "b"}]\n```\nBaşka not yok.'
+        self.assertEqual(self.extractor.extract(text), [{"original_sentence": "a", "suggested_sentence": "b"}])
+        self.assertTrue(self.extractor.array_found)
+        self.assertFalse(self.extractor.truncated)
+
+    def test_trailing_commas(self):
+        text = '[{"original_sentence": "a", "suggested_sentence": "b",}, {"original_sentence": "c", "suggested_sentence": "d"},]'
+        self.assertEqual([item["suggested_sentence"] for item in self.extractor.extract(text)], ["b", "d"])
+
+    def test_unescaped_quotes_inside_string(self):
+        text = '[{"original_sentence": "Ona "gel" dedi.", "suggested_sentence": "Ona \\"gel\\" dedi."}]'
+        (item,) = self.extractor.extract(text)
+        self.assertEqual(item["original_sentence"], 'Ona "gel" dedi.')
+        self.assertEqual(item["suggested_sentence"], 'Ona "gel" dedi.')
+
+    def test_raw_newlines_and_control_characters(self):
+        text = '[{"original_sentence": "bir\nsatır\u200b", "suggested_sentence": "iki\tsatır"}]'
+        (item,) = self.extractor.extract(text)
+        self.assertEqual(item, {"original_sentence": "bir\nsatır", "suggested_sentence": "iki\tsatır"})
+
+    def test_truncated_array_keeps_complete_objects(self):
+        text = ('[{"original_sentence": "a", "suggested_sentence": "b"}, '
+                '{"original_sentence": "c", "suggested_sentence": "yarıda kes')
+        self.assertEqual(self.extractor.extract(text), [{"original_sentence": "a", "suggested_sentence": "b"}])
+        self.assertTrue(self.extractor.truncated)
+
+    def test_truncated_object_after_complete_value_is_closed(self):
+        text = '[{"original_sentence": "a", "suggested_sentence": "b", "severity":'
+        self.assertEqual(self.extractor.extract(text),
+                         [{"original_sentence": "a", "suggested_sentence": "b", "severity": None}])
+        self.assertTrue(self.extractor.truncated)
+
+    def test_broken_object_does_not_affect_others(self):
+        text = '[{"original_sentence": "a" "suggested_sentence": "b"}, {"original_sentence": "c", "suggested_sentence": "d"}]'
+        self.assertEqual(self.extractor.extract(text), [{"original_sentence": "c", "suggested_sentence": "d"}])
+        self.assertEqual(self.extractor.get_stats()["failed_objects"], 1)
+
+    def test_no_json(self):
+        self.assertEqual(self.extractor.extract("Bu metinde hata bulunamadı."), [])
+        self.assertFalse(self.extractor.array_found)
+
+
+if __name__ == "__main__":
+    unittest.main()
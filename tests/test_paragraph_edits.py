@@ -0,0 +1,86 @@
+import unittest
+
+from modules.editorial_process import EditorialProcess, EditorialSuggestion
+from modules.file_manager import Chapter
+
+
+CONTENT = (
+    "Ali eve geldi ve kapıyı açtı. Kapı açıktı.\n"
+    "\n"
+    "Ayşe bekledi ve pencereden baktı. Yağmur yağıyordu."
+)
+
+
+def make_suggestion(resolved: dict) -> EditorialSuggestion:
+    suggestion = EditorialSuggestion("grammar_check_1", "grammar_check", "1. Öneri", "", "medium",
+                                     resolved.get("location", ""), resolved["suggested_sentence"])
+    suggestion.original_sentence = resolved["original_sentence"]
+    suggestion.suggested_sentence = resolved["suggested_sentence"]
+    suggestion.paragraph_edit = resolved["paragraph_edit"]
+    return suggestion
+
+
+class ParagraphEditTest(unittest.TestCase):
+    def setUp(self):
+        self.process = EditorialProcess()
+        self.chapter = Chapter("Bölüm 1", CONTENT, 1)
+        self.paragraphs = CONTENT.split("\n")
+
+    def resolve(self, *suggestions):
+        return self.process.resolve_paragraph_edits([dict(s) for s in suggestions], self.paragraphs, self.paragraphs)
+
+    def test_resolve_expands_span_to_sentence(self):
+        resolved = self.resolve({"paragraph_id": "P3", "original_sentence": "baktı", "suggested_sentence": "bakıyordu",
+                                 "span_start": 24})
+        self.assertEqual(len(resolved), 1)
+        self.assertEqual(resolved[0]["original_sentence"], "Ayşe bekledi ve pencereden baktı.")
+        self.assertEqual(resolved[0]["suggested_sentence"], "Ayşe bekledi ve pencereden bakıyordu.")
+        edit = resolved[0]["paragraph_edit"]
+        self.assertEqual((edit["index"], edit["start"], edit["end"]), (2, 27, 32))
+        self.assertEqual(edit["fingerprint"], EditorialProcess._paragraph_fingerprint(self.paragraphs[2]))
+        self.assertNotIn("paragraph_id", resolved[0])
+
+    def test_resolve_skips_invalid_and_out_of_range_ids(self):
+        resolved = self.resolve(
+            {"paragraph_id": "P9", "original_sentence": "Ali", "suggested_sentence": "Veli"},
+            {"paragraph_id": "Px", "original_sentence": "Ali", "suggested_sentence": "Veli"},
+            {"paragraph_id": "P1", "original_sentence": "yok böyle", "suggested_sentence": "x"},
+        )
+        self.assertEqual(resolved, [])
+
+    def test_two_edits_in_same_paragraph(self):
+        first, second = self.resolve(
+            {"paragraph_id": "P1", "original_sentence": "geldi", "suggested_sentence": "koşarak geldi", "span_start": 8},
+            {"paragraph_id": "P1", "original_sentence": "açıktı", "suggested_sentence": "kapalıydı", "span_start": 35},
+        )
+        self.assertTrue(self.process.apply_paragraph_edit(self.chapter, make_suggestion(first)))
+        # İkinci aralık ilk değişiklikten önce hesaplandı; paragraf yine tanınmalı
+        self.assertTrue(self.process.apply_paragraph_edit(self.chapter, make_suggestion(second)))
+        self.assertEqual(self.chapter.content.split("\n")[0], "Ali eve koşarak geldi ve kapıyı açtı. Kapı kapalıydı.")
+
+    def test_moved_paragraph_is_found_by_fingerprint(self):
+        (resolved,) = self.resolve({"paragraph_id": "P3", "original_sentence": "Yağmur", "suggested_sentence": "Kar",
+                                    "span_start": 35})
+        self.chapter.content = "Yeni eklenen satır.\n" + self.chapter.content
+        self.assertTrue(self.process.apply_paragraph_edit(self.chapter, make_suggestion(resolved)))
+        self.assertEqual(self.chapter.content.split("\n")[3], "Ayşe bekledi ve pencereden baktı. Kar yağıyordu.")
+
+    def test_fingerprint_mismatch_falls_back_to_sentence(self):
+        (resolved,) = self.resolve({"paragraph_id": "P1", "original_sentence": "açıktı", "suggested_sentence": "kapalıydı",
+                                    "span_start": 35})
+        self.chapter.content = self.chapter.content.replace("Ali eve geldi", "Ali eve yorgun geldi")
+        self.assertTrue(self.process.apply_paragraph_edit(self.chapter, make_suggestion(resolved)))
+        self.assertEqual(self.chapter.content.split("\n")[0], "Ali eve yorgun geldi ve kapıyı açtı. Kapı kapalıydı.")
+
+    def test_changed_paragraph_does_not_edit_other_paragraph(self):
+        # "ve" her iki paragrafta da geçiyor; değişen paragraf yerine ilk paragraf düzeltilmemeli
+        (resolved,) = self.resolve({"paragraph_id": "P3", "original_sentence": "ve", "suggested_sentence": "ve sonra",
+                                    "span_start": 13})
+        self.chapter.content = self.chapter.content.replace("Ayşe bekledi ve pencereden baktı.", "Ayşe pencereden baktı.")
+        before = self.chapter.content
+        self.assertFalse(self.process.apply_paragraph_edit(self.chapter, make_suggestion(resolved)))
+        self.assertEqual(self.chapter.content, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from modules.rate_limiter import RateLimiter, TokenBucket
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_refill_is_capped_at_capacity(self):
+        bucket = TokenBucket(capacity=10, refill_per_second=2)
+        bucket.drain()
+        bucket.refill(bucket.last_refill + 3)
+        self.assertAlmostEqual(bucket.tokens, 6)
+        bucket.refill(bucket.last_refill + 100)
+        self.assertEqual(bucket.tokens, 10)
+
+    def test_time_until(self):
+        bucket = TokenBucket(capacity=10, refill_per_second=2)
+        bucket.consume(10)
+        self.assertAlmostEqual(bucket.time_until(4), 2)
+        # Kapasiteden büyük istek kovanın dolmasını bekler, sonsuza kadar değil
+        self.assertAlmostEqual(bucket.time_until(50), 5)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_requests_per_minute_budget(self):
+        limiter = RateLimiter(requests_per_minute=2)
+        self.assertEqual(limiter.acquire("model"), 0.0)
+        self.assertEqual(limiter.acquire("model"), 0.0)
+        # Dakikada 2 istek: bir sonraki için yaklaşık 30 sn beklenmeli
+        self.assertAlmostEqual(limiter.get_wait_time("model"), 30, delta=0.5)
+        self.assertEqual(limiter.get_wait_time("other-model"), 0.0)
+
+    def test_tokens_per_minute_budget_and_model_limits(self):
+        limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=600,
+                              model_limits={"small": {"tpm": 60}})
+        limiter.acquire("small", tokens=60)
+        # Token bütçesi bitti: bekleme gerekir, iptal edilince bekleme kaydı temizlenir
+        with self.assertRaises(InterruptedError):
+            limiter.acquire("small", tokens=30, cancel_check=lambda: True)
+        self.assertEqual(limiter.get_wait_time(), 0.0)
+        # Diğer modelin bütçesi ayrıdır
+        self.assertEqual(limiter.acquire("big", tokens=60, cancel_check=lambda: True), 0.0)
+
+    def test_quota_error_applies_retry_after(self):
+        limiter = RateLimiter()
+        cooldown = limiter.report_quota_error("model", Exception("429 Too Many Requests, retry-after: 12"))
+        self.assertEqual(cooldown, 12)
+        self.assertAlmostEqual(limiter.get_wait_time("model"), 12, delta=0.5)
+
+    def test_quota_error_without_retry_after_uses_default(self):
+        limiter = RateLimiter()
+        self.assertEqual(limiter.report_quota_error("model", Exception("quota exceeded")),
+                         RateLimiter.DEFAULT_QUOTA_COOLDOWN)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(RateLimiter.parse_retry_after("retry_delay {\n  seconds: 41\n}"), 41)
+        self.assertEqual(RateLimiter.parse_retry_after('{"Retry-After": "7"}'), 7)
+        self.assertEqual(RateLimiter.parse_retry_after('"retryDelay": "2.5s"'), 2.5)
+        self.assertEqual(RateLimiter.parse_retry_after("Please retry in 3 s."), 3)
+        self.assertIsNone(RateLimiter.parse_retry_after("bilinmeyen hata"))
+
+    def test_is_quota_error(self):
+        self.assertTrue(RateLimiter.is_quota_error(Exception("429 Resource has been exhausted")))
+        self.assertTrue(RateLimiter.is_quota_error(Exception("RESOURCE_EXHAUSTED")))
+        self.assertFalse(RateLimiter.is_quota_error(Exception("API_KEY_INVALID")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import threading
+import time
+import unittest
+
+from modules.request_worker import RequestCancelled, CancelToken, RequestWorker
+
+
+class RequestWorkerTimeoutTest(unittest.TestCase):
+    def setUp(self):
+        self.worker = RequestWorker(max_in_flight=2)
+
+    def test_timeout_raised_by_func_is_not_treated_as_poll_timeout(self):
+        def func(request_token):
+            raise TimeoutError("sunucu zaman aşımı")
+
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError) as raised:
+            self.worker.run(func, timeout=3)
+        self.assertEqual(str(raised.exception), "sunucu zaman aşımı")
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(self.worker.get_stats()["timed_out"], 0)
+
+    def test_slow_func_times_out(self):
+        def func(request_token):
+            request_token.wait(5)
+
+        with self.assertRaises(TimeoutError):
+            self.worker.run(func, timeout=0.3)
+        self.assertEqual(self.worker.get_stats()["timed_out"], 1)
+
+    def test_cancel_token_cancels_request(self):
+        cancel_token = CancelToken()
+        timer = threading.Timer(0.2, cancel_token.cancel, args=("kullanıcı iptal etti",))
+
+        def func(request_token):
+            time.sleep(1)
+
+        timer.start()
+        with self.assertRaises(RequestCancelled):
+            self.worker.run(func, timeout=3, cancel_token=cancel_token)
+        timer.join()
+        self.assertEqual(self.worker.get_stats()["cancelled"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
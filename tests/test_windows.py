@@ -0,0 +1,60 @@
+import unittest
+
+from modules.editorial_process import EditorialProcess
+from modules.rate_limiter import RateLimiter
+
+
+def paragraph(number: int) -> str:
+    return f"Paragraf {number:02d}: " + "kelime " * 4  # ~11 token
+
+
+class SplitIntoWindowsTest(unittest.TestCase):
+    def setUp(self):
+        self.process = EditorialProcess()
+        self.process.chunk_settings.update(token_budget=30, overlap_tokens=12)
+
+    def test_short_content_is_single_window(self):
+        self.assertEqual(self.process.split_into_windows("Kısa bölüm."), ["Kısa bölüm."])
+
+    def test_windows_respect_budget_and_overlap(self):
+        paragraphs = [paragraph(i) for i in range(1, 8)]
+        windows = self.process.split_into_windows("\n".join(paragraphs))
+        self.assertGreater(len(windows), 1)
+        for window in windows:
+            self.assertLessEqual(sum(RateLimiter.estimate_tokens(p) for p in window.split("\n")), 30)
+        for previous, current in zip(windows, windows[1:]):
+            self.assertEqual(previous.split("\n")[-1], current.split("\n")[0])
+        covered = {p for window in windows for p in window.split("\n")}
+        self.assertEqual(covered, set(paragraphs))
+
+    def test_oversized_paragraph_is_not_split(self):
+        long_paragraph = "uzun " * 60
+        windows = self.process.split_into_windows("\n".join([paragraph(1), long_paragraph, paragraph(2)]))
+        self.assertIn(long_paragraph, [p for window in windows for p in window.split("\n")])
+        self.assertEqual(windows[-1].split("\n")[-1], paragraph(2))
+
+
+class MergeWindowSuggestionsTest(unittest.TestCase):
+    def setUp(self):
+        self.process = EditorialProcess()
+
+    def test_overlap_duplicates_are_dropped_and_renumbered(self):
+        merged = self.process._merge_window_suggestions([
+            [{"original_sentence": "Ali geldi."}, {"original_sentence": "Kapı  açıktı."}],
+            [{"original_sentence": "kapı açıktı."}, {"original_sentence": "Ayşe bekledi."}],
+            None,
+        ], "style_analysis")
+        self.assertEqual([s["original_sentence"] for s in merged], ["Ali geldi.", "Kapı  açıktı.", "Ayşe bekledi."])
+        self.assertEqual([s["id"] for s in merged], ["style_analysis_1", "style_analysis_2", "style_analysis_3"])
+        self.assertEqual(merged[2]["title"], "3. Öneri")
+
+    def test_same_span_in_different_paragraphs_is_kept(self):
+        merged = self.process._merge_window_suggestions([
+            [{"paragraph_id": "P1", "original_sentence": "ve"}],
+            [{"paragraph_id": "P4", "original_sentence": "ve"}, {"paragraph_id": "P1", "original_sentence": "ve"}],
+        ], "grammar_check")
+        self.assertEqual([s["paragraph_id"] for s in merged], ["P1", "P4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -109,6 +109,7 @@ class UIManager:
         settings_menu.add_command(label="Öneri Geçmişi", command=self.app.show_suggestion_history)
         settings_menu.add_separator()
         settings_menu.add_command(label="Hata Ayıklama Konsolu", command=self.app.open_debug_console)
+        settings_menu.add_command(label="YZ İstek Panosu", command=self.app.open_telemetry_dashboard)
         settings_menu.add_separator()
         settings_menu.add_command(label="Roman Bağlamını Görüntüle", command=self.app.show_novel_context)
         settings_menu.add_separator()
@@ -153,6 +154,7 @@ class UIManager:
         self.app.progress_bar.pack(fill=tk.X, pady=5)
         self.app.progress_label = ttk.Label(self.app.progress_frame, text="", font=('Arial', 9))
         self.app.progress_label.pack()
+        ttk.Button(self.app.progress_frame, text="⏹ Analizi İptal Et", command=self.app.cancel_analysis).pack(pady=(2, 0))
         
         # Chapter content display area
         content_frame = ttk.LabelFrame(right_frame, text="Seçili Bölüm İçeriği", padding=10)